@@ -0,0 +1,11 @@
+"""
+Benchmark suite for the Bridge API client
+
+    python -m benchmarks --save-baseline  # record baselines for this machine
+    python -m benchmarks                  # micro + macro, compared with them
+    python -m benchmarks micro --quick
+    python -m benchmarks macro --concurrency 1,8,32 --save-baseline
+
+micro: model parse/serialize, idempotency keys, logger overhead (no network)
+macro: get/create/list-all through the services against the local mock server
+"""
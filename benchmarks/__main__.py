@@ -0,0 +1,110 @@
+"""
+Benchmark runner
+
+    python -m benchmarks [micro|macro|all] [--filter SUBSTRING] [--quick]
+                         [--repeats 3] [--save-baseline] [--threshold 0.15] [--json results.json]
+
+Exits with status 1 when any benchmark regresses beyond its threshold, compared
+with baselines recorded on the same machine; differences from another machine's
+baselines are only reported.
+"""
+
+import json
+import os
+import sys
+
+# Allow `python -m benchmarks` from the repository root and `python benchmarks` alike
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import click
+
+from benchmarks.harness import compare, load_baselines, same_machine, save_baselines
+
+def _format_result(result) -> str:
+    line = f"{result.name:<42} {result.ops_per_sec:>12,.1f} ops/s"
+    if result.p95_ms is not None:
+        line += f"   p50 {result.p50_ms:8.2f} ms   p95 {result.p95_ms:8.2f} ms   p99 {result.p99_ms:8.2f} ms"
+    elif result.p50_ms is not None:
+        line += f"   {result.p50_ms * 1e6:10.0f} ns/op"
+    if result.errors:
+        line += f"   errors {result.errors}"
+    return line
+
+@click.command()
+@click.argument('suite', type=click.Choice(['micro', 'macro', 'all']), default='all')
+@click.option('--filter', 'name_filter', help='Only run benchmarks whose name contains this')
+@click.option('--quick', is_flag=True, help='Shorter runs (noisier), for a fast local check')
+@click.option('--concurrency', default='1,8,32', help='Comma-separated concurrency levels for macro benchmarks')
+@click.option('--duration', default=1.0, help='Seconds per macro benchmark run')
+@click.option('--repeats', default=3, help='Runs per macro benchmark; the median is compared')
+@click.option('--customers', default=1000, help='Mock server dataset size')
+@click.option('--latency', default='0', help='Mock server latency spec, e.g. lognormal:20,0.5')
+@click.option('--in-process', is_flag=True, help='Run the mock server in this process')
+@click.option('--baselines', 'baselines_path', type=click.Path(dir_okay=False), help='Baselines file (default: benchmarks/baselines.json)')
+@click.option('--save-baseline', is_flag=True, help='Store these results as the new baselines')
+@click.option('--threshold', type=float, help='Override every regression threshold (fraction, e.g. 0.15)')
+@click.option('--json', 'json_path', type=click.Path(dir_okay=False), help='Also write results as JSON')
+def main(suite, name_filter, quick, concurrency, duration, repeats, customers, latency, in_process, baselines_path, save_baseline, threshold, json_path):
+    """Run the benchmark suite and compare with stored baselines"""
+    from benchmarks import macro, micro
+    from benchmarks.harness import BASELINES_FILE
+
+    baselines_path = baselines_path or BASELINES_FILE
+    selected = (lambda name: name_filter in name) if name_filter else (lambda name: True)
+    results = []
+
+    if suite in ('micro', 'all'):
+        click.echo("Microbenchmarks")
+        for result in micro.run(selected, repeat=3 if quick else 5):
+            results.append(result)
+            click.echo(_format_result(result))
+
+    if suite in ('macro', 'all'):
+        levels = [int(level) for level in concurrency.split(',') if level.strip()]
+        click.echo(f"\nMacrobenchmarks ({customers} customers, latency {latency})")
+        for result in macro.run(levels, duration=0.5 if quick else duration, selected=selected,
+                                customers=customers, latency=latency, in_process=in_process, repeats=repeats):
+            results.append(result)
+            click.echo(_format_result(result))
+
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump([result.to_dict() for result in results], f, indent=2)
+
+    if save_baseline:
+        save_baselines(results, baselines_path)
+        click.echo(f"\nSaved {len(results)} baselines to {baselines_path}")
+        return
+
+    baselines = load_baselines(baselines_path)
+    rows = compare(results, baselines, threshold=threshold)
+    if not rows:
+        click.echo("\nNo baselines to compare with (use --save-baseline)")
+        return
+
+    regressions = [row for row in rows if row['regressed']]
+    exceeded = [row for row in rows if row.get('exceeded') and not row['regressed']]
+    skipped = [row for row in rows if 'skipped' in row]
+    click.echo(
+        f"\nCompared with baselines: {len(regressions)} regressions"
+        + (f", {len(exceeded)} over threshold (not gated)" if exceeded else '')
+        + (f", {len(skipped)} not comparable" if skipped else '')
+    )
+    if not same_machine(baselines):
+        recorded = baselines.get('machine') or {}
+        click.echo(
+            f"⚠️  Baselines were recorded on another machine ({recorded.get('node', 'unknown')}, "
+            f"{recorded.get('cpus', '?')} CPUs, Python {recorded.get('python', '?')}); "
+            "differences are reported but do not fail the run. Record local ones with --save-baseline."
+        )
+    for row in rows:
+        if 'skipped' in row:
+            click.echo(f"   {row['name']:<42} skipped: {row['skipped']}")
+            continue
+        marker = '❌' if row['regressed'] else '⚠️' if row['exceeded'] else '  '
+        click.echo(f"{marker} {row['name']:<42} {row['metric']:<12} {row['baseline']:>12,.2f} -> {row['current']:>12,.2f} ({row['change']:+.1%})")
+    if regressions:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+"""
+Timing, load generation and baseline comparison for the benchmark suite
+"""
+
+import json
+import math
+import os
+import platform
+import statistics
+import threading
+import time
+import timeit
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+# Baselines are machine-specific and not committed; thresholds are shared
+BASELINES_FILE = os.path.join(os.path.dirname(__file__), 'baselines.json')
+THRESHOLDS_FILE = os.path.join(os.path.dirname(__file__), 'thresholds.json')
+DEFAULT_THRESHOLD = 0.15  # fractional slowdown tolerated before a result counts as a regression
+
+@dataclass
+class BenchResult:
+    """Result of one benchmark"""
+    name: str
+    ops_per_sec: float
+    p50_ms: Optional[float] = None
+    p95_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+    operations: int = 0
+    errors: int = 0
+    extra: Dict[str, Any] = field(default_factory=dict)
+    params: Dict[str, Any] = field(default_factory=dict)  # run parameters a baseline is only comparable under
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: value for key, value in asdict(self).items() if value not in (None, {})}
+
+def percentile(sorted_samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted samples"""
+    if not sorted_samples:
+        return 0.0
+    rank = math.ceil(fraction * len(sorted_samples))
+    return sorted_samples[min(len(sorted_samples), max(rank, 1)) - 1]
+
+def micro(name: str, func: Callable[[], Any], repeat: int = 5) -> BenchResult:
+    """
+    Time a zero-argument callable with timeit; the median of several repeats is reported
+
+    The loop count per repeat is chosen by timeit's autorange (at least 0.2 s).
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    median = statistics.median(timer.repeat(repeat=repeat, number=number)) / number
+    return BenchResult(name=name, ops_per_sec=1 / median, p50_ms=median * 1000, operations=number * repeat)
+
+def median_result(results: List[BenchResult]) -> BenchResult:
+    """One result from repeats of the same benchmark: the median of each metric, summed counts"""
+    def median_of(attribute: str) -> Optional[float]:
+        values = [getattr(result, attribute) for result in results if getattr(result, attribute) is not None]
+        return statistics.median(values) if values else None
+
+    first = results[0]
+    return BenchResult(
+        name=first.name,
+        ops_per_sec=median_of('ops_per_sec'),
+        p50_ms=median_of('p50_ms'),
+        p95_ms=median_of('p95_ms'),
+        p99_ms=median_of('p99_ms'),
+        operations=sum(result.operations for result in results),
+        errors=sum(result.errors for result in results),
+        extra={**first.extra, 'repeats': len(results)},
+        params=first.params
+    )
+
+def run_load(
+    name: str,
+    operation: Callable[[int], Any],
+    concurrency: int,
+    duration: float,
+    warmup: int = 5
+) -> BenchResult:
+    """
+    Call operation(worker_index) from concurrency threads for duration seconds
+
+    Every call is timed individually; exceptions are counted as errors.
+    """
+    for _ in range(warmup):
+        operation(0)
+
+    latencies: List[List[float]] = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    start = threading.Barrier(concurrency + 1)
+    deadline: List[float] = []
+
+    def worker(index: int) -> None:
+        samples = latencies[index]
+        start.wait()
+        end = deadline[0]
+        while True:
+            began = time.perf_counter()
+            if began >= end:
+                return
+            try:
+                operation(index)
+            except Exception:
+                errors[index] += 1
+            samples.append(time.perf_counter() - began)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    began = time.perf_counter()
+    deadline.append(began + duration)
+    start.wait()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+
+    samples = sorted(sample for worker_samples in latencies for sample in worker_samples)
+    return BenchResult(
+        name=name,
+        ops_per_sec=len(samples) / elapsed if elapsed else 0.0,
+        p50_ms=percentile(samples, 0.50) * 1000,
+        p95_ms=percentile(samples, 0.95) * 1000,
+        p99_ms=percentile(samples, 0.99) * 1000,
+        operations=len(samples),
+        errors=sum(errors),
+        extra={'concurrency': concurrency}
+    )
+
+def machine_info() -> Dict[str, Any]:
+    """The machine results are measured on; baselines only gate runs on the same one"""
+    return {
+        'node': platform.node(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count()
+    }
+
+def same_machine(baselines: Dict[str, Any]) -> bool:
+    return baselines.get('machine') == machine_info()
+
+def load_baselines(path: str = BASELINES_FILE) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {'benchmarks': {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_thresholds(path: str = THRESHOLDS_FILE) -> Dict[str, Any]:
+    """Default threshold and per-benchmark overrides: {"threshold": 0.25, "benchmarks": {name: 0.3}}"""
+    if not os.path.exists(path):
+        return {'threshold': DEFAULT_THRESHOLD, 'benchmarks': {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_baselines(results: List[BenchResult], path: str = BASELINES_FILE) -> None:
+    """Store results as the new baselines for this machine, keeping baselines of benchmarks that were not run"""
+    baselines = load_baselines(path)
+    if baselines.get('machine') != machine_info():
+        baselines['benchmarks'] = {}  # numbers from another machine are not comparable with these
+    baselines['machine'] = machine_info()
+    for result in results:
+        entry = {
+            key: round(value, 6) if isinstance(value, float) else value
+            for key, value in result.to_dict().items() if key in ('ops_per_sec', 'p95_ms', 'p99_ms')
+        }
+        if result.params:
+            entry['params'] = result.params
+        baselines['benchmarks'][result.name] = entry
+    baselines['benchmarks'] = dict(sorted(baselines['benchmarks'].items()))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(baselines, f, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+def compare(
+    results: List[BenchResult],
+    baselines: Dict[str, Any],
+    thresholds: Optional[Dict[str, Any]] = None,
+    threshold: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """
+    Compare results with baselines
+
+    A benchmark exceeds its threshold when throughput drops, or p95 latency
+    rises, by more than the threshold (thresholds.json, with per-benchmark
+    overrides, or the threshold argument for every benchmark). It only counts as
+    regressed when the baselines were recorded on this machine; otherwise the
+    difference is reported without gating. Benchmarks whose baseline was
+    recorded with other run parameters (e.g. the mock dataset size or latency)
+    are not compared.
+
+    Returns:
+        One row per benchmark with a baseline: name, metric, baseline, current, change,
+        exceeded, regressed; or name and skipped (the reason) when the parameters differ
+    """
+    thresholds = thresholds if thresholds is not None else load_thresholds()
+    default_threshold = thresholds.get('threshold', DEFAULT_THRESHOLD)
+    gated = same_machine(baselines)
+    rows = []
+
+    def row(name: str, metric: str, baseline_value: float, current: float, change: float, exceeded: bool) -> Dict[str, Any]:
+        return {
+            'name': name, 'metric': metric, 'baseline': baseline_value, 'current': current,
+            'change': change, 'exceeded': exceeded, 'regressed': exceeded and gated
+        }
+
+    for result in results:
+        baseline = baselines.get('benchmarks', {}).get(result.name)
+        if not baseline:
+            continue
+        recorded = baseline.get('params', {})
+        if recorded != result.params:
+            differences = ', '.join(
+                f"{key} {recorded.get(key)!r} -> {result.params.get(key)!r}"
+                for key in sorted(set(recorded) | set(result.params)) if recorded.get(key) != result.params.get(key)
+            )
+            rows.append({'name': result.name, 'skipped': f"baseline recorded with other parameters ({differences})", 'regressed': False})
+            continue
+        limit = threshold if threshold is not None else thresholds.get('benchmarks', {}).get(result.name, default_threshold)
+
+        change = result.ops_per_sec / baseline['ops_per_sec'] - 1 if baseline.get('ops_per_sec') else 0.0
+        rows.append(row(result.name, 'ops_per_sec', baseline.get('ops_per_sec'), result.ops_per_sec, change, change < -limit))
+        if baseline.get('p95_ms') and result.p95_ms is not None:
+            change = result.p95_ms / baseline['p95_ms'] - 1
+            rows.append(row(result.name, 'p95_ms', baseline['p95_ms'], result.p95_ms, change, change > limit))
+    return rows
@@ -0,0 +1,276 @@
+"""
+Weighted-scenario load generator driving the real service layer
+
+Used by `python main.py bench`. Each worker thread picks operations by weight
+from a scenario and times every call; samples are merged after the run, so
+workers never contend on shared counters.
+"""
+
+import random
+import threading
+import time
+from bisect import bisect
+from collections import Counter
+from dataclasses import dataclass, field
+from decimal import Decimal
+from itertools import accumulate
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.harness import percentile
+from bridge import Bridge
+from bridge_client import BridgeAPIError
+from models import TransferDestination, TransferRequest, TransferSource
+
+# Scenario name -> {operation: weight}
+SCENARIOS: Dict[str, Dict[str, float]] = {
+    'mixed': {'customer_get': 40, 'quote': 25, 'wallet_balance': 25, 'transfer_create': 10},
+    'reads': {'customer_get': 50, 'wallet_balance': 50},
+    'customers': {'customer_get': 1},
+    'transfers': {'transfer_create': 1},
+    'quotes': {'quote': 1},
+    'balances': {'wallet_balance': 1},
+}
+WRITE_OPERATIONS = ('transfer_create',)
+
+# Upper bounds (ms) of the latency histogram buckets
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float('inf'))
+
+@dataclass
+class Fixtures:
+    """IDs discovered before the run for operations to act on"""
+    customer_ids: List[str]
+    wallet_ids: List[str]
+    transfer_customer_id: Optional[str] = None
+    transfer_account_id: Optional[str] = None
+    transfer_address: Optional[str] = None
+
+def discover_fixtures(bridge: Bridge, sample: int = 100) -> Fixtures:
+    """Sample customers, wallets and an external account to use as targets"""
+    customers = bridge.customers.list_customers(limit=sample).get('data', [])
+    wallets = bridge.wallets.list_wallets(limit=sample).get('data', [])
+    fixtures = Fixtures(
+        customer_ids=[customer['id'] for customer in customers],
+        wallet_ids=[wallet['id'] for wallet in wallets]
+    )
+    if customers:
+        fixtures.transfer_customer_id = customers[0]['id']
+        accounts = bridge.accounts.list_external_accounts(customers[0]['id'], limit=1).get('data', [])
+        fixtures.transfer_account_id = accounts[0]['id'] if accounts else None
+    if wallets:
+        fixtures.transfer_address = wallets[0].get('address')
+    return fixtures
+
+def build_operations(bridge: Bridge, fixtures: Fixtures) -> Dict[str, Callable[[random.Random], Any]]:
+    """Operation name -> callable taking the worker's random generator"""
+
+    def customer_get(rng: random.Random) -> Any:
+        return bridge.customers.get_customer(rng.choice(fixtures.customer_ids))
+
+    def wallet_balance(rng: random.Random) -> Any:
+        return bridge.wallets.get_wallet_balance(rng.choice(fixtures.wallet_ids))
+
+    def quote(rng: random.Random) -> Any:
+        return bridge.transfers.get_quote('usdc', 'usd', str(Decimal(rng.randint(100, 1000000)) / 100))
+
+    def transfer_create(rng: random.Random) -> Any:
+        request = TransferRequest(
+            amount=str(Decimal(rng.randint(100, 100000)) / 100),
+            on_behalf_of=fixtures.transfer_customer_id,
+            source=TransferSource(payment_rail='ach', currency='usd', external_account_id=fixtures.transfer_account_id),
+            destination=TransferDestination(payment_rail='base', currency='usdc', to_address=fixtures.transfer_address)
+        )
+        return bridge.transfers.create_transfer(request)
+
+    return {
+        'customer_get': customer_get,
+        'wallet_balance': wallet_balance,
+        'quote': quote,
+        'transfer_create': transfer_create
+    }
+
+@dataclass
+class OperationReport:
+    """Results of one operation type"""
+    name: str
+    latencies: List[float] = field(default_factory=list)  # seconds, sorted after the run
+    errors: Counter = field(default_factory=Counter)  # status code (or exception type) -> count
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def error_count(self) -> int:
+        return sum(self.errors.values())
+
+    def percentile_ms(self, fraction: float) -> float:
+        return percentile(self.latencies, fraction) * 1000
+
+@dataclass
+class LoadReport:
+    """Results of a load run"""
+    scenario: str
+    concurrency: int
+    elapsed: float
+    operations: Dict[str, OperationReport]
+    retries: Counter
+    cpu_user: float
+    cpu_system: float
+    max_rss_mb: Optional[float] = None
+
+    @property
+    def total(self) -> int:
+        return sum(report.count for report in self.operations.values())
+
+    @property
+    def errors(self) -> int:
+        return sum(report.error_count for report in self.operations.values())
+
+    @property
+    def throughput(self) -> float:
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def histogram(self) -> List[int]:
+        """Count of calls per HISTOGRAM_BUCKETS_MS bucket"""
+        counts = [0] * len(HISTOGRAM_BUCKETS_MS)
+        for report in self.operations.values():
+            for latency in report.latencies:
+                counts[bisect(HISTOGRAM_BUCKETS_MS, latency * 1000 - 1e-9)] += 1
+        return counts
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'scenario': self.scenario,
+            'concurrency': self.concurrency,
+            'elapsed_s': self.elapsed,
+            'operations_total': self.total,
+            'throughput_ops_s': self.throughput,
+            'errors': self.errors,
+            'retries': dict(self.retries),
+            'cpu_user_s': self.cpu_user,
+            'cpu_system_s': self.cpu_system,
+            'max_rss_mb': self.max_rss_mb,
+            'histogram_ms': {str(bound): count for bound, count in zip(HISTOGRAM_BUCKETS_MS, self.histogram())},
+            'operations': {
+                name: {
+                    'count': report.count,
+                    'errors': dict(report.errors),
+                    'p50_ms': report.percentile_ms(0.50),
+                    'p95_ms': report.percentile_ms(0.95),
+                    'p99_ms': report.percentile_ms(0.99),
+                    'max_ms': report.percentile_ms(1.0)
+                }
+                for name, report in self.operations.items()
+            }
+        }
+
+def _rusage():
+    """(user, system, max RSS in MB) CPU usage of this process, if the platform has getrusage"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime, usage.ru_stime, usage.ru_maxrss / 1024  # ru_maxrss is KiB on Linux
+
+class LoadGenerator:
+    """Runs a weighted mix of operations from many threads for a fixed duration"""
+
+    def __init__(
+        self,
+        bridge: Bridge,
+        operations: Dict[str, Callable[[random.Random], Any]],
+        weights: Dict[str, float],
+        concurrency: int,
+        duration: float,
+        seed: int = 1
+    ):
+        self.bridge = bridge
+        self.operations = operations
+        self.names = list(weights)
+        self.cumulative = list(accumulate(weights[name] for name in self.names))
+        self.concurrency = concurrency
+        self.duration = duration
+        self.seed = seed
+
+    def run(self, scenario: str, progress: Optional[Callable[[float, int], None]] = None, interval: float = 5.0) -> LoadReport:
+        """
+        Run the load and return the report
+
+        Args:
+            scenario: Scenario name recorded in the report
+            progress: Called every interval seconds with (elapsed seconds, calls so far)
+        """
+        per_worker = [{name: OperationReport(name) for name in self.names} for _ in range(self.concurrency)]
+        start = threading.Barrier(self.concurrency + 1)
+        deadline: List[float] = []
+        retries_before = Counter(self.bridge.client.retries)
+
+        def worker(index: int) -> None:
+            rng = random.Random(self.seed * 100003 + index)
+            reports = per_worker[index]
+            total_weight = self.cumulative[-1]
+            start.wait()
+            end = deadline[0]
+            while True:
+                name = self.names[bisect(self.cumulative, rng.random() * total_weight)]
+                report = reports[name]
+                began = time.perf_counter()
+                if began >= end:
+                    return
+                try:
+                    self.operations[name](rng)
+                except BridgeAPIError as e:
+                    report.errors[str(e.status_code or 'network')] += 1
+                except Exception as e:
+                    report.errors[type(e).__name__] += 1
+                report.latencies.append(time.perf_counter() - began)
+
+        threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+
+        usage_before = _rusage()
+        cpu_before = time.process_time()
+        began = time.perf_counter()
+        deadline.append(began + self.duration)
+        start.wait()
+
+        while True:
+            remaining = deadline[0] - time.perf_counter()
+            if remaining <= 0:
+                break
+            time.sleep(min(interval, remaining))
+            if progress and time.perf_counter() < deadline[0]:
+                progress(time.perf_counter() - began, sum(len(r.latencies) for reports in per_worker for r in reports.values()))
+
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - began
+        usage_after = _rusage()
+
+        merged = {name: OperationReport(name) for name in self.names}
+        for reports in per_worker:
+            for name, report in reports.items():
+                merged[name].latencies.extend(report.latencies)
+                merged[name].errors.update(report.errors)
+        for report in merged.values():
+            report.latencies.sort()
+
+        if usage_before and usage_after:
+            cpu_user = usage_after[0] - usage_before[0]
+            cpu_system = usage_after[1] - usage_before[1]
+            max_rss_mb = usage_after[2]
+        else:
+            cpu_user, cpu_system, max_rss_mb = time.process_time() - cpu_before, 0.0, None
+
+        return LoadReport(
+            scenario=scenario,
+            concurrency=self.concurrency,
+            elapsed=elapsed,
+            operations={name: report for name, report in merged.items() if report.count},
+            retries=Counter(self.bridge.client.retries) - retries_before,
+            cpu_user=cpu_user,
+            cpu_system=cpu_system,
+            max_rss_mb=max_rss_mb
+        )
@@ -0,0 +1,112 @@
+"""
+Macrobenchmarks: service calls end to end against the local mock server
+
+The server runs in a separate process by default, so it does not compete with
+the client threads for the GIL.
+"""
+
+import logging
+import os
+import random
+import subprocess
+import sys
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Sequence
+
+from benchmarks.harness import BenchResult, median_result, run_load
+from bridge import Bridge
+from config import Config
+from models import TransferDestination, TransferRequest, TransferSource
+
+MOCK_SERVER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'mock_server.py')
+OPERATIONS = ('get', 'create', 'list_all')
+
+@contextmanager
+def mock_server(customers: int = 1000, latency: str = '0', in_process: bool = False, **options: Any) -> Iterator[str]:
+    """
+    Run the mock server for the duration of the block, yielding its base URL
+
+    Args:
+        customers: Dataset size
+        latency: Latency spec (see mock_server.LatencyModel)
+        in_process: Serve from a thread of this process instead of a subprocess
+        options: Further mock server options (rate_429, rate_5xx, seed, ...)
+    """
+    if in_process:
+        from mock_server import MockBridgeServer
+        with MockBridgeServer(customers=customers, latency=latency, **options) as server:
+            yield server.url
+        return
+
+    args = [sys.executable, MOCK_SERVER, '--port', '0', '--customers', str(customers), '--latency', latency]
+    for name, value in options.items():
+        args += [f"--{name.replace('_', '-')}", str(value)]
+    process = subprocess.Popen(args, stdout=subprocess.PIPE, text=True)
+    try:
+        line = process.stdout.readline()
+        if 'listening on' not in line:
+            raise RuntimeError(f"Mock server failed to start: {line.strip() or 'no output'}")
+        yield line.rsplit(' ', 1)[-1].strip()
+    finally:
+        process.terminate()
+        process.wait()
+
+def operations(bridge: Bridge, customers: int) -> Dict[str, Callable[[int], Any]]:
+    """Benchmark operations, each taking the calling worker's index"""
+    rngs: Dict[int, random.Random] = {}
+    transfer_request = TransferRequest(
+        amount='100.00',
+        on_behalf_of='cust_00000001',
+        source=TransferSource(payment_rail='ach', currency='usd', external_account_id='ea_00000001_0'),
+        destination=TransferDestination(payment_rail='base', currency='usdc', to_address='0x' + '0' * 40)
+    )
+
+    def get(worker: int) -> Any:
+        rng = rngs.setdefault(worker, random.Random(worker))
+        return bridge.customers.get_customer(f"cust_{rng.randrange(customers):08d}")
+
+    def create(worker: int) -> Any:
+        return bridge.transfers.create_transfer(transfer_request)
+
+    def list_all(worker: int) -> int:
+        return sum(1 for _ in bridge.customers.iter_customers(page_size=100))
+
+    return {'get': get, 'create': create, 'list_all': list_all}
+
+def run(
+    concurrency_levels: Sequence[int] = (1, 8, 32),
+    duration: float = 1.0,
+    selected: Callable[[str], bool] = lambda name: True,
+    customers: int = 1000,
+    latency: str = '0',
+    in_process: bool = False,
+    repeats: int = 3
+) -> List[BenchResult]:
+    """
+    Run each operation at each concurrency level against a fresh mock server
+
+    Each cell runs repeats times for duration seconds and reports the median of
+    each metric. Service INFO logging is disabled while measuring, as with a
+    WARNING-level production configuration.
+    """
+    results: List[BenchResult] = []
+    logging.disable(logging.INFO)
+    try:
+        with mock_server(customers=customers, latency=latency, in_process=in_process) as url:
+            for name in OPERATIONS:
+                for concurrency in concurrency_levels:
+                    bench_name = f"macro.{name}.c{concurrency}"
+                    if not selected(bench_name):
+                        continue
+                    samples = []
+                    for _ in range(repeats):
+                        # A fresh client per run, so pool warm-up is part of every measurement
+                        with Bridge(Config(api_key='bench', api_url=url)) as bridge:
+                            operation = operations(bridge, customers)[name]
+                            samples.append(run_load(bench_name, operation, concurrency, duration))
+                    result = median_result(samples)
+                    result.params = {'customers': customers, 'latency': latency}
+                    results.append(result)
+    finally:
+        logging.disable(logging.NOTSET)
+    return results
@@ -0,0 +1,73 @@
+"""
+Microbenchmarks: per-object costs on the client's hot paths, without network I/O
+"""
+
+import json
+import logging
+from typing import Any, Callable, List, Tuple
+
+from benchmarks.harness import BenchResult, micro
+from mock_server import MockDataset
+from models import Customer, Page, Transfer, TransferDestination, TransferRequest, TransferSource
+from utils import jsoncodec
+from utils.idempotency import generate_deterministic_key, generate_idempotency_key
+
+class _DiscardStream:
+    """Stream that drops everything written to it"""
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+def _benchmark_logger() -> logging.Logger:
+    """Logger formatted like setup_logger's, with output discarded instead of printed"""
+    logger = logging.getLogger('benchmarks.logger')
+    logger.handlers.clear()
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler(_DiscardStream())
+    handler.setFormatter(logging.Formatter(fmt='%(asctime)s - %(name)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S'))
+    logger.addHandler(handler)
+    return logger
+
+def cases() -> List[Tuple[str, Callable[[], Any]]]:
+    """(name, zero-argument callable) for every microbenchmark"""
+    dataset = MockDataset(customers=100, transfers_per_customer=1, seed=1)
+    customer_record = dataset.customers.get('cust_00000001')
+    transfer_record = dataset.transfers.get('tr_000000001')
+    page_record = dataset.customers.page(100)
+    page_bytes = json.dumps(page_record).encode('utf-8')
+
+    customer = Customer(**customer_record)
+    transfer = Transfer(**transfer_record)
+    transfer_request = TransferRequest(
+        amount='100.00',
+        on_behalf_of='cust_00000001',
+        source=TransferSource(payment_rail='ach', currency='usd', external_account_id='ea_00000001_0'),
+        destination=TransferDestination(payment_rail='base', currency='usdc', to_address='0x' + '0' * 40)
+    )
+    logger = _benchmark_logger()
+    wallet_id = 'wal_00000001_usdc'
+
+    return [
+        ('micro.customer_parse', lambda: Customer(**customer_record)),
+        ('micro.customer_serialize', lambda: customer.model_dump(mode='json')),
+        ('micro.transfer_parse', lambda: Transfer(**transfer_record)),
+        ('micro.transfer_serialize', lambda: transfer.model_dump(mode='json')),
+        ('micro.transfer_request_dict', lambda: transfer_request.model_dump()),
+        ('micro.page_decode_100', lambda: json.loads(page_bytes)),
+        ('micro.page_decode_100_codec', lambda: jsoncodec.loads(page_bytes)),
+        ('micro.page_encode_100_codec', lambda: jsoncodec.dumps(page_record)),
+        ('micro.page_parse_100', lambda: Page[Customer](**page_record)),
+        ('micro.idempotency_key', generate_idempotency_key),
+        ('micro.deterministic_key', lambda: generate_deterministic_key('bench', 'cust_00000001', '021000021', '1234')),
+        ('micro.logger_info', lambda: logger.info(f"Retrieved wallet: {wallet_id}")),
+        ('micro.logger_debug_disabled_fstring', lambda: logger.debug(f"Retrieved wallet: {wallet_id}")),
+        ('micro.logger_debug_disabled_lazy', lambda: logger.debug("Retrieved wallet: %s", wallet_id)),
+    ]
+
+def run(selected: Callable[[str], bool] = lambda name: True, repeat: int = 5) -> List[BenchResult]:
+    """Run the microbenchmarks whose name passes selected"""
+    return [micro(name, func, repeat=repeat) for name, func in cases() if selected(name)]
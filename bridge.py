@@ -0,0 +1,102 @@
+"""
+Bridge API programmatic interface
+
+A single in-process entry point owning one BridgeClient (and its connection pool)
+plus all services, for scripts that would otherwise shell out to the CLI.
+
+    with Bridge.from_env() as bridge:
+        for customer in bridge.iter_customers():
+            print(customer.email)
+        transfer = bridge.transfers.get_transfer(transfer_id)
+"""
+
+from typing import Iterator, Optional
+
+from bridge_client import BridgeClient
+from config import Config
+from models import Customer, ExternalAccount, Page, Transfer, Wallet
+from services.customers import CustomerService
+from services.external_accounts import ExternalAccountService
+from services.transfers import TransferService
+from services.wallets import WalletService
+from utils.tracing import build_model
+
+class Bridge:
+    """Facade over BridgeClient and the Bridge API services, returning typed results"""
+
+    def __init__(self, config: Optional[Config] = None, client: Optional[BridgeClient] = None):
+        """
+        Args:
+            config: Configuration (default: from environment variables)
+            client: Existing client to reuse (default: a new one for config)
+        """
+        self.config = config or (client.config if client else Config.from_env())
+        self.client = client or BridgeClient(self.config)
+        self.customers = CustomerService(self.client)
+        self.transfers = TransferService(self.client)
+        self.wallets = WalletService(self.client)
+        self.accounts = ExternalAccountService(self.client)
+
+    @classmethod
+    def from_env(cls) -> 'Bridge':
+        """Create a Bridge from BRIDGE_* environment variables"""
+        return cls(Config.from_env())
+
+    def close(self) -> None:
+        """Release pooled connections"""
+        self.client.close()
+
+    def __enter__(self) -> 'Bridge':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def check_connection(self) -> bool:
+        """Check that the API is reachable with the configured key (raises BridgeAPIError otherwise)"""
+        self.client.get('/v0/customers', params={'limit': 1})
+        return True
+
+    # Customers
+
+    def list_customers(self, limit: int = 100, cursor: Optional[str] = None) -> Page[Customer]:
+        """List one page of customers"""
+        return build_model(Page[Customer], self.customers.list_customers(limit=limit, cursor=cursor))
+
+    def iter_customers(self, page_size: int = 100) -> Iterator[Customer]:
+        """Iterate over all customers"""
+        for record in self.customers.iter_customers(page_size=page_size):
+            yield build_model(Customer, record)
+
+    # Transfers
+
+    def list_transfers(self, limit: int = 100, cursor: Optional[str] = None, customer_id: Optional[str] = None) -> Page[Transfer]:
+        """List one page of transfers"""
+        return build_model(Page[Transfer], self.transfers.list_transfers(limit=limit, cursor=cursor, customer_id=customer_id))
+
+    def iter_transfers(self, customer_id: Optional[str] = None, page_size: int = 100) -> Iterator[Transfer]:
+        """Iterate over all transfers"""
+        for record in self.transfers.iter_transfers(customer_id=customer_id, page_size=page_size):
+            yield build_model(Transfer, record)
+
+    # Wallets
+
+    def list_wallets(self, customer_id: Optional[str] = None, limit: int = 100, cursor: Optional[str] = None) -> Page[Wallet]:
+        """List one page of wallets"""
+        return build_model(Page[Wallet], self.wallets.list_wallets(customer_id=customer_id, limit=limit, cursor=cursor))
+
+    def iter_wallets(self, customer_id: Optional[str] = None, page_size: int = 100) -> Iterator[Wallet]:
+        """Iterate over all wallets"""
+        for record in self.wallets.iter_wallets(customer_id=customer_id, page_size=page_size):
+            yield build_model(Wallet, record)
+
+    # External accounts
+
+    def list_external_accounts(self, customer_id: str, limit: int = 100, cursor: Optional[str] = None) -> Page[ExternalAccount]:
+        """List one page of a customer's external accounts"""
+        return build_model(Page[ExternalAccount], self.accounts.list_external_accounts(customer_id, limit=limit, cursor=cursor))
+
+    def iter_external_accounts(self, customer_id: str, page_size: int = 100) -> Iterator[ExternalAccount]:
+        """Iterate over all external accounts of a customer"""
+        for record in self.accounts.iter_external_accounts(customer_id, page_size=page_size):
+            yield build_model(ExternalAccount, record)
@@ -5,18 +5,40 @@ HTTP client for interacting with the Bridge API with proper authentication,
 error handling, and retry mechanisms.
 """
 
+import gzip
 import requests
+import threading
 import time
 import logging
-from typing import Dict, Any, Optional, Union
-from urllib.parse import urljoin
+import weakref
+from collections import Counter
+from requests.adapters import BaseAdapter
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+from urllib.parse import urljoin, urlparse
+from urllib3.exceptions import HTTPError as Urllib3Error, ReadTimeoutError
+from urllib3.util import make_headers
 
 from config import Config
+from utils import jsoncodec
+from utils.connections import create_adapter
+from utils.deadline import Deadline
 from utils.idempotency import generate_idempotency_key
-from utils.logger import setup_logger
+from utils.jsonstream import StreamedPage
+from utils.hedging import Hedger
+from utils.hooks import ClientHooks, RequestContext
+from utils.logger import get_request_id, request_id_context, setup_logger
+from utils.metrics import ClientMetrics, get_metrics, route_template
+from utils.payload import redact, summarize_payload
 
 logger = setup_logger(__name__)
 
+# shared: one requests.Session for all threads; thread: a session per thread
+SESSION_MODES = ('shared', 'thread')
+
+# Bytes read from the socket per step of a streamed response; small enough that
+# the first items of a large page are decoded while the rest is still arriving
+STREAM_CHUNK_SIZE = 16384
+
 class BridgeAPIError(Exception):
     """Base exception for Bridge API errors"""
     def __init__(self, message: str, status_code: Optional[int] = None, response_data: Optional[Dict] = None):
@@ -24,18 +46,29 @@ class BridgeAPIError(Exception):
         self.status_code = status_code
         self.response_data = response_data
 
+class DeadlineExceeded(BridgeAPIError):
+    """The caller's deadline passed, or would pass before the next retry could start"""
+
 class BridgeClient:
     """HTTP client for Bridge API"""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, metrics: Optional[ClientMetrics] = None):
         self.config = config
-        self.session = requests.Session()
+        if config.session_mode not in SESSION_MODES:
+            raise ValueError(f"Unknown session mode {config.session_mode!r}, expected one of {', '.join(SESSION_MODES)}")
+        
+        # Request metrics (see utils.metrics); None keeps the request path free of instrumentation
+        if metrics is None and config.metrics:
+            metrics = get_metrics()
+        self.metrics = metrics
         
-        # Set headers with proper encoding
-        self.session.headers.update({
+        # Set headers with proper encoding; Accept-Encoding lists gzip and deflate, plus br
+        # and zstd when their decoders (brotli, zstandard) are installed
+        self.headers = {
             'Content-Type': 'application/json',
-            'Accept': 'application/json'
-        })
+            'Accept': 'application/json',
+            'Accept-Encoding': make_headers(accept_encoding=True)['accept-encoding']
+        }
         
         # Set API key header with proper encoding handling
         api_key = config.api_key
@@ -44,13 +77,33 @@ class BridgeClient:
             api_key = api_key.replace('●', '').replace('•', '').strip()  # Remove any masking characters
             # Ensure we have a clean ASCII string
             api_key = ''.join(char for char in api_key if ord(char) < 128)
-            self.session.headers['Api-Key'] = api_key
+            self.headers['Api-Key'] = api_key
+        
+        # One transport adapter (and connection pool per host), shared by every session
+        # of this client, so per-thread sessions still reuse each other's warm connections
+        self.adapter = create_adapter(config.transport, pool_size=config.pool_size, keepalive_idle=config.keepalive_idle)
+        self._sessions: 'weakref.WeakSet[requests.Session]' = weakref.WeakSet()
+        self._sessions_lock = threading.Lock()
+        self._local = threading.local()
+        self._shared_session = self._new_session() if config.session_mode == 'shared' else None
         
         # Configure retries
         self.max_retries = 3
         self.retry_delay = 1  # seconds
         
-        logger.info(f"Bridge client initialized for {config.environment} environment")
+        # Retries performed, by reason (rate_limited, server_error, connection_error)
+        self.retries: Counter = Counter()
+        self._retries_lock = threading.Lock()
+        
+        # Hedged GETs (see utils.hedging); None sends every request once, on the calling thread
+        self.hedger = None
+        if config.hedge_requests:
+            self.hedger = Hedger(config.hedge_percentile, config.hedge_budget)
+        
+        # Lifecycle hooks (see utils.hooks); with none registered no context is built
+        self.hooks = ClientHooks()
+        
+        logger.info("Bridge client initialized for %s environment", config.environment)
     
     def _make_request(
         self, 
@@ -59,10 +112,24 @@ class BridgeClient:
         data: Optional[Dict] = None,
         params: Optional[Dict] = None,
         idempotency_key: Optional[str] = None,
-        retry_count: int = 0
+        retry_count: int = 0,
+        stream: bool = False,
+        deadline: Optional[Deadline] = None
     ) -> Dict[str, Any]:
-        """Make HTTP request to Bridge API with retry logic"""
+        """
+        Make HTTP request to Bridge API with retry logic
         
+        With stream, a successful response is returned as a StreamedPage. With a
+        deadline, attempts get at most the time remaining and no retry is made that
+        could not start before it; DeadlineExceeded is raised instead.
+        """
+
+        # Log records of this request (and its retries) share one request ID
+        # unless the caller has bound its own
+        if retry_count == 0 and get_request_id() is None:
+            with request_id_context():
+                return self._make_request(method, endpoint, data, params, idempotency_key, stream=stream, deadline=deadline)
+
         url = urljoin(self.config.base_url, endpoint)
         
         # Add idempotency key if provided
@@ -70,32 +137,46 @@ class BridgeClient:
         if idempotency_key:
             headers['Idempotency-Key'] = idempotency_key
         
-        logger.debug(f"Making {method} request to {url}")
-        if data:
-            logger.debug(f"Request data: {data}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Making %s request to %s", method, url)
+            if data and self.config.log_payloads != 'off':
+                logger.debug("Request data: %s", self._describe_payload(data))
+        
+        hooks = self.hooks if self.hooks else None
+        context = None
+        if hooks is not None:
+            context = RequestContext(method=method, endpoint=endpoint, url=url, headers=headers, params=params, data=data, attempt=retry_count)
+            hooks.before_request(context)
         
         try:
-            response = self.session.request(
-                method=method,
-                url=url,
-                json=data,
-                params=params,
-                headers=headers,
-                timeout=30
-            )
+            if deadline is not None and deadline.expired:
+                raise self._on_error(DeadlineExceeded(f"Deadline exceeded before {method} {endpoint}"), context)
+            timeout = self._timeout(method, endpoint, deadline)
+            response = self._send(method, url, endpoint, data, params, headers, stream, timeout, deadline)
+            streaming = stream and response.status_code < 400
             
-            logger.debug(f"Response status: {response.status_code}")
+            if logger.isEnabledFor(logging.DEBUG):
+                if streaming:
+                    logger.debug("Response status: %s (streamed)", response.status_code)
+                else:
+                    logger.debug("Response status: %s (%s bytes)", response.status_code, len(response.content))
+            if context is not None:
+                context.response = response
+                context.finish()
+                hooks.after_response(context)
             
             # Handle successful responses
+            if streaming:
+                return StreamedPage(self._stream_chunks(response), on_close=response.close)
             if response.status_code < 400:
                 try:
-                    return response.json()
+                    return self._decode(response, context)
                 except ValueError:
                     return {'status': 'success', 'data': response.text}
             
             # Handle error responses
             try:
-                error_data = response.json()
+                error_data = jsoncodec.loads(response.content)
             except ValueError:
                 error_data = {'message': response.text}
             
@@ -104,54 +185,306 @@ class BridgeClient:
             # Handle rate limiting
             if response.status_code == 429 and retry_count < self.max_retries:
                 retry_after = int(response.headers.get('Retry-After', self.retry_delay))
-                logger.warning(f"Rate limited. Retrying after {retry_after} seconds...")
+                if deadline is not None and deadline.remaining() <= retry_after:
+                    raise self._on_error(DeadlineExceeded(
+                        f"Deadline exceeded, not retrying: {error_message}", response.status_code, error_data
+                    ), context)
+                logger.warning("Rate limited. Retrying after %s seconds...", retry_after)
+                self._on_retry('rate_limited', method, endpoint, retry_after, context)
                 time.sleep(retry_after)
-                return self._make_request(method, endpoint, data, params, idempotency_key, retry_count + 1)
+                return self._make_request(method, endpoint, data, params, idempotency_key, retry_count + 1, stream, deadline)
             
             # Handle server errors with retry
             if response.status_code >= 500 and retry_count < self.max_retries:
                 delay = self.retry_delay * (2 ** retry_count)  # Exponential backoff
-                logger.warning(f"Server error {response.status_code}. Retrying after {delay} seconds...")
+                if deadline is not None and deadline.remaining() <= delay:
+                    raise self._on_error(DeadlineExceeded(
+                        f"Deadline exceeded, not retrying: {error_message}", response.status_code, error_data
+                    ), context)
+                logger.warning("Server error %s. Retrying after %s seconds...", response.status_code, delay)
+                self._on_retry('server_error', method, endpoint, delay, context)
                 time.sleep(delay)
-                return self._make_request(method, endpoint, data, params, idempotency_key, retry_count + 1)
+                return self._make_request(method, endpoint, data, params, idempotency_key, retry_count + 1, stream, deadline)
             
-            raise BridgeAPIError(
+            raise self._on_error(BridgeAPIError(
                 message=error_message,
                 status_code=response.status_code,
                 response_data=error_data
-            )
+            ), context)
             
         except requests.exceptions.RequestException as e:
+            if context is not None:
+                context.error = e
+                context.finish()
             if retry_count < self.max_retries:
                 delay = self.retry_delay * (2 ** retry_count)
-                logger.warning(f"Request failed: {e}. Retrying after {delay} seconds...")
+                if deadline is not None and deadline.remaining() <= delay:
+                    raise self._on_error(DeadlineExceeded(f"Deadline exceeded, not retrying: {e}"), context)
+                logger.warning("Request failed: %s. Retrying after %s seconds...", e, delay)
+                self._on_retry('connection_error', method, endpoint, delay, context)
                 time.sleep(delay)
-                return self._make_request(method, endpoint, data, params, idempotency_key, retry_count + 1)
+                return self._make_request(method, endpoint, data, params, idempotency_key, retry_count + 1, stream, deadline)
+            
+            if deadline is not None and deadline.expired:
+                raise self._on_error(DeadlineExceeded(f"Deadline exceeded: {e}"), context)
+            raise self._on_error(BridgeAPIError(f"Request failed: {e}"), context)
+    
+    @staticmethod
+    def _stream_chunks(response: requests.Response) -> Iterator[bytes]:
+        """Body of a streamed response; failures mid-body cannot be retried and raise BridgeAPIError"""
+        try:
+            yield from response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+        except requests.exceptions.RequestException as e:
+            raise BridgeAPIError(f"Streamed response failed: {e}")
+    
+    @staticmethod
+    def _read_body(response: requests.Response, deadline: Deadline) -> None:
+        """
+        Read a response body before the deadline, leaving it in response.content
+
+        Raises requests' Timeout once the deadline passes (the socket timeout of each
+        read is cut to the time remaining), and its other exceptions as reads would.
+        """
+        raw = response.raw
+        read1 = getattr(raw, 'read1', None)
+        chunks = []
+        try:
+            if read1 is None:  # not urllib3 (e.g. the HTTP/2 adapter): check as each piece arrives
+                for chunk in response.iter_content(chunk_size=None):
+                    if deadline.expired:
+                        raise requests.exceptions.Timeout("Deadline passed while reading the response body")
+                    chunks.append(chunk)
+            else:
+                connection = getattr(raw, '_connection', None)
+                sock = getattr(connection, 'sock', None)
+                while True:
+                    remaining = deadline.remaining()
+                    if remaining <= 0:
+                        raise requests.exceptions.Timeout("Deadline passed while reading the response body")
+                    if sock is not None:
+                        sock.settimeout(remaining)
+                    chunk = read1(STREAM_CHUNK_SIZE, decode_content=True)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+        except ReadTimeoutError as e:
+            response.close()
+            raise requests.exceptions.ReadTimeout(e, request=response.request)
+        except Urllib3Error as e:
+            response.close()
+            raise requests.exceptions.ConnectionError(e, request=response.request)
+        except requests.exceptions.RequestException:
+            response.close()
+            raise
+        response._content = b''.join(chunks)
+        response._content_consumed = True
+        if read1 is not None:
+            raw.release_conn()
+    
+    def _describe_payload(self, data: Dict[str, Any]) -> Any:
+        """Request body for debug logs: a size-aware summary unless full payloads were asked for"""
+        if self.config.log_payloads == 'full':
+            return redact(data)
+        return summarize_payload(data)
+    
+    def _decode(self, response: requests.Response, context: Optional[RequestContext]) -> Dict[str, Any]:
+        """Decode a JSON response body, timing it when hooks are active"""
+        if context is None:
+            return jsoncodec.loads(response.content)
+        started = time.perf_counter()
+        try:
+            return jsoncodec.loads(response.content)
+        finally:
+            context.timings['json_decode'] = time.perf_counter() - started
+    
+    @property
+    def session(self) -> requests.Session:
+        """The session for the calling thread (the shared one unless session_mode is 'thread')"""
+        if self._shared_session is not None:
+            return self._shared_session
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self._new_session()
+        return session
+    
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        session.headers.update(self.headers)
+        with self._sessions_lock:
+            session.mount('https://', self.adapter)
+            session.mount('http://', self.adapter)
+            self._sessions.add(session)
+        return session
+    
+    def set_adapter(self, adapter: BaseAdapter) -> None:
+        """Replace the transport adapter of every session (e.g. with a tracing one)"""
+        with self._sessions_lock:
+            previous, self.adapter = self.adapter, adapter
+            for session in list(self._sessions):
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+        if previous is not adapter:
+            previous.close()
+    
+    def warmup(self, connections: Optional[int] = None) -> int:
+        """
+        Open connections (with their TLS handshakes) to the API host ahead of use
+        
+        Args:
+            connections: How many to have open (default and maximum: config.pool_size)
             
-            raise BridgeAPIError(f"Request failed: {e}")
+        Returns:
+            Number of connections opened; ones already open are reused
+        """
+        url = self.config.base_url
+        session = self.session
+        settings = session.merge_environment_settings(url, {}, None, session.verify, None)
+        if settings['proxies'].get(urlparse(url).scheme):
+            return 0  # connections go through the proxy's pool
+        if not hasattr(self.adapter, 'warmup'):
+            return 0
+        opened = self.adapter.warmup(url, connections or self.config.pool_size, verify=settings['verify'])
+        logger.debug("Opened %s connections to %s", opened, url)
+        return opened
     
-    def get(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+    def _timeout(self, method: str, endpoint: str, deadline: Optional[Deadline]) -> Tuple[float, float]:
+        """(connect, read) timeouts of the route, cut to the deadline's remaining time"""
+        timeout = self.config.timeout_for(method, route_template(endpoint))
+        return timeout if deadline is None else deadline.clip(timeout)
+    
+    def _send(
+        self, method: str, url: str, endpoint: str, data: Optional[Dict], params: Optional[Dict], headers: Dict[str, str],
+        stream: bool = False, timeout: Optional[Tuple[float, float]] = None, deadline: Optional[Deadline] = None
+    ) -> requests.Response:
+        """Send one HTTP request, recording it in the metrics when enabled"""
+        body = self._encode_body(data, headers)
+        metrics = self.metrics
+        if metrics is None:
+            return self._request(method, url, endpoint, body, params, headers, stream, timeout, deadline)
+        
+        route = route_template(endpoint)
+        metrics.request_started(method, route)
+        started = time.perf_counter()
+        try:
+            response = self._request(method, url, endpoint, body, params, headers, stream, timeout, deadline)
+        except requests.exceptions.RequestException:
+            metrics.request_finished(method, route, 'error', time.perf_counter() - started)
+            raise
+        # A streamed body has not been read yet; count its (possibly compressed) declared length
+        bytes_in = int(response.headers.get('Content-Length') or 0) if stream else len(response.content)
+        metrics.request_finished(
+            method, route, str(response.status_code), time.perf_counter() - started,
+            bytes_out=len(response.request.body or b''), bytes_in=bytes_in
+        )
+        return response
+    
+    def _request(
+        self, method: str, url: str, endpoint: str, body: Optional[bytes], params: Optional[Dict], headers: Dict[str, str],
+        stream: bool, timeout: Optional[Tuple[float, float]], deadline: Optional[Deadline] = None
+    ) -> requests.Response:
+        """
+        One HTTP exchange; GETs are hedged when hedge_requests is on
+
+        With a deadline, a non-streamed body is read here, a step at a time, so a
+        body that keeps trickling in cannot outlast the deadline.
+        """
+        if timeout is None:
+            timeout = (self.config.connect_timeout, self.config.read_timeout)
+        read_body = deadline is not None and not stream
+        
+        def send() -> requests.Response:
+            response = self.session.request(
+                method=method, url=url, data=body, params=params, headers=headers, timeout=timeout, stream=stream or read_body
+            )
+            if read_body:
+                self._read_body(response, deadline)
+            return response
+        
+        if self.hedger is None or method != 'GET':
+            return send()
+        return self.hedger.request(route_template(endpoint), send)
+    
+    def _encode_body(self, data: Optional[Dict], headers: Dict[str, str]) -> Optional[bytes]:
+        """JSON request body, gzipped when compress_requests is on and it is large enough"""
+        if data is None:
+            return None
+        body = jsoncodec.dumps(data)
+        if self.config.compress_requests and len(body) >= self.config.compress_min_bytes:
+            body = gzip.compress(body, compresslevel=5)
+            headers['Content-Encoding'] = 'gzip'
+        return body
+    
+    def _on_retry(self, reason: str, method: str, endpoint: str, delay: float, context: Optional[RequestContext]) -> None:
+        with self._retries_lock:
+            self.retries[reason] += 1
+        if self.metrics is not None:
+            self.metrics.retry(method, route_template(endpoint), reason)
+        if context is not None:
+            self.hooks.on_retry(context, reason, delay)
+    
+    def _on_error(self, error: BridgeAPIError, context: Optional[RequestContext]) -> BridgeAPIError:
+        if context is not None:
+            if context.error is None:
+                context.error = error
+            self.hooks.on_error(context, error)
+        return error
+    
+    def use(self, middleware: Any) -> Any:
+        """Register a middleware object (see utils.hooks) for every request"""
+        return self.hooks.use(middleware)
+    
+    def add_hook(self, event: str, func: Callable) -> Callable:
+        """Register a single hook: before_request, after_response, on_retry or on_error"""
+        return self.hooks.add(event, func)
+    
+    def close(self) -> None:
+        """Close pooled connections"""
+        with self._sessions_lock:
+            for session in list(self._sessions):
+                session.close()
+        self.adapter.close()
+        if self.hedger is not None:
+            self.hedger.close()
+    
+    def get(self, endpoint: str, params: Optional[Dict] = None, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """Make GET request"""
-        return self._make_request('GET', endpoint, params=params)
+        return self._make_request('GET', endpoint, params=params, deadline=deadline)
+    
+    def get_stream(self, endpoint: str, params: Optional[Dict] = None, deadline: Optional[Deadline] = None) -> StreamedPage:
+        """
+        Make GET request to a list endpoint, decoding the items of its data array as they arrive
+        
+        Errors and retries are handled as for get() until the response headers arrive;
+        a connection failure while the items are read raises BridgeAPIError from iteration.
+        Close the page (or read it to the end) to release its connection. A deadline
+        bounds the request and each read of the body, not the time spent iterating.
+        """
+        return self._make_request('GET', endpoint, params=params, stream=True, deadline=deadline)
     
-    def post(self, endpoint: str, data: Dict[str, Any], idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+    def post(
+        self, endpoint: str, data: Dict[str, Any], idempotency_key: Optional[str] = None, deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
         """Make POST request"""
         if idempotency_key is None:
             idempotency_key = generate_idempotency_key()
-        return self._make_request('POST', endpoint, data=data, idempotency_key=idempotency_key)
+        return self._make_request('POST', endpoint, data=data, idempotency_key=idempotency_key, deadline=deadline)
     
-    def put(self, endpoint: str, data: Dict[str, Any], idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+    def put(
+        self, endpoint: str, data: Dict[str, Any], idempotency_key: Optional[str] = None, deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
         """Make PUT request"""
         if idempotency_key is None:
             idempotency_key = generate_idempotency_key()
-        return self._make_request('PUT', endpoint, data=data, idempotency_key=idempotency_key)
+        return self._make_request('PUT', endpoint, data=data, idempotency_key=idempotency_key, deadline=deadline)
     
-    def patch(self, endpoint: str, data: Dict[str, Any], idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+    def patch(
+        self, endpoint: str, data: Dict[str, Any], idempotency_key: Optional[str] = None, deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
         """Make PATCH request"""
         if idempotency_key is None:
             idempotency_key = generate_idempotency_key()
-        return self._make_request('PATCH', endpoint, data=data, idempotency_key=idempotency_key)
+        return self._make_request('PATCH', endpoint, data=data, idempotency_key=idempotency_key, deadline=deadline)
     
-    def delete(self, endpoint: str) -> Dict[str, Any]:
+    def delete(self, endpoint: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """Make DELETE request"""
-        return self._make_request('DELETE', endpoint)
+        return self._make_request('DELETE', endpoint, deadline=deadline)
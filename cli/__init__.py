@@ -1,15 +1,25 @@
 """
 CLI command modules for Bridge API integration
+
+Command groups are imported on first access, so running one command only loads
+the module (and services) it needs.
 """
 
-from .customers import customers_cli
-from .transfers import transfers_cli
-from .wallets import wallets_cli
-from .accounts import accounts_cli
-
-__all__ = [
-    'customers_cli',
-    'transfers_cli',
-    'wallets_cli',
-    'accounts_cli'
-]
+import importlib
+
+_EXPORTS = {
+    'customers_cli': '.customers',
+    'transfers_cli': '.transfers',
+    'wallets_cli': '.wallets',
+    'accounts_cli': '.accounts'
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -6,12 +6,24 @@ import click
 import json
 from typing import Dict, Any
 
+from services.customers import CustomerService
 from services.external_accounts import ExternalAccountService
+from services.external_account_index import ExternalAccountIndex
+from services.account_provisioning import BulkAccountProvisioner, read_rows
 from models import ExternalAccountRequest, Address
 from utils.logger import setup_logger
+from utils.output import list_output_options, stream_list
 
 logger = setup_logger(__name__)
 
+EXTERNAL_ACCOUNT_INDEX_FILE = 'external_account_index.json'
+
+def load_account_index(ctx) -> ExternalAccountIndex:
+    """Load the local cross-customer external account index, kept on the context so shell sessions load it once"""
+    if 'account_index' not in ctx.obj:
+        ctx.obj['account_index'] = ExternalAccountIndex.load(ctx.obj['config'].data_path(EXTERNAL_ACCOUNT_INDEX_FILE))
+    return ctx.obj['account_index']
+
 @click.group()
 def accounts_cli():
     """External account management commands"""
@@ -36,11 +48,13 @@ def accounts_cli():
 @click.option('--state', required=True, help='State')
 @click.option('--postal-code', required=True, help='Postal code')
 @click.option('--country', required=True, help='Country')
+@click.option('--allow-duplicate', is_flag=True, help='Create even if the local index has the same bank, last 4 and owner')
 @click.pass_context
 def create(ctx, **kwargs):
     """Create a new external account"""
     client = ctx.obj['client']
-    account_service = ExternalAccountService(client)
+    index = load_account_index(ctx)
+    account_service = ExternalAccountService(client, index=index)
     
     try:
         # Build address
@@ -71,7 +85,14 @@ def create(ctx, **kwargs):
             address=address
         )
         
+        existing = None if kwargs['allow_duplicate'] else index.find_duplicate(account_request)
+        if existing is not None:
+            click.echo(f"⚠️  External account already exists: {existing['id']} (customer {existing.get('customer_id')})")
+            click.echo("Use --allow-duplicate to create it anyway.")
+            return
+        
         account = account_service.create_external_account(kwargs['customer_id'], account_request)
+        index.save()
         
         click.echo(f"✅ External account created successfully!")
         click.echo(f"Account ID: {account.id}")
@@ -83,6 +104,7 @@ def create(ctx, **kwargs):
         
     except Exception as e:
         click.echo(f"❌ Failed to create external account: {e}", err=True)
+        ctx.exit(1)
 
 @accounts_cli.command()
 @click.argument('customer_id')
@@ -109,18 +131,28 @@ def get(ctx, customer_id, account_id):
         
     except Exception as e:
         click.echo(f"❌ Failed to get external account: {e}", err=True)
+        ctx.exit(1)
 
 @accounts_cli.command()
 @click.argument('customer_id')
 @click.option('--limit', default=10, help='Number of accounts to retrieve')
 @click.option('--cursor', help='Pagination cursor')
+@list_output_options
 @click.pass_context
-def list(ctx, customer_id, limit, cursor):
+def list(ctx, customer_id, limit, cursor, output_format, all_pages, fields):
     """List external accounts for customer"""
     client = ctx.obj['client']
     account_service = ExternalAccountService(client)
     
     try:
+        if output_format != 'text' or all_pages or fields:
+            stream_list(
+                lambda **kwargs: account_service.list_external_accounts(customer_id, **kwargs),
+                limit, cursor, all_pages, output_format, fields,
+                labels=[('ID', 'id'), ('Bank', 'bank_name'), ('Account Name', 'account_name'), ('Last 4', 'last_4'), ('Active', 'active')]
+            )
+            return
+        
         response = account_service.list_external_accounts(customer_id, limit=limit, cursor=cursor)
         accounts = response.get('data', [])
         
@@ -145,6 +177,7 @@ def list(ctx, customer_id, limit, cursor):
         
     except Exception as e:
         click.echo(f"❌ Failed to list external accounts: {e}", err=True)
+        ctx.exit(1)
 
 @accounts_cli.command()
 @click.argument('customer_id')
@@ -153,15 +186,18 @@ def list(ctx, customer_id, limit, cursor):
 def delete(ctx, customer_id, account_id):
     """Delete external account"""
     client = ctx.obj['client']
-    account_service = ExternalAccountService(client)
+    index = load_account_index(ctx)
+    account_service = ExternalAccountService(client, index=index)
     
     try:
         response = account_service.delete_external_account(customer_id, account_id)
+        index.save()
         
         click.echo(f"✅ External account {account_id} deleted successfully!")
         
     except Exception as e:
         click.echo(f"❌ Failed to delete external account: {e}", err=True)
+        ctx.exit(1)
 
 @accounts_cli.command()
 @click.argument('customer_id')
@@ -179,3 +215,73 @@ def plaid_token(ctx, customer_id):
         
     except Exception as e:
         click.echo(f"❌ Failed to get Plaid link token: {e}", err=True)
+        ctx.exit(1)
+
+@accounts_cli.command()
+@click.option('--customer-id', 'customer_ids', multiple=True, help='Only index these customers (default: all customers)')
+@click.option('--workers', default=8, help='Number of customers listed concurrently')
+@click.option('--max-age', type=float, help='Skip customers indexed less than this many seconds ago')
+@click.pass_context
+def index(ctx, customer_ids, workers, max_age):
+    """Build or refresh the cross-customer external account index"""
+    client = ctx.obj['client']
+    account_service = ExternalAccountService(client)
+    
+    try:
+        account_index = load_account_index(ctx)
+        if not customer_ids:
+            customer_ids = (customer['id'] for customer in CustomerService(client).iter_customers())
+        
+        counts = account_index.sync(account_service, customer_ids, max_workers=workers, max_age=max_age)
+        account_index.save()
+        
+        click.echo(f"✅ Indexed {len(account_index)} external accounts")
+        click.echo(f"Customers refreshed: {counts['refreshed']}, skipped: {counts['skipped']}, failed: {counts['failed']}")
+        
+    except Exception as e:
+        click.echo(f"❌ Failed to index external accounts: {e}", err=True)
+        ctx.exit(1)
+
+@accounts_cli.command()
+@click.argument('input_file', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'file_format', type=click.Choice(['csv', 'ndjson']), help='Input format (default: from file extension)')
+@click.option('--results', 'results_path', help='Results log mapping rows to account IDs; also the resume checkpoint (default: <input>.results.ndjson)')
+@click.option('--workers', default=8, help='Number of concurrent create requests')
+@click.option('--allow-duplicate', is_flag=True, help='Do not skip rows matching an account in the local index')
+@click.option('--dry-run', is_flag=True, help='Only validate rows')
+@click.pass_context
+def bulk_create(ctx, input_file, file_format, results_path, workers, allow_duplicate, dry_run):
+    """Create external accounts in bulk from a CSV or NDJSON file
+    
+    Columns mirror the `accounts create` options in snake_case (customer_id,
+    bank_name, routing_number, address_line1, ...). Re-running with the same
+    results log resumes where the previous run stopped.
+    """
+    client = ctx.obj['client']
+    results_path = results_path or f"{input_file}.results.ndjson"
+    
+    try:
+        index = None if allow_duplicate else load_account_index(ctx)
+        provisioner = BulkAccountProvisioner(
+            ExternalAccountService(client),
+            results_path,
+            max_workers=workers,
+            index=index
+        )
+        
+        counts = provisioner.run(read_rows(input_file, file_format), dry_run=dry_run)
+        if index is not None and not dry_run:
+            index.save()
+        
+        if dry_run:
+            click.echo(f"Validated rows: {counts['valid']} valid, {counts['invalid']} invalid, "
+                       f"{counts['duplicate']} duplicate, {counts['skipped']} already done")
+            return
+        
+        click.echo(f"✅ Bulk create finished: {counts['created']} created, {counts['duplicate']} duplicate, "
+                   f"{counts['invalid']} invalid, {counts['failed']} failed, {counts['skipped']} already done")
+        click.echo(f"Results: {results_path}")
+        
+    except Exception as e:
+        click.echo(f"❌ Failed to bulk create external accounts: {e}", err=True)
+        ctx.exit(1)
@@ -0,0 +1,110 @@
+"""
+Load generator command for Bridge API integration
+
+Drives weighted mixes of real service calls at a chosen concurrency to size
+worker pools and rate limits, usually against the local mock server:
+
+    python main.py mock-server &
+    python main.py --base-url http://127.0.0.1:8787 --api-key test bench --scenario mixed --concurrency 64 --duration 60s
+"""
+
+import json
+import logging
+import re
+
+import click
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class Duration(click.ParamType):
+    """Duration such as 60s, 2m, 500ms or a plain number of seconds"""
+
+    name = 'duration'
+    UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, (int, float)):
+            return float(value)
+        match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*(ms|s|m|h)?\s*', str(value))
+        if not match:
+            self.fail(f"{value!r} is not a duration (e.g. 60s, 2m, 500ms)", param, ctx)
+        return float(match.group(1)) * self.UNITS[match.group(2) or 's']
+
+def _print_report(report) -> None:
+    from benchmarks.load import HISTOGRAM_BUCKETS_MS
+
+    cpu = report.cpu_user + report.cpu_system
+    click.echo(f"\nScenario: {report.scenario}   concurrency: {report.concurrency}   elapsed: {report.elapsed:.1f}s")
+    click.echo(f"Throughput: {report.throughput:,.1f} ops/s ({report.total:,} calls)")
+    error_rate = report.errors / report.total if report.total else 0.0
+    retry_total = sum(report.retries.values())
+    retry_detail = ', '.join(f"{reason} {count}" for reason, count in sorted(report.retries.items()))
+    click.echo(f"Errors: {report.errors:,} ({error_rate:.2%})   Retries: {retry_total:,} ({retry_total / max(report.total, 1):.3f}/call){f' [{retry_detail}]' if retry_detail else ''}")
+    rss = f"   max RSS {report.max_rss_mb:.0f} MB" if report.max_rss_mb else ''
+    click.echo(f"Client CPU: user {report.cpu_user:.1f}s  system {report.cpu_system:.1f}s  "
+               f"({cpu / report.elapsed:.0%} of one core, {cpu * 1000 / max(report.total, 1):.2f} ms/call){rss}")
+
+    click.echo(f"\n{'Operation':<18}{'calls':>9}{'ops/s':>10}{'err%':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, op in report.operations.items():
+        click.echo(f"{name:<18}{op.count:>9,}{op.count / report.elapsed:>10,.1f}{op.error_count / op.count:>8.2%}"
+                   f"{op.percentile_ms(0.50):>10.2f}{op.percentile_ms(0.95):>10.2f}{op.percentile_ms(0.99):>10.2f}{op.percentile_ms(1.0):>10.2f}")
+        for status, count in sorted(op.errors.items()):
+            click.echo(f"  error {status}: {count:,}")
+
+    click.echo("\nLatency histogram (all operations)")
+    counts = report.histogram()
+    peak = max(counts) or 1
+    for bound, count in zip(HISTOGRAM_BUCKETS_MS, counts):
+        label = f"<= {bound:g} ms" if bound != float('inf') else f"> {HISTOGRAM_BUCKETS_MS[-2]:g} ms"
+        click.echo(f"{label:>12} |{'#' * round(40 * count / peak):<40} {count:>9,} ({count / max(report.total, 1):6.2%})")
+
+@click.command()
+@click.option('--scenario', default='mixed', type=click.Choice(['mixed', 'reads', 'customers', 'transfers', 'quotes', 'balances']), help='Operation mix')
+@click.option('--concurrency', default=16, help='Concurrent worker threads')
+@click.option('--duration', default='30s', type=Duration(), help='How long to run, e.g. 60s or 2m')
+@click.option('--seed', default=1, help='Seed for operation choice and targets')
+@click.option('--allow-live', is_flag=True, help='Allow running against the real Bridge API (no --base-url)')
+@click.option('--json', 'json_path', type=click.Path(dir_okay=False), help='Also write the report as JSON')
+@click.pass_context
+def bench(ctx, scenario, concurrency, duration, seed, allow_live, json_path):
+    """Generate load through the service layer and report latency, errors and CPU"""
+    from bridge import Bridge
+    from benchmarks.load import SCENARIOS, WRITE_OPERATIONS, LoadGenerator, build_operations, discover_fixtures
+
+    config = ctx.obj['config']
+    if not config.api_url and not allow_live:
+        raise click.UsageError("bench targets the live Bridge API; pass --base-url (e.g. a mock server) or --allow-live")
+
+    weights = SCENARIOS[scenario]
+    bridge = Bridge(config, client=ctx.obj['client'])
+
+    try:
+        fixtures = discover_fixtures(bridge)
+    except Exception as e:
+        raise click.ClickException(f"Failed to discover customers and wallets: {e}")
+    if not fixtures.customer_ids or not fixtures.wallet_ids:
+        raise click.ClickException("bench needs at least one customer and one wallet to target")
+    if any(name in WRITE_OPERATIONS for name in weights) and not fixtures.transfer_account_id:
+        raise click.ClickException(f"Scenario '{scenario}' creates transfers but no external account was found for {fixtures.transfer_customer_id}")
+
+    generator = LoadGenerator(bridge, build_operations(bridge, fixtures), weights, concurrency, duration, seed)
+    click.echo(f"Running '{scenario}' against {config.base_url} with {concurrency} workers for {duration:g}s "
+               f"({len(fixtures.customer_ids)} customers, {len(fixtures.wallet_ids)} wallets)")
+
+    def progress(elapsed: float, calls: int) -> None:
+        click.echo(f"  {elapsed:6.1f}s  {calls:>9,} calls  {calls / elapsed:,.1f} ops/s", err=True)
+
+    # Per-call INFO logging would dominate client CPU and flood the terminal
+    logging.disable(logging.INFO)
+    try:
+        report = generator.run(scenario, progress=progress)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    _print_report(report)
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(report.to_dict(), f, indent=2)
+        click.echo(f"\nReport written to {json_path}")
@@ -4,14 +4,30 @@ Customer CLI commands for Bridge API integration
 
 import click
 import json
+import os
+import time
 from typing import Dict, Any
 
 from services.customers import CustomerService
+from services.customer_index import CustomerSearchIndex
 from models import CustomerRequest, Address, IdentifyingInformation
 from utils.logger import setup_logger
+from utils.output import list_output_options, stream_list
 
 logger = setup_logger(__name__)
 
+CUSTOMER_INDEX_FILE = 'customer_index.json'
+
+def _index_path(ctx) -> str:
+    """Location of the local customer search index"""
+    return ctx.obj['config'].data_path(CUSTOMER_INDEX_FILE)
+
+def _load_index(ctx) -> CustomerSearchIndex:
+    """Load the customer search index, kept on the context so shell sessions load it once"""
+    if 'customer_index' not in ctx.obj:
+        ctx.obj['customer_index'] = CustomerSearchIndex.load(_index_path(ctx))
+    return ctx.obj['customer_index']
+
 @click.group()
 def customers_cli():
     """Customer management commands"""
@@ -33,6 +49,7 @@ def create_tos_link(ctx, redirect_uri):
         
     except Exception as e:
         click.echo(f"❌ Failed to create TOS link: {e}", err=True)
+        ctx.exit(1)
 
 @customers_cli.command()
 @click.option('--type', type=click.Choice(['individual', 'business']), required=True, help='Customer type')
@@ -57,7 +74,8 @@ def create_tos_link(ctx, redirect_uri):
 def create(ctx, **kwargs):
     """Create a new customer"""
     client = ctx.obj['client']
-    customer_service = CustomerService(client)
+    index = _load_index(ctx) if os.path.exists(_index_path(ctx)) else None
+    customer_service = CustomerService(client, index=index)
     
     try:
         # Build address
@@ -99,8 +117,12 @@ def create(ctx, **kwargs):
         click.echo(f"Status: {customer.status}")
         click.echo(f"Email: {customer.email}")
         
+        if index is not None:
+            index.save()
+        
     except Exception as e:
         click.echo(f"❌ Failed to create customer: {e}", err=True)
+        ctx.exit(1)
 
 @customers_cli.command()
 @click.argument('customer_id')
@@ -122,17 +144,27 @@ def get(ctx, customer_id):
         
     except Exception as e:
         click.echo(f"❌ Failed to get customer: {e}", err=True)
+        ctx.exit(1)
 
 @customers_cli.command()
 @click.option('--limit', default=10, help='Number of customers to retrieve')
 @click.option('--cursor', help='Pagination cursor')
+@list_output_options
 @click.pass_context
-def list(ctx, limit, cursor):
+def list(ctx, limit, cursor, output_format, all_pages, fields):
     """List customers"""
     client = ctx.obj['client']
     customer_service = CustomerService(client)
     
     try:
+        if output_format != 'text' or all_pages or fields:
+            stream_list(
+                customer_service.list_customers,
+                limit, cursor, all_pages, output_format, fields,
+                labels=[('ID', 'id'), ('First Name', 'first_name'), ('Last Name', 'last_name'), ('Email', 'email'), ('Status', 'status')]
+            )
+            return
+        
         response = customer_service.list_customers(limit=limit, cursor=cursor)
         customers = response.get('data', [])
         
@@ -156,6 +188,7 @@ def list(ctx, limit, cursor):
         
     except Exception as e:
         click.echo(f"❌ Failed to list customers: {e}", err=True)
+        ctx.exit(1)
 
 @customers_cli.command()
 @click.argument('customer_id')
@@ -173,3 +206,57 @@ def kyc_status(ctx, customer_id):
         
     except Exception as e:
         click.echo(f"❌ Failed to get KYC status: {e}", err=True)
+        ctx.exit(1)
+
+@customers_cli.command()
+@click.argument('query', nargs=-1, required=True)
+@click.option('--fuzzy', is_flag=True, help='Also match terms within one typo')
+@click.option('--limit', default=20, help='Maximum number of results')
+@click.option('--sync', 'sync_index', is_flag=True, help='Sync the local index with the API before searching')
+@click.pass_context
+def search(ctx, query, fuzzy, limit, sync_index):
+    """Search customers by email, name, phone, status or type
+    
+    Terms match by prefix and all terms must match. Use field:value to restrict
+    a term to one field, e.g. "status:active smi".
+    """
+    path = _index_path(ctx)
+    
+    try:
+        started = time.perf_counter()
+        index = _load_index(ctx)
+        load_ms = (time.perf_counter() - started) * 1000
+        
+        if index.needs_rebuild:
+            click.echo("Rebuilding the customer index saved by an older version...")
+        if sync_index or not os.path.exists(path) or index.needs_rebuild:
+            customer_service = CustomerService(ctx.obj['client'])
+            counts = index.sync(customer_service.iter_customers())
+            index.save()
+            click.echo(f"Index synced: {len(index)} customers "
+                       f"({counts['added']} added, {counts['updated']} updated, {counts['removed']} removed)")
+        
+        started = time.perf_counter()
+        results = index.search(' '.join(query), fuzzy=fuzzy, limit=limit)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        
+        timing = f"{elapsed_ms:.1f} ms, index load {load_ms:.1f} ms"
+        if not results:
+            click.echo(f"No customers found ({timing}).")
+            return
+        
+        click.echo(f"Found {len(results)} customers ({timing}):")
+        click.echo()
+        
+        for customer in results:
+            click.echo(f"ID: {customer['id']}")
+            click.echo(f"Name: {customer['first_name']} {customer['last_name']}")
+            click.echo(f"Email: {customer['email']}")
+            if customer['phone']:
+                click.echo(f"Phone: {customer['phone']}")
+            click.echo(f"Status: {customer['status']}")
+            click.echo("---")
+        
+    except Exception as e:
+        click.echo(f"❌ Failed to search customers: {e}", err=True)
+        ctx.exit(1)
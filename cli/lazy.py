@@ -0,0 +1,71 @@
+"""
+Lazy-loading helpers for the Bridge API CLI
+
+Subcommand modules, services and the HTTP client are only imported or created
+when a command actually needs them, keeping startup (and --help) fast.
+"""
+
+import importlib
+from typing import Dict, Optional, Tuple
+
+import click
+
+class LazyGroup(click.Group):
+    """Click group that imports its subcommands on first use"""
+
+    def __init__(self, *args, lazy_subcommands: Optional[Dict[str, Tuple[str, str]]] = None, **kwargs):
+        """
+        Args:
+            lazy_subcommands: Mapping of command name to ("module:attribute", short help).
+                The short help is shown in --help without importing the module.
+        """
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx: click.Context):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            import_path, _ = self.lazy_subcommands[cmd_name]
+            module_name, attribute = import_path.split(':')
+            command = getattr(importlib.import_module(module_name), attribute)
+            self.add_command(command, cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        """List commands without importing lazy ones"""
+        rows = []
+        for name in self.list_commands(ctx):
+            if name in self.commands:
+                command = self.commands[name]
+                if command.hidden:
+                    continue
+                rows.append((name, command.get_short_help_str(formatter.width - 6 - len(name))))
+            else:
+                rows.append((name, self.lazy_subcommands[name][1]))
+
+        if rows:
+            with formatter.section('Commands'):
+                formatter.write_dl(rows)
+
+class CliContext(dict):
+    """CLI context object whose Bridge client is created on first access of ctx.obj['client']"""
+
+    def __missing__(self, key: str):
+        if key != 'client':
+            raise KeyError(key)
+
+        config = self['config']
+        if not config.api_key:
+            raise click.UsageError("API key is required. Set BRIDGE_API_KEY environment variable or use --api-key option.")
+
+        from bridge_client import BridgeClient
+        from utils.logger import setup_logger
+
+        client = BridgeClient(config)
+        if 'span_recorder' in self:
+            self['span_recorder'].install(client)
+        self['client'] = client
+        setup_logger(__name__).info("Initialized Bridge API client for %s environment", config.environment)
+        return client
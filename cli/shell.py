@@ -0,0 +1,167 @@
+"""
+Interactive shell and batch script commands for Bridge API integration
+
+Both run many CLI commands in one process, sharing a single Bridge client,
+its connection pool and the local caches across all of them.
+"""
+
+import shlex
+from typing import List, Optional
+
+import click
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+SESSION_COMMANDS = ('shell', 'run')
+EXIT_WORDS = ('exit', 'quit')
+
+def execute_line(ctx: click.Context, line: str) -> int:
+    """
+    Run one command line against the root command group, reusing the session context
+
+    Args:
+        ctx: Context of the running shell/run command
+        line: Command line without the program name, e.g. "customers get <id>"
+
+    Returns:
+        Exit code of the command (0 on success)
+    """
+    args = shlex.split(line, comments=True)
+    if not args:
+        return 0
+
+    root = ctx.find_root()
+    group = root.command
+
+    if args[0] in SESSION_COMMANDS:
+        click.echo(f"❌ '{args[0]}' cannot be nested in a session", err=True)
+        return 1
+    if args[0] == 'help':
+        click.echo(group.get_help(root))
+        return 0
+
+    try:
+        cmd_name, cmd, rest = group.resolve_command(root, args)
+        # Parenting on the root context shares ctx.obj (client, caches) with every command
+        with cmd.make_context(cmd_name, rest, parent=root) as sub_ctx:
+            cmd.invoke(sub_ctx)
+        return 0
+    except click.exceptions.Exit as e:
+        return e.exit_code
+    except click.ClickException as e:
+        e.show()
+        return e.exit_code
+    except click.Abort:
+        click.echo("Aborted!", err=True)
+        return 1
+
+def _completion_candidates(group: click.Group, ctx: click.Context, words: List[str], prefix: str) -> List[str]:
+    """Subcommand names and options matching prefix after the given words"""
+    command: click.Command = group
+    for word in words:
+        if isinstance(command, click.Group):
+            sub = command.get_command(ctx, word)
+            if sub is None:
+                break
+            command = sub
+
+    candidates: List[str] = []
+    if isinstance(command, click.Group):
+        candidates.extend(name for name in command.list_commands(ctx) if name not in SESSION_COMMANDS)
+    if command is not group:
+        for param in command.params:
+            if isinstance(param, click.Option):
+                candidates.extend(param.opts)
+        candidates.append('--help')
+    return sorted(candidate for candidate in candidates if candidate.startswith(prefix))
+
+def _install_completion(ctx: click.Context) -> None:
+    """Enable readline tab completion over the command tree, if readline is available"""
+    try:
+        import readline
+    except ImportError:
+        return
+
+    root = ctx.find_root()
+    matches: List[str] = []
+
+    def complete(text: str, state: int) -> Optional[str]:
+        if state == 0:
+            buffer = readline.get_line_buffer()[:readline.get_endidx()]
+            try:
+                words = shlex.split(buffer)
+            except ValueError:
+                words = buffer.split()
+            if text and words and words[-1] == text:
+                words = words[:-1]
+            matches[:] = [f"{candidate} " for candidate in _completion_candidates(root.command, root, words, text)]
+        return matches[state] if state < len(matches) else None
+
+    readline.set_completer(complete)
+    readline.set_completer_delims(' \t\n')
+    readline.parse_and_bind('tab: complete')
+
+@click.command()
+@click.pass_context
+def shell(ctx):
+    """Interactive shell sharing one client across commands"""
+    _install_completion(ctx)
+    click.echo("Bridge API shell. Type 'help' for commands, 'exit' to quit.")
+
+    while True:
+        try:
+            line = input('bridge> ')
+        except EOFError:
+            click.echo()
+            break
+        except KeyboardInterrupt:
+            click.echo()
+            continue
+
+        if line.strip() in EXIT_WORDS:
+            break
+        try:
+            execute_line(ctx, line)
+        except KeyboardInterrupt:
+            click.echo("\nInterrupted", err=True)
+        except Exception as e:  # a failing command must not end the session
+            logger.debug("Command %r failed", line, exc_info=True)
+            click.echo(f"❌ {e}", err=True)
+
+@click.command()
+@click.argument('script', type=click.File('r'))
+@click.option('--echo/--no-echo', default=True, help='Print each command before running it')
+@click.option('--stop-on-error', is_flag=True, help='Stop at the first command that exits with an error')
+@click.pass_context
+def run(ctx, script, echo, stop_on_error):
+    """Run a file of CLI commands (one per line, # for comments) sharing one client
+
+    Use '-' to read commands from stdin.
+    """
+    failures = 0
+
+    for line_number, line in enumerate(script, start=1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if echo:
+            click.echo(f"> {line}")
+
+        try:
+            exit_code = execute_line(ctx, line)
+        except Exception as e:
+            logger.debug("Line %s failed", line_number, exc_info=True)
+            click.echo(f"❌ Line {line_number}: {e}", err=True)
+            exit_code = 1
+
+        if exit_code:
+            failures += 1
+            if stop_on_error:
+                click.echo(f"❌ Stopped at line {line_number}", err=True)
+                ctx.exit(exit_code)
+
+    if failures:
+        click.echo(f"⚠️  {failures} commands failed", err=True)
+        ctx.exit(1)
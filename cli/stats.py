@@ -0,0 +1,70 @@
+"""
+Request statistics command for Bridge API integration
+
+Runs a CLI command with request metrics enabled and prints per-route latency,
+error and retry statistics; in a shell session it reports everything so far.
+"""
+
+import json
+import shlex
+
+import click
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+def _print_table(rows, err: bool = False) -> None:
+    if not rows:
+        click.echo("No requests recorded.", err=err)
+        return
+
+    click.echo(f"{'Method':<7}{'Route':<52}{'Calls':>7}{'Err':>6}{'429':>6}{'Retry':>6}"
+               f"{'Mean ms':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'KB out':>9}{'KB in':>9}", err=err)
+    for row in rows:
+        click.echo(f"{row['method']:<7}{row['route']:<52}{row['calls']:>7}{row['errors']:>6}{row['rate_limited']:>6}{row['retries']:>6}"
+                   f"{row['mean_ms']:>9.1f}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}"
+                   f"{row['bytes_out'] / 1024:>9.1f}{row['bytes_in'] / 1024:>9.1f}", err=err)
+    click.echo("(percentiles are estimated from histogram buckets)", err=err)
+
+@click.command(context_settings={'ignore_unknown_options': True, 'allow_interspersed_args': False})
+@click.option('--format', 'output_format', type=click.Choice(['table', 'json', 'prometheus']), default='table', help='Output format')
+@click.option('--reset', is_flag=True, help='Clear metrics recorded so far before running')
+@click.argument('command_line', nargs=-1, type=click.UNPROCESSED)
+@click.pass_context
+def stats(ctx, output_format, reset, command_line):
+    """Run a command with request metrics and print per-route stats
+
+    \b
+    Example: python main.py stats customers list --all --format ndjson
+    Without a command (e.g. in the shell) shows metrics recorded so far.
+    """
+    from cli.shell import execute_line
+    from utils.metrics import get_metrics
+
+    metrics = get_metrics()
+    if reset:
+        metrics.reset()
+
+    client = ctx.obj['client']
+    if client.metrics is None:
+        if not command_line:
+            click.echo("Metrics were not enabled for this session; start it with --metrics, or pass a command to measure.", err=True)
+        client.metrics = metrics
+
+    exit_code = 0
+    if command_line:
+        exit_code = execute_line(ctx, shlex.join(command_line))
+        click.echo(err=True)
+
+    # After a command, stats go to stderr so the command's own stdout stays pipeable
+    err = bool(command_line)
+    if output_format == 'json':
+        click.echo(json.dumps(client.metrics.summary(), indent=2), err=err)
+    elif output_format == 'prometheus':
+        click.echo(client.metrics.render_prometheus(), nl=False, err=err)
+    else:
+        _print_table(client.metrics.summary(), err=err)
+
+    if exit_code:
+        ctx.exit(exit_code)
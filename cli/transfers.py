@@ -9,6 +9,7 @@ from typing import Dict, Any
 from services.transfers import TransferService
 from models import TransferRequest, TransferSource, TransferDestination
 from utils.logger import setup_logger
+from utils.output import list_output_options, stream_list
 
 logger = setup_logger(__name__)
 
@@ -24,10 +25,13 @@ def transfers_cli():
 @click.option('--source-currency', required=True, type=click.Choice(['usd', 'usdc', 'usdt']), help='Source currency')
 @click.option('--source-address', help='Source address (for crypto)')
 @click.option('--source-account-id', help='Source external account ID (for fiat)')
+@click.option('--source-account-last4', help='Resolve source external account from the local index by last 4 digits')
 @click.option('--dest-rail', required=True, type=click.Choice(['ach', 'wire', 'polygon', 'ethereum', 'arbitrum', 'base']), help='Destination payment rail')
 @click.option('--dest-currency', required=True, type=click.Choice(['usd', 'usdc', 'usdt']), help='Destination currency')
 @click.option('--dest-address', help='Destination address (for crypto)')
 @click.option('--dest-account-id', help='Destination external account ID (for fiat)')
+@click.option('--dest-account-last4', help='Resolve destination external account from the local index by last 4 digits')
+@click.option('--bank-name', help='Bank name to disambiguate --*-account-last4 lookups')
 @click.pass_context
 def create(ctx, **kwargs):
     """Create a new transfer"""
@@ -35,6 +39,15 @@ def create(ctx, **kwargs):
     transfer_service = TransferService(client)
     
     try:
+        # Resolve external account IDs locally (see `accounts index`)
+        if kwargs['source_account_last4'] or kwargs['dest_account_last4']:
+            from cli.accounts import load_account_index
+            account_index = load_account_index(ctx)
+            for side in ('source', 'dest'):
+                last_4 = kwargs[f'{side}_account_last4']
+                if last_4 and not kwargs[f'{side}_account_id']:
+                    kwargs[f'{side}_account_id'] = account_index.resolve(kwargs['customer_id'], last_4, kwargs['bank_name'])
+        
         # Build source
         source = TransferSource(
             payment_rail=kwargs['source_rail'],
@@ -69,6 +82,7 @@ def create(ctx, **kwargs):
         
     except Exception as e:
         click.echo(f"❌ Failed to create transfer: {e}", err=True)
+        ctx.exit(1)
 
 @transfers_cli.command()
 @click.argument('transfer_id')
@@ -92,18 +106,28 @@ def get(ctx, transfer_id):
         
     except Exception as e:
         click.echo(f"❌ Failed to get transfer: {e}", err=True)
+        ctx.exit(1)
 
 @transfers_cli.command()
 @click.option('--limit', default=10, help='Number of transfers to retrieve')
 @click.option('--cursor', help='Pagination cursor')
 @click.option('--customer-id', help='Filter by customer ID')
+@list_output_options
 @click.pass_context
-def list(ctx, limit, cursor, customer_id):
+def list(ctx, limit, cursor, customer_id, output_format, all_pages, fields):
     """List transfers"""
     client = ctx.obj['client']
     transfer_service = TransferService(client)
     
     try:
+        if output_format != 'text' or all_pages or fields:
+            stream_list(
+                lambda **kwargs: transfer_service.stream_transfers(customer_id=customer_id, **kwargs),
+                limit, cursor, all_pages, output_format, fields,
+                labels=[('ID', 'id'), ('Amount', 'amount'), ('Status', 'status'), ('Customer', 'on_behalf_of')]
+            )
+            return
+        
         response = transfer_service.list_transfers(limit=limit, cursor=cursor, customer_id=customer_id)
         transfers = response.get('data', [])
         
@@ -127,6 +151,7 @@ def list(ctx, limit, cursor, customer_id):
         
     except Exception as e:
         click.echo(f"❌ Failed to list transfers: {e}", err=True)
+        ctx.exit(1)
 
 @transfers_cli.command()
 @click.argument('transfer_id')
@@ -144,6 +169,7 @@ def cancel(ctx, transfer_id):
         
     except Exception as e:
         click.echo(f"❌ Failed to cancel transfer: {e}", err=True)
+        ctx.exit(1)
 
 @transfers_cli.command()
 @click.argument('transfer_id')
@@ -161,6 +187,7 @@ def receipt(ctx, transfer_id):
         
     except Exception as e:
         click.echo(f"❌ Failed to get transfer receipt: {e}", err=True)
+        ctx.exit(1)
 
 @transfers_cli.command()
 @click.option('--source-currency', required=True, help='Source currency')
@@ -180,3 +207,38 @@ def quote(ctx, source_currency, dest_currency, amount):
         
     except Exception as e:
         click.echo(f"❌ Failed to get quote: {e}", err=True)
+        ctx.exit(1)
+
+@transfers_cli.command()
+@click.option('--output-dir', required=True, type=click.Path(file_okay=False), help='Root directory of the day-partitioned export')
+@click.option('--format', 'export_format', type=click.Choice(['csv', 'ndjson', 'parquet']), default='csv', help='File format (parquet needs the parquet extra: pyarrow)')
+@click.option('--customer-id', help='Only export transfers of this customer')
+@click.option('--page-size', default=100, help='Transfers fetched per API request')
+@click.option('--row-group-size', default=50000, help='Rows per Parquet row group')
+@click.option('--full', is_flag=True, help='Ignore the saved state and re-export the whole history, replacing earlier files')
+@click.pass_context
+def export(ctx, output_dir, export_format, customer_id, page_size, row_group_size, full):
+    """Export transfers since the last run into date=YYYY-MM-DD partitions"""
+    from services.transfer_export import TransferExporter
+    
+    client = ctx.obj['client']
+    transfer_service = TransferService(client)
+    
+    try:
+        exporter = TransferExporter(transfer_service, output_dir, export_format, row_group_size=row_group_size)
+        summary = exporter.run(page_size=page_size, full=full, customer_id=customer_id)
+        
+        if not summary['exported']:
+            click.echo("✅ Export is up to date, no new transfers.")
+            return
+        
+        click.echo(f"✅ Exported {summary['exported']} transfers into {len(summary['files'])} files")
+        for day, count in summary['days'].items():
+            click.echo(f"  {day}: {count}")
+        click.echo(f"High-water mark: {summary['high_water_mark']}")
+        if summary['open']:
+            click.echo(f"{summary['open']} transfers not yet final are re-exported when they change")
+        
+    except Exception as e:
+        click.echo(f"❌ Failed to export transfers: {e}", err=True)
+        ctx.exit(1)
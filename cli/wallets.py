@@ -4,13 +4,34 @@ Wallet CLI commands for Bridge API integration
 
 import click
 import json
+import os
 from typing import Dict, Any
 
 from services.wallets import WalletService
+from services.portfolio import PortfolioService
+from services.wallet_ledger import WalletLedger
+from utils.cache import PersistentCache
 from utils.logger import setup_logger
+from utils.output import list_output_options, stream_list
 
 logger = setup_logger(__name__)
 
+LEDGER_DIR = 'ledgers'
+IMMUTABLE_CACHE_FILE = 'immutable_cache.sqlite'
+
+def _address_cache(ctx) -> PersistentCache:
+    """Persistent cache of wallet addresses, shared across processes and kept on the context"""
+    if 'address_cache' not in ctx.obj:
+        cache = PersistentCache(ctx.obj['config'].data_path(IMMUTABLE_CACHE_FILE), namespace='wallet_address')
+        # Warm the in-memory LRU from disk once, so lookups in this process skip SQLite
+        cache.load_memory()
+        ctx.obj['address_cache'] = cache
+    return ctx.obj['address_cache']
+
+def _ledger(ctx, wallet_id: str) -> WalletLedger:
+    """Open the local transaction ledger of a wallet"""
+    return WalletLedger(os.path.join(ctx.obj['config'].data_dir, LEDGER_DIR), wallet_id)
+
 @click.group()
 def wallets_cli():
     """Wallet management commands"""
@@ -38,6 +59,7 @@ def create(ctx, customer_id, currency):
         
     except Exception as e:
         click.echo(f"❌ Failed to create wallet: {e}", err=True)
+        ctx.exit(1)
 
 @wallets_cli.command()
 @click.argument('wallet_id')
@@ -61,18 +83,28 @@ def get(ctx, wallet_id):
         
     except Exception as e:
         click.echo(f"❌ Failed to get wallet: {e}", err=True)
+        ctx.exit(1)
 
 @wallets_cli.command()
 @click.option('--customer-id', help='Filter by customer ID')
 @click.option('--limit', default=10, help='Number of wallets to retrieve')
 @click.option('--cursor', help='Pagination cursor')
+@list_output_options
 @click.pass_context
-def list(ctx, customer_id, limit, cursor):
+def list(ctx, customer_id, limit, cursor, output_format, all_pages, fields):
     """List wallets"""
     client = ctx.obj['client']
     wallet_service = WalletService(client)
     
     try:
+        if output_format != 'text' or all_pages or fields:
+            stream_list(
+                lambda **kwargs: wallet_service.list_wallets(customer_id=customer_id, **kwargs),
+                limit, cursor, all_pages, output_format, fields,
+                labels=[('ID', 'id'), ('Customer', 'customer_id'), ('Currency', 'currency'), ('Balance', 'balance')]
+            )
+            return
+        
         response = wallet_service.list_wallets(customer_id=customer_id, limit=limit, cursor=cursor)
         wallets = response.get('data', [])
         
@@ -96,6 +128,7 @@ def list(ctx, customer_id, limit, cursor):
         
     except Exception as e:
         click.echo(f"❌ Failed to list wallets: {e}", err=True)
+        ctx.exit(1)
 
 @wallets_cli.command()
 @click.argument('wallet_id')
@@ -113,6 +146,7 @@ def balance(ctx, wallet_id):
         
     except Exception as e:
         click.echo(f"❌ Failed to get wallet balance: {e}", err=True)
+        ctx.exit(1)
 
 @wallets_cli.command()
 @click.argument('wallet_id')
@@ -149,15 +183,17 @@ def transactions(ctx, wallet_id, limit, cursor):
         
     except Exception as e:
         click.echo(f"❌ Failed to get wallet transactions: {e}", err=True)
+        ctx.exit(1)
 
 @wallets_cli.command()
 @click.argument('wallet_id')
 @click.option('--currency', required=True, help='Currency for address')
+@click.option('--no-cache', is_flag=True, help='Bypass the local address cache')
 @click.pass_context
-def address(ctx, wallet_id, currency):
+def address(ctx, wallet_id, currency, no_cache):
     """Get wallet address for specific currency"""
     client = ctx.obj['client']
-    wallet_service = WalletService(client)
+    wallet_service = WalletService(client, address_cache=None if no_cache else _address_cache(ctx))
     
     try:
         response = wallet_service.get_wallet_address(wallet_id, currency)
@@ -167,3 +203,134 @@ def address(ctx, wallet_id, currency):
         
     except Exception as e:
         click.echo(f"❌ Failed to get wallet address: {e}", err=True)
+        ctx.exit(1)
+
+@wallets_cli.command()
+@click.option('--customer-id', help='Only include wallets of this customer')
+@click.option('--group-by', type=click.Choice(['currency', 'customer']), default='currency', help='How to group totals')
+@click.option('--workers', default=32, help='Number of concurrent balance reads')
+@click.option('--cache-ttl', default=30.0, help='Seconds a fetched balance is reused')
+@click.option('--json', 'as_json', is_flag=True, help='Print totals as JSON')
+@click.pass_context
+def portfolio(ctx, customer_id, group_by, workers, cache_ttl, as_json):
+    """Show total balances across wallets"""
+    client = ctx.obj['client']
+    portfolio_service = PortfolioService(WalletService(client), max_workers=workers, cache_ttl=cache_ttl)
+    
+    try:
+        summary = portfolio_service.summarize(customer_id=customer_id)
+        
+        if as_json:
+            click.echo(json.dumps(summary.to_dict(), indent=2))
+            return
+        
+        if not summary.wallets:
+            click.echo("No wallets found.")
+            return
+        
+        click.echo(f"Portfolio across {summary.wallets} wallets:")
+        click.echo()
+        
+        if group_by == 'currency':
+            for currency, amount in sorted(summary.by_currency.items()):
+                click.echo(f"{currency}: {amount}")
+        else:
+            for customer, totals in sorted(summary.by_customer.items()):
+                click.echo(f"Customer: {customer}")
+                for currency, amount in sorted(totals.items()):
+                    click.echo(f"  {currency}: {amount}")
+                click.echo("---")
+        
+        if summary.errors:
+            click.echo(f"\n⚠️  {len(summary.errors)} wallet balances could not be read", err=True)
+        
+    except Exception as e:
+        click.echo(f"❌ Failed to build portfolio: {e}", err=True)
+        ctx.exit(1)
+
+@wallets_cli.command()
+@click.argument('wallet_ids', nargs=-1, required=True)
+@click.option('--page-size', default=100, help='Transactions fetched per page')
+@click.pass_context
+def ledger_sync(ctx, wallet_ids, page_size):
+    """Append new wallet transactions to the local ledger"""
+    client = ctx.obj['client']
+    wallet_service = WalletService(client)
+    
+    failed = 0
+    for wallet_id in wallet_ids:
+        try:
+            ledger = _ledger(ctx, wallet_id)
+            appended = ledger.sync(wallet_service, page_size=page_size)
+            click.echo(f"✅ Wallet {wallet_id}: {appended} new transactions ({len(ledger)} in ledger)")
+            
+        except Exception as e:
+            click.echo(f"❌ Failed to sync ledger for wallet {wallet_id}: {e}", err=True)
+            failed += 1
+    if failed:
+        ctx.exit(1)
+
+@wallets_cli.command()
+@click.argument('wallet_id')
+@click.option('--since', help='First day to include (YYYY-MM-DD)')
+@click.option('--until', help='Last day to include (YYYY-MM-DD)')
+@click.option('--id', 'transaction_id', help='Show a single transaction')
+@click.option('--json', 'as_json', is_flag=True, help='Print transactions as NDJSON')
+@click.pass_context
+def ledger(ctx, wallet_id, since, until, transaction_id, as_json):
+    """Query the local transaction ledger of a wallet (run ledger-sync first)"""
+    try:
+        wallet_ledger = _ledger(ctx, wallet_id)
+        
+        if transaction_id:
+            transaction = wallet_ledger.get(transaction_id)
+            if transaction is None:
+                click.echo(f"Transaction {transaction_id} is not in the ledger.")
+                return
+            transactions = [transaction]
+        elif since or until:
+            transactions = wallet_ledger.iter_days(since, until)
+        else:
+            transactions = wallet_ledger.iter_transactions()
+        
+        count = 0
+        for tx in transactions:
+            count += 1
+            if as_json:
+                click.echo(json.dumps(tx, separators=(',', ':')))
+                continue
+            click.echo(f"ID: {tx.get('id')}")
+            click.echo(f"Amount: {tx.get('amount')}")
+            click.echo(f"Type: {tx.get('type')}")
+            click.echo(f"Status: {tx.get('status')}")
+            click.echo(f"Created: {tx.get('created_at')}")
+            click.echo("---")
+        
+        if not count and not as_json:
+            click.echo("No transactions found.")
+        
+    except Exception as e:
+        click.echo(f"❌ Failed to read wallet ledger: {e}", err=True)
+        ctx.exit(1)
+
+@wallets_cli.command()
+@click.option('--currency', 'currencies', multiple=True, help='Currency to cache addresses for (default: each wallet\'s currency)')
+@click.option('--customer-id', help='Only warm wallets of this customer')
+@click.option('--workers', default=16, help='Number of concurrent address lookups')
+@click.pass_context
+def warm_addresses(ctx, currencies, customer_id, workers):
+    """Pre-fill the local wallet address cache from a wallet scan"""
+    client = ctx.obj['client']
+    wallet_service = WalletService(client, address_cache=_address_cache(ctx))
+    
+    try:
+        fetched = wallet_service.warm_address_cache(
+            currencies=currencies,
+            wallets=wallet_service.iter_wallets(customer_id=customer_id),
+            max_workers=workers
+        )
+        click.echo(f"✅ Address cache warmed: {fetched} addresses fetched")
+        
+    except Exception as e:
+        click.echo(f"❌ Failed to warm address cache: {e}", err=True)
+        ctx.exit(1)
@@ -3,8 +3,34 @@ Configuration management for Bridge API integration
 """
 
 import os
-from typing import Optional
-from dataclasses import dataclass
+import warnings
+from typing import Dict, Optional, Tuple
+from dataclasses import dataclass, field
+
+def parse_route_timeouts(spec: str) -> Dict[str, Tuple[Optional[float], float]]:
+    """
+    Parse per-route timeouts, e.g. 'GET /v0/transfers=5:60,/v0/quotes=3'
+    
+    Routes are templates as in the request metrics (IDs written {id}), optionally
+    prefixed with a method; values are CONNECT:READ seconds, or READ alone
+    (keeping the default connect timeout).
+    """
+    timeouts: Dict[str, Tuple[Optional[float], float]] = {}
+    for entry in filter(None, (part.strip() for part in spec.split(','))):
+        route, sep, value = entry.rpartition('=')
+        if not sep or not route.strip():
+            raise ValueError(f"Invalid route timeout {entry!r}, expected ROUTE=CONNECT:READ or ROUTE=READ")
+        connect, sep, read = value.rpartition(':')
+        timeouts[route.strip()] = (float(connect) if sep else None, float(read))
+    return timeouts
+
+def _default_route_timeouts() -> Dict[str, Tuple[Optional[float], float]]:
+    """BRIDGE_ROUTE_TIMEOUTS for DEFAULT_CONFIG; a malformed value warns rather than failing every import"""
+    try:
+        return parse_route_timeouts(os.getenv('BRIDGE_ROUTE_TIMEOUTS', ''))
+    except ValueError as e:
+        warnings.warn(f"Ignoring BRIDGE_ROUTE_TIMEOUTS: {e}")
+        return {}
 
 @dataclass
 class Config:
@@ -13,10 +39,28 @@ class Config:
     api_key: str
     environment: str = 'production'
     debug: bool = False
+    data_dir: str = '.bridge'  # local state (search indexes, caches, checkpoints)
+    api_url: Optional[str] = None  # overrides base_url, e.g. a local mock server
+    metrics: bool = False  # record per-route request metrics (utils.metrics)
+    log_payloads: str = 'summary'  # debug logging of request bodies: summary, full (redacted) or off
+    pool_size: int = 32  # connections kept open per host; match the largest worker pool
+    session_mode: str = 'shared'  # shared: one session for all threads; thread: one per thread
+    keepalive_idle: int = 60  # seconds before TCP keep-alive probes on idle connections (0: off)
+    transport: str = 'http1'  # http1 (requests/urllib3) or http2 (httpx, multiplexed)
+    compress_requests: bool = False  # gzip request bodies of at least compress_min_bytes
+    compress_min_bytes: int = 65536
+    hedge_requests: bool = False  # send a second GET when the first outlasts hedge_percentile
+    hedge_percentile: float = 95.0  # per-route latency percentile used as the hedge delay
+    hedge_budget: float = 0.05  # most extra requests hedging may add, as a fraction
+    connect_timeout: float = 10.0  # seconds to establish a connection
+    read_timeout: float = 30.0  # seconds to wait for each read of a response
+    route_timeouts: Dict[str, Tuple[Optional[float], float]] = field(default_factory=dict)  # see parse_route_timeouts
     
     @property
     def base_url(self) -> str:
         """Get base URL based on environment"""
+        if self.api_url:
+            return self.api_url.rstrip('/')
         if self.environment == 'production':
             return 'https://api.bridge.xyz'
         else:
@@ -30,6 +74,20 @@ class Config:
         else:
             return 'https://dashboard.bridge.xyz'
     
+    def timeout_for(self, method: str, route: str) -> Tuple[float, float]:
+        """(connect, read) timeouts for a route template, e.g. ('GET', '/v0/transfers/{id}')"""
+        override = self.route_timeouts.get(f"{method} {route}") or self.route_timeouts.get(route)
+        if override is None:
+            return self.connect_timeout, self.read_timeout
+        connect, read = override
+        return (self.connect_timeout if connect is None else connect), read
+    
+    def data_path(self, *parts: str) -> str:
+        """Get path inside the local data directory, creating parent directories"""
+        path = os.path.join(self.data_dir, *parts)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        return path
+    
     @classmethod
     def from_env(cls) -> 'Config':
         """Create configuration from environment variables"""
@@ -40,12 +98,40 @@ class Config:
         return cls(
             api_key=api_key,
             environment=os.getenv('BRIDGE_ENVIRONMENT', 'production'),
-            debug=os.getenv('BRIDGE_DEBUG', 'false').lower() == 'true'
+            debug=os.getenv('BRIDGE_DEBUG', 'false').lower() == 'true',
+            data_dir=os.getenv('BRIDGE_DATA_DIR', '.bridge'),
+            api_url=os.getenv('BRIDGE_API_URL') or None,
+            metrics=os.getenv('BRIDGE_METRICS', 'false').lower() == 'true',
+            log_payloads=os.getenv('BRIDGE_LOG_PAYLOADS', 'summary').lower(),
+            pool_size=int(os.getenv('BRIDGE_POOL_SIZE', '32')),
+            session_mode=os.getenv('BRIDGE_SESSION_MODE', 'shared').lower(),
+            transport=os.getenv('BRIDGE_TRANSPORT', 'http1').lower(),
+            compress_requests=os.getenv('BRIDGE_COMPRESS_REQUESTS', 'false').lower() == 'true',
+            hedge_requests=os.getenv('BRIDGE_HEDGE_REQUESTS', 'false').lower() == 'true',
+            hedge_percentile=float(os.getenv('BRIDGE_HEDGE_PERCENTILE', '95')),
+            hedge_budget=float(os.getenv('BRIDGE_HEDGE_BUDGET', '0.05')),
+            connect_timeout=float(os.getenv('BRIDGE_CONNECT_TIMEOUT', '10')),
+            read_timeout=float(os.getenv('BRIDGE_READ_TIMEOUT', '30')),
+            route_timeouts=parse_route_timeouts(os.getenv('BRIDGE_ROUTE_TIMEOUTS', ''))
         )
 
 # Default configuration
 DEFAULT_CONFIG = Config(
     api_key=os.getenv('BRIDGE_API_KEY', ''),
     environment=os.getenv('BRIDGE_ENVIRONMENT', 'production'),
-    debug=os.getenv('BRIDGE_DEBUG', 'false').lower() == 'true'
+    debug=os.getenv('BRIDGE_DEBUG', 'false').lower() == 'true',
+    data_dir=os.getenv('BRIDGE_DATA_DIR', '.bridge'),
+    api_url=os.getenv('BRIDGE_API_URL') or None,
+    metrics=os.getenv('BRIDGE_METRICS', 'false').lower() == 'true',
+    log_payloads=os.getenv('BRIDGE_LOG_PAYLOADS', 'summary').lower(),
+    pool_size=int(os.getenv('BRIDGE_POOL_SIZE', '32')),
+    session_mode=os.getenv('BRIDGE_SESSION_MODE', 'shared').lower(),
+    transport=os.getenv('BRIDGE_TRANSPORT', 'http1').lower(),
+    compress_requests=os.getenv('BRIDGE_COMPRESS_REQUESTS', 'false').lower() == 'true',
+    hedge_requests=os.getenv('BRIDGE_HEDGE_REQUESTS', 'false').lower() == 'true',
+    hedge_percentile=float(os.getenv('BRIDGE_HEDGE_PERCENTILE', '95')),
+    hedge_budget=float(os.getenv('BRIDGE_HEDGE_BUDGET', '0.05')),
+    connect_timeout=float(os.getenv('BRIDGE_CONNECT_TIMEOUT', '10')),
+    read_timeout=float(os.getenv('BRIDGE_READ_TIMEOUT', '30')),
+    route_timeouts=_default_route_timeouts()
 )
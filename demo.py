@@ -5,23 +5,36 @@ Simple interactive examples of how to use the Bridge API CLI application
 """
 
 import os
-import subprocess
-import sys
+import shlex
+
+import click
+
+from main import cli
+from cli.lazy import CliContext
+
+# Shared across commands so they reuse one Bridge client and connection pool
+_shared_obj = CliContext()
 
 def run_command(cmd):
-    """Run a CLI command and show the output"""
+    """Run a CLI command in this process and show the output"""
     print(f"\n🔹 Running: {cmd}")
     print("-" * 50)
+    args = shlex.split(cmd)[2:]  # drop "python main.py"
     try:
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-        if result.stdout:
-            print(result.stdout)
-        if result.stderr:
-            print(f"Error: {result.stderr}")
-        return result.returncode == 0
+        # Without standalone mode click returns ctx.exit()'s code (None when a command just returns)
+        exit_code = cli.main(args, prog_name='main.py', obj=_shared_obj, standalone_mode=False)
+    except click.ClickException as e:
+        e.show()
+        return False
+    except click.Abort:
+        print("Aborted")
+        return False
+    except SystemExit as e:
+        return e.code in (None, 0)
     except Exception as e:
         print(f"Error running command: {e}")
         return False
+    return exit_code in (None, 0)
 
 def main():
     print("=== Bridge API CLI Demo ===")
@@ -6,19 +6,20 @@ A comprehensive Python application for interacting with the Bridge API.
 Supports customer management, transfers, and wallet operations with sandbox testing.
 """
 
+import time
+
+# Measured before any other import so the startup budget covers imports too
+_STARTED_AT = time.perf_counter()
+
 import click
 import logging
 import os
 from dotenv import load_dotenv
 from typing import Optional
 
-from config import Config
-from bridge_client import BridgeClient
-from utils.logger import setup_logger
-from cli.customers import customers_cli
-from cli.transfers import transfers_cli
-from cli.wallets import wallets_cli
-from cli.accounts import accounts_cli
+from config import Config, parse_route_timeouts
+from utils.logger import configure_logging, setup_logger
+from cli.lazy import LazyGroup, CliContext
 
 # Load environment variables
 load_dotenv()
@@ -26,37 +27,168 @@ load_dotenv()
 # Setup logging
 logger = setup_logger(__name__)
 
-@click.group()
+# Subcommand groups are imported only when invoked; help text is listed here so
+# `--help` does not import them either
+SUBCOMMANDS = {
+    'customers': ('cli.customers:customers_cli', 'Customer management commands'),
+    'transfers': ('cli.transfers:transfers_cli', 'Transfer management commands'),
+    'wallets': ('cli.wallets:wallets_cli', 'Wallet management commands'),
+    'accounts': ('cli.accounts:accounts_cli', 'External account management commands'),
+    'shell': ('cli.shell:shell', 'Interactive shell sharing one client across commands'),
+    'run': ('cli.shell:run', 'Run a file of CLI commands sharing one client'),
+    'mock-server': ('mock_server:mock_server', 'Run a local mock Bridge API server'),
+    'bench': ('cli.bench:bench', 'Generate load through the service layer and report latency'),
+    'stats': ('cli.stats:stats', 'Run a command with request metrics and print per-route stats'),
+}
+
+def _check_startup_budget(ctx: click.Context) -> None:
+    """Report time spent before command dispatch, warning when over BRIDGE_STARTUP_BUDGET_MS"""
+    startup_ms = (time.perf_counter() - _STARTED_AT) * 1000
+    ctx.obj['startup_ms'] = startup_ms
+    logger.debug("Startup took %.1f ms", startup_ms)
+    
+    budget = os.getenv('BRIDGE_STARTUP_BUDGET_MS')
+    if budget and startup_ms > float(budget):
+        click.echo(f"⚠️  Startup took {startup_ms:.1f} ms, over the {float(budget):.0f} ms budget", err=True)
+
+_metrics_server = None
+
+def _expose_metrics(ctx: click.Context, metrics_file: Optional[str], metrics_port: Optional[int]) -> None:
+    """Serve metrics over HTTP for the life of the process and/or dump them when the command ends"""
+    global _metrics_server
+    from utils.metrics import get_metrics, serve_metrics
+    
+    if metrics_port and _metrics_server is None:
+        _metrics_server = serve_metrics(get_metrics(), metrics_port)
+        logger.info("Serving metrics on http://127.0.0.1:%s/metrics", metrics_port)
+    if metrics_file:
+        ctx.call_on_close(lambda: get_metrics().write(metrics_file))
+
+def _trace_requests(ctx: click.Context, trace_file: str) -> None:
+    """Record a span per request and write them (plus a phase summary) when the command ends"""
+    from utils.tracing import PHASES, SpanRecorder
+    
+    recorder = SpanRecorder()
+    ctx.obj['span_recorder'] = recorder
+    if ctx.obj.get('client') is not None:
+        recorder.install(ctx.obj['client'])
+    
+    def finish() -> None:
+        count = recorder.export(trace_file)
+        click.echo(f"\nWrote {count} spans to {trace_file}", err=True)
+        rows = recorder.summary()
+        if rows:
+            click.echo(f"{'Request':<42}{'calls':>7}{'new conn':>10}{'total':>9}"
+                       + ''.join(f"{phase:>13}" for phase in PHASES), err=True)
+            for row in rows:
+                click.echo(f"{row['name'][:41]:<42}{row['calls']:>7}{row['new_connections']:>10}{row['total_ms']:>9.2f}"
+                           + ''.join(f"{row[phase + '_ms']:>13.2f}" for phase in PHASES), err=True)
+            click.echo("(mean milliseconds per call)", err=True)
+    
+    ctx.call_on_close(finish)
+
+def _profile_command(ctx: click.Context, profile_file: Optional[str], memory: bool) -> None:
+    """Profile the rest of the command and print a summary to stderr when it ends"""
+    from utils.profiling import CommandProfiler
+    
+    profiler = CommandProfiler(profile_file, memory=memory)
+    startup = time.perf_counter() - _STARTED_AT
+    
+    def finish() -> None:
+        profiler.stop()
+        click.echo('\n' + '\n'.join(profiler.report(startup)), err=True)
+    
+    # Registered last, so it stops before the other close callbacks (trace/metrics export) run
+    ctx.call_on_close(finish)
+    profiler.start()
+
+@click.group(cls=LazyGroup, lazy_subcommands=SUBCOMMANDS)
 @click.option('--api-key', envvar='BRIDGE_API_KEY', help='Bridge API Key')
 @click.option('--environment', default='production', type=click.Choice(['sandbox', 'production']), help='Environment to use')
 @click.option('--debug', is_flag=True, help='Enable debug logging')
+@click.option('--log-format', envvar='BRIDGE_LOG_FORMAT', type=click.Choice(['text', 'json']), help='Log format (json adds request IDs)')
+@click.option('--log-async', is_flag=True, envvar='BRIDGE_LOG_ASYNC', help='Write logs from a background thread')
+@click.option('--log-payloads', envvar='BRIDGE_LOG_PAYLOADS', default='summary', type=click.Choice(['summary', 'full', 'off']), help='Debug logging of request bodies')
+@click.option('--data-dir', envvar='BRIDGE_DATA_DIR', default='.bridge', help='Directory for local indexes and caches')
+@click.option('--base-url', envvar='BRIDGE_API_URL', help='Override the API base URL (e.g. a local mock server)')
+@click.option('--pool-size', envvar='BRIDGE_POOL_SIZE', default=32, help='Connections kept open per host')
+@click.option('--session-mode', envvar='BRIDGE_SESSION_MODE', default='shared', type=click.Choice(['shared', 'thread']), help='One HTTP session for all threads, or one per thread')
+@click.option('--transport', envvar='BRIDGE_TRANSPORT', default='http1', type=click.Choice(['http1', 'http2']), help='HTTP/1.1 connection pool, or HTTP/2 multiplexing (needs httpx[http2])')
+@click.option('--compress-requests', is_flag=True, envvar='BRIDGE_COMPRESS_REQUESTS', help='Gzip large request bodies (e.g. KYC document uploads)')
+@click.option('--connect-timeout', envvar='BRIDGE_CONNECT_TIMEOUT', default=10.0, help='Seconds to establish a connection')
+@click.option('--read-timeout', envvar='BRIDGE_READ_TIMEOUT', default=30.0, help='Seconds to wait for each read of a response')
+@click.option('--route-timeouts', envvar='BRIDGE_ROUTE_TIMEOUTS', default='', help="Per-route timeouts, e.g. 'GET /v0/transfers=5:60,/v0/quotes=3'")
+@click.option('--hedge-requests', is_flag=True, envvar='BRIDGE_HEDGE_REQUESTS', help='Send a second GET when the first is slower than usual for its route')
+@click.option('--hedge-percentile', envvar='BRIDGE_HEDGE_PERCENTILE', default=95.0, help='Per-route latency percentile after which a GET is hedged')
+@click.option('--hedge-budget', envvar='BRIDGE_HEDGE_BUDGET', default=0.05, help='Most extra requests hedging may add, as a fraction')
+@click.option('--metrics', is_flag=True, envvar='BRIDGE_METRICS', help='Record per-route request metrics')
+@click.option('--metrics-file', type=click.Path(dir_okay=False), help='Write Prometheus metrics to this file on exit (implies --metrics)')
+@click.option('--metrics-port', type=int, help='Serve Prometheus metrics on http://127.0.0.1:PORT/metrics (implies --metrics)')
+@click.option('--trace', 'trace_file', type=click.Path(dir_okay=False), help='Record a tracing span per request and write them to this NDJSON file')
+@click.option('--profile', 'profile_file', type=click.Path(dir_okay=False), help='Profile the command, write cProfile stats to this file and print a summary')
+@click.option('--profile-memory', is_flag=True, help='Also report peak memory and top allocation sites (tracemalloc)')
 @click.pass_context
-def cli(ctx, api_key: Optional[str], environment: str, debug: bool):
+def cli(ctx, api_key: Optional[str], environment: str, debug: bool, log_format: Optional[str], log_async: bool,
+        log_payloads: str, data_dir: str, base_url: Optional[str], pool_size: int, session_mode: str, transport: str,
+        compress_requests: bool, connect_timeout: float, read_timeout: float, route_timeouts: str,
+        hedge_requests: bool, hedge_percentile: float, hedge_budget: float, metrics: bool, metrics_file: Optional[str],
+        metrics_port: Optional[int], trace_file: Optional[str], profile_file: Optional[str], profile_memory: bool):
     """Bridge API Integration CLI Tool"""
     
     if debug:
         logging.getLogger().setLevel(logging.DEBUG)
+    if log_format or log_async:
+        configure_logging(log_format=log_format, asynchronous=log_async or None)
     
-    if not api_key:
-        click.echo("Error: API key is required. Set BRIDGE_API_KEY environment variable or use --api-key option.", err=True)
-        ctx.exit(1)
+    try:
+        route_timeouts = parse_route_timeouts(route_timeouts)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint='--route-timeouts')
     
-    # Initialize configuration
+    # Initialize configuration; the Bridge client is created on first use of ctx.obj['client']
     config = Config(
-        api_key=api_key,
+        api_key=api_key or '',
         environment=environment,
-        debug=debug
+        debug=debug,
+        data_dir=data_dir,
+        api_url=base_url,
+        metrics=metrics or bool(metrics_file) or bool(metrics_port),
+        log_payloads=log_payloads,
+        pool_size=pool_size,
+        session_mode=session_mode,
+        transport=transport,
+        compress_requests=compress_requests,
+        hedge_requests=hedge_requests,
+        hedge_percentile=hedge_percentile,
+        hedge_budget=hedge_budget,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        route_timeouts=route_timeouts
     )
     
-    # Initialize Bridge client
-    bridge_client = BridgeClient(config)
-    
-    # Store in context for subcommands
-    ctx.ensure_object(dict)
+    # An existing CliContext (e.g. from an in-process caller) keeps its client and
+    # caches as long as the configuration is unchanged
+    if not isinstance(ctx.obj, CliContext):
+        ctx.obj = CliContext(ctx.obj or {})
+    if ctx.obj.get('config') != config:
+        # dict.get does not create the client; close one made for the old configuration
+        client = ctx.obj.get('client')
+        if client is not None:
+            client.close()
+        ctx.obj.clear()
     ctx.obj['config'] = config
-    ctx.obj['client'] = bridge_client
     
-    logger.info(f"Initialized Bridge API client for {environment} environment")
+    if metrics_port or metrics_file:
+        _expose_metrics(ctx, metrics_file, metrics_port)
+    if trace_file:
+        _trace_requests(ctx, trace_file)
+    
+    # Click resolves (and imports) the subcommand before running this callback,
+    # so this covers everything up to the command itself
+    _check_startup_budget(ctx)
+    
+    if profile_file or profile_memory:
+        _profile_command(ctx, profile_file, profile_memory)
 
 @cli.command()
 @click.pass_context
@@ -74,11 +206,5 @@ def status(ctx):
         click.echo(f"❌ API connection failed: {e}", err=True)
         ctx.exit(1)
 
-# Add subcommand groups
-cli.add_command(customers_cli, name='customers')
-cli.add_command(transfers_cli, name='transfers')
-cli.add_command(wallets_cli, name='wallets')
-cli.add_command(accounts_cli, name='accounts')
-
 if __name__ == '__main__':
     cli()
@@ -0,0 +1,783 @@
+#!/usr/bin/env python3
+"""
+Local mock Bridge API server
+
+A stdlib-only stand-in for the Bridge API endpoints used by the services, for
+benchmarks and offline testing without touching rate limits or real data.
+Supports cursor pagination, Idempotency-Key replay, configurable latency
+distributions, injected 429/5xx responses and a seeded, reproducible dataset.
+
+    python main.py mock-server --customers 5000 --latency lognormal:20,0.5 --rate-429 0.01
+    python main.py --base-url http://127.0.0.1:8787 --api-key test customers list
+
+    with MockBridgeServer(customers=100) as server:
+        bridge = Bridge(Config(api_key='test', api_url=server.url))
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import click
+
+BASE_TIME = datetime(2026, 1, 1, tzinfo=timezone.utc)
+FIRST_NAMES = ['Ada', 'Grace', 'Alan', 'Linus', 'Barbara', 'Dennis', 'Margaret', 'Ken', 'Frances', 'Edsger']
+LAST_NAMES = ['Lovelace', 'Hopper', 'Turing', 'Torvalds', 'Liskov', 'Ritchie', 'Hamilton', 'Thompson', 'Allen', 'Dijkstra']
+BANKS = ['Chase', 'Wells Fargo', 'Bank of America', 'Citibank', 'US Bank']
+RAILS = [('ach', 'usd'), ('wire', 'usd'), ('base', 'usdc'), ('polygon', 'usdc'), ('ethereum', 'usdt')]
+TRANSFER_STATUSES = ['pending', 'processing', 'completed', 'completed', 'completed', 'failed']
+TRANSACTIONS_PER_WALLET = 50
+IDEMPOTENCY_CACHE_SIZE = 100000
+
+def _timestamp(minutes: float) -> str:
+    return (BASE_TIME + timedelta(minutes=minutes)).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+def _new_id(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:24]}"
+
+def _encode_cursor(position: int) -> str:
+    return base64.urlsafe_b64encode(f"p:{position}".encode()).decode().rstrip('=')
+
+def _decode_cursor(cursor: str) -> int:
+    padded = cursor + '=' * (-len(cursor) % 4)
+    try:
+        kind, position = base64.urlsafe_b64decode(padded).decode().split(':')
+        if kind != 'p':
+            raise ValueError
+        return int(position)
+    except ValueError:
+        raise MockError(400, 'invalid_cursor', f"Invalid cursor: {cursor}")
+
+class MockError(Exception):
+    """Error response returned by a mock handler"""
+
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+
+class LatencyModel:
+    """
+    Per-request latency drawn from a distribution, parsed from a spec (milliseconds):
+
+        0 | 20 | fixed:20 | uniform:10,50 | normal:30,5 | lognormal:20,0.5 | exponential:25
+
+    lognormal takes the median and sigma; exponential takes the mean.
+    """
+
+    def __init__(self, spec: str = '0'):
+        self.spec = spec
+        kind, _, args = spec.partition(':')
+        if not args:
+            kind, args = 'fixed', kind
+        try:
+            values = [float(value) for value in args.split(',')]
+        except ValueError:
+            raise ValueError(f"Invalid latency spec: {spec}")
+
+        expected = {'fixed': 1, 'uniform': 2, 'normal': 2, 'lognormal': 2, 'exponential': 1}
+        if expected.get(kind) != len(values):
+            raise ValueError(f"Invalid latency spec: {spec} (expected {kind}:{'a,b' if expected.get(kind) == 2 else 'a'})")
+        self.kind = kind
+        self.values = values
+
+    def sample(self, rng: random.Random) -> float:
+        """Latency in seconds"""
+        a = self.values[0]
+        if self.kind == 'fixed':
+            ms = a
+        elif self.kind == 'uniform':
+            ms = rng.uniform(a, self.values[1])
+        elif self.kind == 'normal':
+            ms = rng.gauss(a, self.values[1])
+        elif self.kind == 'lognormal':
+            ms = rng.lognormvariate(math.log(a) if a > 0 else 0.0, self.values[1]) if a > 0 else 0.0
+        else:
+            ms = rng.expovariate(1 / a) if a > 0 else 0.0
+        return max(ms, 0.0) / 1000
+
+class _Table:
+    """Records in creation order, served newest first with position cursors"""
+
+    def __init__(self):
+        self.records: List[Optional[Dict[str, Any]]] = []
+        self.positions: Dict[str, int] = {}
+        self.groups: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def add(self, record: Dict[str, Any], group: Optional[str] = None) -> Dict[str, Any]:
+        position = len(self.records)
+        self.records.append(record)
+        self.positions[record['id']] = position
+        if group is not None:
+            self.groups.setdefault(group, []).append(position)
+        return record
+
+    def get(self, record_id: str) -> Optional[Dict[str, Any]]:
+        position = self.positions.get(record_id)
+        return None if position is None else self.records[position]
+
+    def remove(self, record_id: str) -> None:
+        position = self.positions.pop(record_id)
+        self.records[position] = None
+
+    def page(self, limit: int, cursor: Optional[str] = None, group: Optional[str] = None) -> Dict[str, Any]:
+        positions = self.groups.get(group, []) if group is not None else None
+        total = len(positions) if positions is not None else len(self.records)
+
+        # Index (into positions or records) of the first item older than the cursor
+        index = total - 1
+        if cursor:
+            before = _decode_cursor(cursor)
+            index = (bisect_left(positions, before) if positions is not None else before) - 1
+
+        data: List[Dict[str, Any]] = []
+        last = None
+        while index >= 0 and len(data) < limit:
+            position = positions[index] if positions is not None else index
+            record = self.records[position]
+            if record is not None:
+                data.append(record)
+                last = position
+            index -= 1
+
+        has_next_page = index >= 0 and last is not None
+        return {
+            'data': data,
+            'count': len(data),
+            'has_next_page': has_next_page,
+            'next_cursor': _encode_cursor(last) if has_next_page else None
+        }
+
+class MockDataset:
+    """Seeded, reproducible Bridge data"""
+
+    def __init__(self, customers: int = 1000, transfers_per_customer: int = 5, seed: int = 42):
+        self.seed = seed
+        self.customers = _Table()
+        self.wallets = _Table()
+        self.transfers = _Table()
+        self.external_accounts = _Table()
+        self._transactions: Dict[str, _Table] = {}
+        self._generate(customers, transfers_per_customer)
+
+    def _generate(self, customer_count: int, transfers_per_customer: int) -> None:
+        rng = random.Random(self.seed)
+        for i in range(customer_count):
+            first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            customer_id = f"cust_{i:08d}"
+            created = _timestamp(i)
+            self.customers.add({
+                'id': customer_id,
+                'type': 'individual' if rng.random() < 0.8 else 'business',
+                'first_name': first_name,
+                'last_name': last_name,
+                'email': f"{first_name}.{last_name}.{i}@example.com".lower(),
+                'phone': f"+1555{i:07d}",
+                'residential_address': {
+                    'street_line_1': f"{rng.randint(1, 9999)} Main St",
+                    'city': 'San Francisco',
+                    'subdivision': 'CA',
+                    'postal_code': '94105',
+                    'country': 'USA'
+                },
+                'birth_date': f"19{rng.randint(50, 99)}-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}",
+                'status': rng.choice(['active', 'active', 'active', 'pending', 'not_started', 'rejected']),
+                'created_at': created,
+                'updated_at': created
+            })
+
+            for currency in ('usdc', 'usdt'):
+                wallet_id = f"wal_{i:08d}_{currency}"
+                self.wallets.add({
+                    'id': wallet_id,
+                    'customer_id': customer_id,
+                    'currency': currency,
+                    'balance': f"{rng.uniform(0, 100000):.2f}",
+                    'address': '0x' + hashlib.sha1(wallet_id.encode()).hexdigest(),
+                    'chain': 'base',
+                    'created_at': created,
+                    'updated_at': created
+                }, group=customer_id)
+
+            for j in range(2):
+                account_number = f"{rng.randint(10 ** 9, 10 ** 10 - 1)}"
+                bank_name = rng.choice(BANKS)
+                self.external_accounts.add({
+                    'id': f"ea_{i:08d}_{j}",
+                    'customer_id': customer_id,
+                    'created_at': created,
+                    'updated_at': created,
+                    'bank_name': bank_name,
+                    'account_name': f"{bank_name} Checking",
+                    'account_owner_name': f"{first_name} {last_name}",
+                    'active': True,
+                    'currency': 'usd',
+                    'account_owner_type': 'individual',
+                    'account_type': 'us',
+                    'first_name': first_name,
+                    'last_name': last_name,
+                    'account': {'routing_number': '021000021', 'last_4': account_number[-4:]},
+                    'last_4': account_number[-4:]
+                }, group=customer_id)
+
+        transfer_count = customer_count * transfers_per_customer
+        for i in range(transfer_count):
+            customer_id = f"cust_{rng.randrange(customer_count):08d}"
+            self.transfers.add(self._transfer_record(
+                f"tr_{i:09d}", customer_id, f"{rng.uniform(1, 5000):.2f}",
+                rng.choice(RAILS), rng.choice(RAILS), rng.choice(TRANSFER_STATUSES),
+                _timestamp(customer_count + i * 10)
+            ), group=customer_id)
+
+    @staticmethod
+    def _transfer_record(transfer_id, customer_id, amount, source, destination, status, created) -> Dict[str, Any]:
+        return {
+            'id': transfer_id,
+            'amount': amount,
+            'status': status,
+            'on_behalf_of': customer_id,
+            'source': {'payment_rail': source[0], 'currency': source[1]},
+            'destination': {'payment_rail': destination[0], 'currency': destination[1], 'to_address': '0x' + transfer_id.encode().hex()[:40]},
+            'created_at': created,
+            'updated_at': created
+        }
+
+    def transactions(self, wallet_id: str) -> _Table:
+        """Transaction history of a wallet, generated on first access"""
+        table = self._transactions.get(wallet_id)
+        if table is None:
+            wallet = self.wallets.get(wallet_id)
+            table = _Table()
+            rng = random.Random(f"{self.seed}:{wallet_id}")
+            for i in range(TRANSACTIONS_PER_WALLET):
+                table.add({
+                    'id': f"txn_{wallet_id}_{i:05d}",
+                    'wallet_id': wallet_id,
+                    'type': rng.choice(['deposit', 'withdrawal', 'transfer']),
+                    'amount': f"{rng.uniform(1, 1000):.2f}",
+                    'currency': wallet['currency'] if wallet else 'usdc',
+                    'created_at': _timestamp(i * 720),
+                })
+            self._transactions[wallet_id] = table
+        return table
+
+class MockBridgeAPI:
+    """Request routing, idempotency, fault injection and stats for the mock server"""
+
+    def __init__(
+        self,
+        dataset: MockDataset,
+        latency: str = '0',
+        write_latency: Optional[str] = None,
+        rate_429: float = 0.0,
+        rate_5xx: float = 0.0,
+        retry_after: int = 1,
+        max_page_size: int = 100,
+        seed: int = 42
+    ):
+        self.dataset = dataset
+        self.latency = LatencyModel(latency)
+        self.write_latency = LatencyModel(write_latency) if write_latency else self.latency
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.retry_after = retry_after
+        self.max_page_size = max_page_size
+        self.base_url = ''
+
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._idempotency: 'OrderedDict[str, Tuple[str, int, Dict[str, Any]]]' = OrderedDict()
+        self.stats: Counter = Counter()
+
+        self.routes: List[Tuple[str, 're.Pattern', str, Callable]] = []
+        for method, template, handler in self._route_table():
+            pattern = re.compile('^' + re.sub(r'\{(\w+)\}', r'(?P<\1>[^/]+)', template) + '$')
+            self.routes.append((method, pattern, template, handler))
+
+    def _route_table(self) -> List[Tuple[str, str, Callable]]:
+        return [
+            ('POST', '/v0/customers/tos_links', self.create_tos_link),
+            ('GET', '/v0/customers', self.list_customers),
+            ('POST', '/v0/customers', self.create_customer),
+            ('GET', '/v0/customers/{customer_id}', self.get_customer),
+            ('PATCH', '/v0/customers/{customer_id}', self.update_customer),
+            ('GET', '/v0/customers/{customer_id}/kyc_status', self.get_kyc_status),
+            ('POST', '/v0/customers/{customer_id}/kyc_resubmit', self.resubmit_kyc),
+            ('GET', '/v0/customers/{customer_id}/external_accounts', self.list_external_accounts),
+            ('POST', '/v0/customers/{customer_id}/external_accounts', self.create_external_account),
+            ('GET', '/v0/customers/{customer_id}/external_accounts/{account_id}', self.get_external_account),
+            ('PATCH', '/v0/customers/{customer_id}/external_accounts/{account_id}', self.update_external_account),
+            ('DELETE', '/v0/customers/{customer_id}/external_accounts/{account_id}', self.delete_external_account),
+            ('POST', '/v0/customers/{customer_id}/external_accounts/{account_id}/verify', self.verify_external_account),
+            ('POST', '/v0/customers/{customer_id}/plaid_link_token', self.create_plaid_link_token),
+            ('POST', '/v0/customers/{customer_id}/plaid_accounts', self.exchange_plaid_accounts),
+            ('POST', '/v0/transfers/estimate_fee', self.estimate_fee),
+            ('GET', '/v0/transfers', self.list_transfers),
+            ('POST', '/v0/transfers', self.create_transfer),
+            ('GET', '/v0/transfers/{transfer_id}', self.get_transfer),
+            ('POST', '/v0/transfers/{transfer_id}/cancel', self.cancel_transfer),
+            ('GET', '/v0/transfers/{transfer_id}/receipt', self.get_receipt),
+            ('GET', '/v0/quotes', self.get_quote),
+            ('GET', '/v0/wallets', self.list_wallets),
+            ('POST', '/v0/wallets', self.create_wallet),
+            ('GET', '/v0/wallets/{wallet_id}', self.get_wallet),
+            ('GET', '/v0/wallets/{wallet_id}/balance', self.get_balance),
+            ('GET', '/v0/wallets/{wallet_id}/transactions', self.list_transactions),
+            ('POST', '/v0/wallets/{wallet_id}/transfer', self.wallet_transfer),
+            ('GET', '/v0/wallets/{wallet_id}/address', self.get_address),
+            ('GET', '/_mock/stats', self.get_stats),
+            ('POST', '/_mock/reset', self.reset_stats),
+        ]
+
+    # Dispatch
+
+    def _random(self) -> float:
+        with self._rng_lock:
+            return self._rng.random()
+
+    def _sleep(self, model: LatencyModel) -> None:
+        if model.kind == 'fixed' and not model.values[0]:
+            return
+        with self._rng_lock:
+            delay = model.sample(self._rng)
+        if delay:
+            time.sleep(delay)
+
+    def handle(self, method: str, raw_path: str, headers: Dict[str, str], body: bytes) -> Tuple[int, Dict[str, str], Dict[str, Any]]:
+        """Handle one request, returning (status, extra headers, JSON body)"""
+        url = urlsplit(raw_path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        for route_method, pattern, template, handler in self.routes:
+            match = pattern.match(url.path)
+            if match and route_method == method:
+                break
+        else:
+            self._count('unmatched', 404)
+            return 404, {}, {'code': 'not_found', 'message': f"No route for {method} {url.path}"}
+
+        if template.startswith('/_mock/'):
+            return 200, {}, handler(params=params, **match.groupdict())
+
+        is_write = method != 'GET'
+        self._sleep(self.write_latency if is_write else self.latency)
+
+        if not headers.get('api-key'):
+            return self._respond(template, 401, {}, {'code': 'unauthorized', 'message': 'Missing Api-Key header'})
+
+        # Faults are injected before any side effect, like a gateway in front of the API
+        if self.rate_429 and self._random() < self.rate_429:
+            return self._respond(template, 429, {'Retry-After': str(self.retry_after)}, {'code': 'rate_limited', 'message': 'Too many requests'})
+        if self.rate_5xx and self._random() < self.rate_5xx:
+            status = (500, 502, 503)[int(self._random() * 3)]
+            return self._respond(template, status, {}, {'code': 'server_error', 'message': f"Injected {status} error"})
+
+        try:
+            data = json.loads(body) if body else {}
+        except ValueError:
+            return self._respond(template, 400, {}, {'code': 'invalid_json', 'message': 'Request body is not valid JSON'})
+
+        key = headers.get('idempotency-key')
+        if is_write and key:
+            return self._idempotent(template, key, method, url.path, body, lambda: self._call(handler, match, params, data))
+
+        status, payload = self._call(handler, match, params, data)
+        return self._respond(template, status, {}, payload)
+
+    def _call(self, handler: Callable, match: 're.Match', params: Dict[str, str], data: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        try:
+            with self._lock:
+                return 200, handler(params=params, data=data, **match.groupdict())
+        except MockError as e:
+            return e.status, {'code': e.code, 'message': e.message}
+
+    def _idempotent(self, template, key, method, path, body, call) -> Tuple[int, Dict[str, str], Dict[str, Any]]:
+        """Replay the stored response for a reused Idempotency-Key with the same request"""
+        fingerprint = hashlib.sha256(f"{method} {path}\n".encode() + body).hexdigest()
+        with self._lock:
+            stored = self._idempotency.get(key)
+        if stored is not None:
+            if stored[0] != fingerprint:
+                return self._respond(template, 422, {}, {'code': 'idempotency_key_reused', 'message': 'Idempotency-Key was already used with a different request'})
+            self.stats['idempotent_replays'] += 1
+            return self._respond(template, stored[1], {'Idempotent-Replayed': 'true'}, stored[2])
+
+        status, payload = call()
+        if status < 500:
+            with self._lock:
+                self._idempotency[key] = (fingerprint, status, payload)
+                if len(self._idempotency) > IDEMPOTENCY_CACHE_SIZE:
+                    self._idempotency.popitem(last=False)
+        return self._respond(template, status, {}, payload)
+
+    def _respond(self, template: str, status: int, headers: Dict[str, str], payload: Dict[str, Any]):
+        self._count(template, status)
+        return status, headers, payload
+
+    def _count(self, template: str, status: int) -> None:
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats[f"status:{status}"] += 1
+            self.stats[f"route:{template}"] += 1
+
+    def get_stats(self, params, **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats)
+
+    def reset_stats(self, params, **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            self.stats.clear()
+        return {'status': 'reset'}
+
+    # Helpers
+
+    def _page(self, table: _Table, params: Dict[str, str], group: Optional[str] = None) -> Dict[str, Any]:
+        try:
+            limit = int(params.get('limit', 10))
+        except ValueError:
+            raise MockError(400, 'invalid_limit', f"Invalid limit: {params.get('limit')}")
+        limit = max(1, min(limit, self.max_page_size))
+        return table.page(limit, params.get('cursor'), group)
+
+    @staticmethod
+    def _require(table: _Table, record_id: str, kind: str) -> Dict[str, Any]:
+        record = table.get(record_id)
+        if record is None:
+            raise MockError(404, 'not_found', f"{kind} {record_id} not found")
+        return record
+
+    # Customers
+
+    def list_customers(self, params, data):
+        return self._page(self.dataset.customers, params)
+
+    def create_customer(self, params, data):
+        now = _now()
+        fields = {key: data.get(key) for key in ('type', 'first_name', 'last_name', 'email', 'phone', 'residential_address', 'birth_date')}
+        return self.dataset.customers.add({'id': _new_id('cust'), **fields, 'status': 'pending', 'created_at': now, 'updated_at': now})
+
+    def get_customer(self, params, data, customer_id):
+        return self._require(self.dataset.customers, customer_id, 'Customer')
+
+    def update_customer(self, params, data, customer_id):
+        customer = self._require(self.dataset.customers, customer_id, 'Customer')
+        customer.update({key: value for key, value in data.items() if key not in ('id', 'created_at')}, updated_at=_now())
+        return customer
+
+    def get_kyc_status(self, params, data, customer_id):
+        customer = self._require(self.dataset.customers, customer_id, 'Customer')
+        return {'customer_id': customer_id, 'status': customer['status']}
+
+    def resubmit_kyc(self, params, data, customer_id):
+        customer = self._require(self.dataset.customers, customer_id, 'Customer')
+        customer.update(status='pending', updated_at=_now())
+        return {'customer_id': customer_id, 'status': 'pending'}
+
+    def create_tos_link(self, params, data):
+        return {'url': f"{self.base_url}/tos/{uuid.uuid4().hex}"}
+
+    # External accounts
+
+    def list_external_accounts(self, params, data, customer_id):
+        self._require(self.dataset.customers, customer_id, 'Customer')
+        return self._page(self.dataset.external_accounts, params, group=customer_id)
+
+    def create_external_account(self, params, data, customer_id):
+        self._require(self.dataset.customers, customer_id, 'Customer')
+        account = dict(data.get('account') or {})
+        account_number = str(account.pop('account_number', '') or '0000')
+        account['last_4'] = account_number[-4:]
+        now = _now()
+        record = {
+            **{key: value for key, value in data.items() if key not in ('account', 'address')},
+            'id': _new_id('ea'),
+            'customer_id': customer_id,
+            'account': account,
+            'last_4': account_number[-4:],
+            'active': True,
+            'created_at': now,
+            'updated_at': now
+        }
+        return self.dataset.external_accounts.add(record, group=customer_id)
+
+    def _external_account(self, customer_id: str, account_id: str) -> Dict[str, Any]:
+        account = self._require(self.dataset.external_accounts, account_id, 'External account')
+        if account['customer_id'] != customer_id:
+            raise MockError(404, 'not_found', f"External account {account_id} not found")
+        return account
+
+    def get_external_account(self, params, data, customer_id, account_id):
+        return self._external_account(customer_id, account_id)
+
+    def update_external_account(self, params, data, customer_id, account_id):
+        account = self._external_account(customer_id, account_id)
+        account.update({key: value for key, value in data.items() if key not in ('id', 'customer_id')}, updated_at=_now())
+        return account
+
+    def delete_external_account(self, params, data, customer_id, account_id):
+        self._external_account(customer_id, account_id)
+        self.dataset.external_accounts.remove(account_id)
+        return {'id': account_id, 'deleted': True}
+
+    def verify_external_account(self, params, data, customer_id, account_id):
+        account = self._external_account(customer_id, account_id)
+        return {'id': account['id'], 'verified': True}
+
+    def create_plaid_link_token(self, params, data, customer_id):
+        self._require(self.dataset.customers, customer_id, 'Customer')
+        return {'link_token': f"link-sandbox-{uuid.uuid4().hex}", 'expiration': _now()}
+
+    def exchange_plaid_accounts(self, params, data, customer_id):
+        self._require(self.dataset.customers, customer_id, 'Customer')
+        return {'data': []}
+
+    # Transfers
+
+    def list_transfers(self, params, data):
+        return self._page(self.dataset.transfers, params, group=params.get('customer_id'))
+
+    def create_transfer(self, params, data):
+        source = data.get('source') or {}
+        destination = data.get('destination') or {}
+        record = MockDataset._transfer_record(
+            _new_id('tr'), data.get('on_behalf_of'), str(data.get('amount')),
+            (source.get('payment_rail'), source.get('currency')),
+            (destination.get('payment_rail'), destination.get('currency')),
+            'pending', _now()
+        )
+        record['source'] = {key: value for key, value in source.items() if value is not None}
+        record['destination'] = {key: value for key, value in destination.items() if value is not None}
+        return self.dataset.transfers.add(record, group=data.get('on_behalf_of'))
+
+    def get_transfer(self, params, data, transfer_id):
+        return self._require(self.dataset.transfers, transfer_id, 'Transfer')
+
+    def cancel_transfer(self, params, data, transfer_id):
+        transfer = self._require(self.dataset.transfers, transfer_id, 'Transfer')
+        if transfer['status'] not in ('pending', 'processing'):
+            raise MockError(400, 'not_cancellable', f"Transfer {transfer_id} is {transfer['status']}")
+        transfer.update(status='cancelled', updated_at=_now())
+        return transfer
+
+    def get_receipt(self, params, data, transfer_id):
+        transfer = self._require(self.dataset.transfers, transfer_id, 'Transfer')
+        return {
+            'transfer_id': transfer_id,
+            'initial_amount': transfer['amount'],
+            'developer_fee': '0.00',
+            'exchange_fee': '0.00',
+            'final_amount': transfer['amount'],
+            'status': transfer['status']
+        }
+
+    def estimate_fee(self, params, data):
+        amount = float(data.get('amount') or 0)
+        return {'fee': f"{amount * 0.001:.2f}", 'currency': (data.get('source') or {}).get('currency', 'usd')}
+
+    def get_quote(self, params, data):
+        amount = float(params.get('amount') or 0)
+        return {
+            'source_currency': params.get('source_currency'),
+            'destination_currency': params.get('destination_currency'),
+            'amount': params.get('amount'),
+            'rate': '0.9995',
+            'destination_amount': f"{amount * 0.9995:.2f}",
+            'expires_at': _now()
+        }
+
+    # Wallets
+
+    def list_wallets(self, params, data):
+        return self._page(self.dataset.wallets, params, group=params.get('customer_id'))
+
+    def create_wallet(self, params, data):
+        now = _now()
+        wallet_id = _new_id('wal')
+        record = {
+            'id': wallet_id,
+            'customer_id': data.get('customer_id'),
+            'currency': data.get('currency', 'usdc'),
+            'balance': '0.00',
+            'address': '0x' + hashlib.sha1(wallet_id.encode()).hexdigest(),
+            'chain': data.get('chain', 'base'),
+            'created_at': now,
+            'updated_at': now
+        }
+        return self.dataset.wallets.add(record, group=data.get('customer_id'))
+
+    def get_wallet(self, params, data, wallet_id):
+        return self._require(self.dataset.wallets, wallet_id, 'Wallet')
+
+    def get_balance(self, params, data, wallet_id):
+        wallet = self._require(self.dataset.wallets, wallet_id, 'Wallet')
+        return {'wallet_id': wallet_id, 'balance': wallet['balance'], 'currency': wallet['currency']}
+
+    def list_transactions(self, params, data, wallet_id):
+        self._require(self.dataset.wallets, wallet_id, 'Wallet')
+        return self._page(self.dataset.transactions(wallet_id), params)
+
+    def wallet_transfer(self, params, data, wallet_id):
+        self._require(self.dataset.wallets, wallet_id, 'Wallet')
+        return {'id': _new_id('wtr'), 'wallet_id': wallet_id, 'status': 'pending', **data}
+
+    def get_address(self, params, data, wallet_id):
+        wallet = self._require(self.dataset.wallets, wallet_id, 'Wallet')
+        return {'wallet_id': wallet_id, 'address': wallet['address'], 'currency': params.get('currency', wallet['currency']), 'chain': wallet.get('chain')}
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, so client connection pooling is exercised
+    server_version = 'MockBridge/1.0'
+    disable_nagle_algorithm = True  # headers and body are separate writes; avoid 40 ms delayed-ACK stalls
+
+    def _dispatch(self) -> None:
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        headers = {key.lower(): value for key, value in self.headers.items()}
+        if body and headers.get('content-encoding') == 'gzip':
+            body = gzip.decompress(body)
+
+        status, extra_headers, payload = self.server.api.handle(self.command, self.path, headers, body)
+
+        content = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        compress = self.server.compress_min_bytes and len(content) >= self.server.compress_min_bytes \
+            and 'gzip' in headers.get('accept-encoding', '')
+        if compress:
+            content = gzip.compress(content, compresslevel=5)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        if compress:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(content)))
+        for name, value in extra_headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _dispatch
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+class MockBridgeServer:
+    """Threaded mock server, usable in-process (e.g. from benchmarks) or from the CLI"""
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        customers: int = 1000,
+        transfers_per_customer: int = 5,
+        seed: int = 42,
+        verbose: bool = False,
+        compress_min_bytes: int = 1024,
+        **api_options
+    ):
+        """
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            customers: Dataset size; each customer gets 2 wallets and 2 external accounts
+            transfers_per_customer: Transfers generated per customer
+            seed: Seed for the dataset, latency and fault injection
+            verbose: Log every request to stderr
+            compress_min_bytes: Gzip responses at least this large when the client accepts it (0: never)
+            api_options: latency, write_latency, rate_429, rate_5xx, retry_after, max_page_size
+        """
+        dataset = MockDataset(customers, transfers_per_customer, seed)
+        self.api = MockBridgeAPI(dataset, seed=seed, **api_options)
+        self.httpd = ThreadingHTTPServer((host, port), _RequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.api = self.api
+        self.httpd.verbose = verbose
+        self.httpd.compress_min_bytes = compress_min_bytes
+        self.api.base_url = self.url
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockBridgeServer':
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='mock-bridge-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self.httpd.serve_forever()
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> 'MockBridgeServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+@click.command()
+@click.option('--host', default='127.0.0.1', help='Interface to bind')
+@click.option('--port', default=8787, help='Port to listen on')
+@click.option('--customers', default=1000, help='Dataset size (customers; each has 2 wallets and 2 external accounts)')
+@click.option('--transfers-per-customer', default=5, help='Transfers generated per customer')
+@click.option('--seed', default=42, help='Seed for the dataset, latency and fault injection')
+@click.option('--latency', default='0', help='Latency in ms: N, uniform:A,B, normal:MEAN,SD, lognormal:MEDIAN,SIGMA, exponential:MEAN')
+@click.option('--write-latency', help='Latency for POST/PATCH/DELETE (default: --latency)')
+@click.option('--rate-429', default=0.0, help='Fraction of requests answered with 429')
+@click.option('--rate-5xx', default=0.0, help='Fraction of requests answered with 500/502/503')
+@click.option('--retry-after', default=1, help='Retry-After seconds sent with 429 responses')
+@click.option('--max-page-size', default=100, help='Largest accepted page limit')
+@click.option('--compress-min-bytes', default=1024, help='Gzip responses at least this large when accepted (0: never)')
+@click.option('--verbose', is_flag=True, help='Log every request')
+def mock_server(host, port, customers, transfers_per_customer, seed, latency, write_latency, rate_429, rate_5xx, retry_after, max_page_size,
+                compress_min_bytes, verbose):
+    """Run a local mock Bridge API server"""
+    try:
+        server = MockBridgeServer(
+            host, port, customers, transfers_per_customer, seed, verbose, compress_min_bytes,
+            latency=latency, write_latency=write_latency, rate_429=rate_429,
+            rate_5xx=rate_5xx, retry_after=retry_after, max_page_size=max_page_size
+        )
+    except (ValueError, OSError) as e:
+        raise click.ClickException(str(e))
+
+    dataset = server.api.dataset
+    click.echo(f"Mock Bridge API listening on {server.url}")
+    click.echo(f"Dataset: {len(dataset.customers)} customers, {len(dataset.wallets)} wallets, "
+               f"{len(dataset.external_accounts)} external accounts, {len(dataset.transfers)} transfers (seed {seed})")
+    click.echo(f"Use: python main.py --base-url {server.url} --api-key test ...")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        click.echo("\nStopped")
+    finally:
+        server.httpd.server_close()
+
+if __name__ == '__main__':
+    mock_server()
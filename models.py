@@ -2,7 +2,7 @@
 Pydantic models for Bridge API data structures
 """
 
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, Generic, TypeVar
 from datetime import datetime
 from enum import Enum
 from pydantic import BaseModel, Field, validator
@@ -169,6 +169,14 @@ class Wallet(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+T = TypeVar('T')
+
+class Page(BaseModel, Generic[T]):
+    """One page of a cursor-paginated list response"""
+    data: List[T] = []
+    has_next_page: bool = False
+    next_cursor: Optional[str] = None
+
 class TOSLinkResponse(BaseModel):
     """Terms of Service link response"""
     url: str
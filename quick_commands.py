@@ -1,98 +1,134 @@
 #!/usr/bin/env python3
 """
 Quick Commands for Bridge API
-Easy-to-use functions that wrap the CLI commands
+Easy-to-use functions built on the in-process Bridge interface
+
+All functions share one Bridge instance (one client, one connection pool),
+so calling many of them in a script costs API round-trips only.
 """
 
-import subprocess
-import json
 import sys
+from typing import Optional
 
-def run_cli_command(command):
-    """Run a CLI command and return the result"""
-    try:
-        result = subprocess.run(f"python main.py {command}", 
-                              shell=True, capture_output=True, text=True)
-        return result.stdout, result.stderr, result.returncode == 0
-    except Exception as e:
-        return "", str(e), False
+from dotenv import load_dotenv
+
+from bridge import Bridge
+
+_bridge: Optional[Bridge] = None
+
+def get_bridge() -> Bridge:
+    """Shared Bridge instance, created from environment variables on first use"""
+    global _bridge
+    if _bridge is None:
+        load_dotenv()
+        _bridge = Bridge.from_env()
+    return _bridge
 
 def check_connection():
     """Check if Bridge API connection is working"""
     print("🔍 Checking Bridge API connection...")
-    stdout, stderr, success = run_cli_command("status")
-    if success:
+    try:
+        bridge = get_bridge()
+        bridge.check_connection()
         print("✅ Connection successful!")
-        print(stdout)
-    else:
+        print(f"Environment: {bridge.config.environment}")
+        print(f"Base URL: {bridge.config.base_url}")
+        return True
+    except Exception as e:
         print("❌ Connection failed!")
-        print(stderr)
-    return success
+        print(e)
+        return False
 
-def list_customers():
-    """List all customers"""
+def list_customers(limit=10):
+    """List customers"""
     print("👥 Listing customers...")
-    stdout, stderr, success = run_cli_command("customers list --limit 10")
-    if success:
-        print(stdout)
-    else:
-        print(f"❌ Error: {stderr}")
-    return success
-
-def list_transfers():
-    """List all transfers"""
+    try:
+        page = get_bridge().list_customers(limit=limit)
+        print(f"Found {len(page.data)} customers:")
+        for customer in page.data:
+            print(f"ID: {customer.id}")
+            print(f"Name: {customer.first_name} {customer.last_name}")
+            print(f"Email: {customer.email}")
+            print(f"Status: {customer.status.value}")
+            print("---")
+        return page
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return None
+
+def list_transfers(limit=10):
+    """List transfers"""
     print("💸 Listing transfers...")
-    stdout, stderr, success = run_cli_command("transfers list --limit 10")
-    if success:
-        print(stdout)
-    else:
-        print(f"❌ Error: {stderr}")
-    return success
+    try:
+        page = get_bridge().list_transfers(limit=limit)
+        print(f"Found {len(page.data)} transfers:")
+        for transfer in page.data:
+            print(f"ID: {transfer.id}")
+            print(f"Amount: {transfer.amount}")
+            print(f"Status: {transfer.status.value}")
+            print(f"Customer: {transfer.on_behalf_of}")
+            print("---")
+        return page
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return None
 
 def get_customer_details(customer_id):
     """Get details for a specific customer"""
     print(f"👤 Getting customer details for {customer_id}...")
-    stdout, stderr, success = run_cli_command(f"customers get {customer_id}")
-    if success:
-        print(stdout)
-    else:
-        print(f"❌ Error: {stderr}")
-    return success
+    try:
+        customer = get_bridge().customers.get_customer(customer_id)
+        print(f"Customer ID: {customer.id}")
+        print(f"Name: {customer.first_name} {customer.last_name}")
+        print(f"Email: {customer.email}")
+        print(f"Status: {customer.status.value}")
+        print(f"Type: {customer.type.value}")
+        print(f"Created: {customer.created_at}")
+        return customer
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return None
 
 def create_tos_link():
     """Create a Terms of Service link"""
     print("📋 Creating Terms of Service link...")
-    stdout, stderr, success = run_cli_command("customers create-tos-link")
-    if success:
+    try:
+        response = get_bridge().customers.create_tos_link()
         print("✅ TOS link created!")
-        print(stdout)
-    else:
-        print(f"❌ Error: {stderr}")
-    return success
+        print(f"URL: {response.url}")
+        return response
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return None
 
 def main():
     """Run quick examples"""
     print("=== Bridge API Quick Commands ===")
     print()
-    
+
     # Run some quick examples
-    check_connection()
+    if not check_connection():
+        sys.exit(1)
     print("\n" + "-"*50 + "\n")
-    
+
     list_customers()
     print("\n" + "-"*50 + "\n")
-    
+
     list_transfers()
     print("\n" + "-"*50 + "\n")
-    
+
     create_tos_link()
     print("\n" + "-"*50 + "\n")
-    
+
     print("🎉 All examples completed!")
     print("\nTo use these functions in your own code:")
     print("  from quick_commands import check_connection, list_customers")
     print("  check_connection()")
     print("  list_customers()")
+    print("\nOr use the Bridge interface directly:")
+    print("  from bridge import Bridge")
+    print("  bridge = Bridge.from_env()")
+    print("  for customer in bridge.iter_customers(): ...")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -2,16 +2,31 @@
 Bridge API Services
 
 Service modules for different Bridge API endpoints
+
+Services are imported on first access, so importing one service module does not
+load all of them (and their dependencies).
 """
 
-from .customers import CustomerService
-from .transfers import TransferService
-from .wallets import WalletService
-from .external_accounts import ExternalAccountService
+import importlib
+
+_EXPORTS = {
+    'CustomerService': '.customers',
+    'TransferService': '.transfers',
+    'WalletService': '.wallets',
+    'ExternalAccountService': '.external_accounts',
+    'CustomerSearchIndex': '.customer_index',
+    'ExternalAccountIndex': '.external_account_index',
+    'PortfolioService': '.portfolio',
+    'WalletLedger': '.wallet_ledger',
+    'TransferExporter': '.transfer_export'
+}
+
+__all__ = list(_EXPORTS)
 
-__all__ = [
-    'CustomerService',
-    'TransferService', 
-    'WalletService',
-    'ExternalAccountService'
-]
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
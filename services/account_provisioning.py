@@ -0,0 +1,257 @@
+"""
+Bulk external account provisioning for Bridge API
+
+Streams CSV/NDJSON rows into external account requests, validates them locally
+and submits them with bounded concurrency, deterministic idempotency keys and a
+resumable results log
+"""
+
+import csv
+import json
+import os
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, ALL_COMPLETED, FIRST_COMPLETED, wait
+from typing import Dict, Any, Iterable, Iterator, Optional, Set, Tuple, TYPE_CHECKING
+
+from bridge_client import BridgeAPIError
+from models import ExternalAccountRequest, Address
+from utils.idempotency import generate_deterministic_key
+from utils.logger import setup_logger
+
+if TYPE_CHECKING:
+    from services.external_accounts import ExternalAccountService
+    from services.external_account_index import ExternalAccountIndex
+
+logger = setup_logger(__name__)
+
+# Statuses that are final; rows with these statuses are skipped on resume
+TERMINAL_STATUSES = ('created', 'duplicate', 'invalid')
+
+# Input columns mirror the `accounts create` options
+REQUIRED_COLUMNS = (
+    'customer_id', 'currency', 'account_type', 'bank_name', 'account_name',
+    'first_name', 'last_name', 'owner_type', 'owner_name', 'routing_number',
+    'account_number', 'account_subtype', 'address_line1', 'city', 'postal_code', 'country'
+)
+
+class MalformedRow(ValueError):
+    """An input line that could not be read as a row; recorded as an invalid row"""
+
+def read_rows(path: str, file_format: Optional[str] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Stream input rows from a CSV or NDJSON file
+
+    Args:
+        path: Input file path
+        file_format: 'csv' or 'ndjson' (detected from the extension if omitted)
+
+    Returns:
+        Iterator of (row number, row) pairs; row numbers start at 1. An NDJSON
+        line that is not a JSON object is yielded as a MalformedRow, so one bad
+        line fails only its own row.
+    """
+    if file_format is None:
+        file_format = 'ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv'
+
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if file_format == 'csv':
+            for row_number, row in enumerate(csv.DictReader(f), start=1):
+                yield row_number, row
+        else:
+            for row_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    yield row_number, MalformedRow(f"Invalid JSON: {e}")
+                    continue
+                if not isinstance(row, dict):
+                    row = MalformedRow(f"Expected a JSON object, got {type(row).__name__}")
+                yield row_number, row
+
+def validate_routing_number(routing_number: str) -> None:
+    """Validate an ABA routing number (9 digits with a valid checksum)"""
+    if len(routing_number) != 9 or not routing_number.isdigit():
+        raise ValueError(f"Routing number must be 9 digits: {routing_number!r}")
+
+    digits = [int(ch) for ch in routing_number]
+    checksum = 3 * (digits[0] + digits[3] + digits[6]) + 7 * (digits[1] + digits[4] + digits[7]) + (digits[2] + digits[5] + digits[8])
+    if checksum % 10 != 0:
+        raise ValueError(f"Routing number checksum is invalid: {routing_number!r}")
+
+def validate_account_number(account_number: str) -> None:
+    """Validate a US bank account number (4 to 17 digits)"""
+    if not account_number.isdigit() or not 4 <= len(account_number) <= 17:
+        raise ValueError("Account number must be 4 to 17 digits")
+
+def row_to_request(row: Dict[str, Any]) -> Tuple[str, ExternalAccountRequest]:
+    """
+    Convert an input row into an external account request
+
+    Raises:
+        ValueError: If the row is malformed, is missing columns or fails validation
+    """
+    if isinstance(row, MalformedRow):
+        raise row
+    if not isinstance(row, dict):
+        raise MalformedRow(f"Expected a mapping of columns, got {type(row).__name__}")
+    values = {key: str(value).strip() for key, value in row.items() if value not in (None, '')}
+    missing = [column for column in REQUIRED_COLUMNS if column not in values]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    if values['account_type'] == 'us':
+        validate_routing_number(values['routing_number'])
+        validate_account_number(values['account_number'])
+
+    request = ExternalAccountRequest(
+        currency=values['currency'],
+        account_type=values['account_type'],
+        bank_name=values['bank_name'],
+        account_name=values['account_name'],
+        first_name=values['first_name'],
+        last_name=values['last_name'],
+        account_owner_type=values['owner_type'],
+        account_owner_name=values['owner_name'],
+        account={
+            'routing_number': values['routing_number'],
+            'account_number': values['account_number'],
+            'checking_or_savings': values['account_subtype']
+        },
+        address=Address(
+            street_line_1=values['address_line1'],
+            street_line_2=values.get('address_line2'),
+            city=values['city'],
+            subdivision=values.get('state'),
+            postal_code=values['postal_code'],
+            country=values['country']
+        )
+    )
+    return values['customer_id'], request
+
+def request_idempotency_key(customer_id: str, request: ExternalAccountRequest) -> str:
+    """Deterministic idempotency key for an account request, stable across runs"""
+    return generate_deterministic_key('account', customer_id, request.model_dump_json())
+
+class BulkAccountProvisioner:
+    """Submits external account requests concurrently, recording each row's outcome"""
+
+    def __init__(
+        self,
+        account_service: 'ExternalAccountService',
+        results_path: str,
+        max_workers: int = 8,
+        index: Optional['ExternalAccountIndex'] = None
+    ):
+        self.account_service = account_service
+        self.results_path = results_path
+        self.max_workers = max_workers
+        self.index = index
+
+    def completed_rows(self) -> Set[int]:
+        """Row numbers already finished according to the results log (the resume checkpoint)"""
+        completed: Set[int] = set()
+        if not os.path.exists(self.results_path):
+            return completed
+
+        with open(self.results_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except ValueError:
+                    continue  # torn last line from an interrupted run
+                if result.get('status') in TERMINAL_STATUSES:
+                    completed.add(result['row'])
+        return completed
+
+    def run(self, rows: Iterable[Tuple[int, Dict[str, Any]]], dry_run: bool = False) -> Dict[str, int]:
+        """
+        Provision accounts for all rows not already completed
+
+        Args:
+            rows: (row number, row) pairs, e.g. from ``read_rows``
+            dry_run: Only validate rows; nothing is submitted or written to the results log
+
+        Returns:
+            Counts per status, plus 'skipped' for rows completed by a previous run
+        """
+        counts = {'created': 0, 'duplicate': 0, 'invalid': 0, 'failed': 0, 'skipped': 0, 'valid': 0}
+        completed = self.completed_rows()
+        if not dry_run:
+            self.account_service.client.warmup(self.max_workers)
+
+        results_file = nullcontext() if dry_run else open(self.results_path, 'a+', encoding='utf-8')
+        with results_file as results, ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+
+            # Terminate a torn last line so appended results stay parseable
+            if results is not None and results.tell() > 0:
+                results.seek(results.tell() - 1)
+                if results.read(1) != '\n':
+                    results.write('\n')
+
+            def record(result: Dict[str, Any]) -> None:
+                counts[result['status']] += 1
+                if results is not None:
+                    results.write(json.dumps(result) + '\n')
+                    results.flush()
+
+            pending: Dict[Any, Dict[str, Any]] = {}
+
+            def drain(return_when) -> None:
+                done, _ = wait(pending, return_when=return_when)
+                for future in done:
+                    result = pending.pop(future)
+                    try:
+                        account = future.result()
+                        result.update(status='created', account_id=account.id)
+                        if self.index is not None:
+                            self.index.add(account)
+                    except BridgeAPIError as e:
+                        result.update(status='failed', error=str(e), status_code=e.status_code)
+                    except Exception as e:
+                        result.update(status='failed', error=str(e))
+                    record(result)
+
+            # Rows already submitted are recorded even if reading the input fails
+            try:
+                for row_number, row in rows:
+                    if row_number in completed:
+                        counts['skipped'] += 1
+                        continue
+
+                    result: Dict[str, Any] = {'row': row_number, 'customer_id': row.get('customer_id') if isinstance(row, dict) else None}
+                    try:
+                        customer_id, request = row_to_request(row)
+                    except ValueError as e:
+                        record(dict(result, status='invalid', error=str(e)))
+                        continue
+
+                    if self.index is not None:
+                        existing = self.index.find_duplicate(request)
+                        if existing is not None:
+                            record(dict(result, status='duplicate', account_id=existing['id']))
+                            continue
+
+                    if dry_run:
+                        counts['valid'] += 1
+                        continue
+
+                    # Bound the number of in-flight requests so huge inputs stream in constant memory
+                    if len(pending) >= self.max_workers * 2:
+                        drain(FIRST_COMPLETED)
+
+                    result['idempotency_key'] = request_idempotency_key(customer_id, request)
+                    future = executor.submit(
+                        self.account_service.create_external_account,
+                        customer_id,
+                        request,
+                        idempotency_key=result['idempotency_key']
+                    )
+                    pending[future] = result
+            finally:
+                if pending:
+                    drain(ALL_COMPLETED)
+
+        logger.info("Bulk account provisioning finished: %s", counts)
+        return counts
@@ -0,0 +1,385 @@
+"""
+Customer search index for Bridge API
+
+Local inverted index over customer fields with prefix and fuzzy matching,
+built from a streamed customer scan and kept up to date incrementally.
+Documents keep the original field values for display; matching uses their
+normalized (lowercased) tokens.
+
+The saved file holds the sorted keys and, packed into one string, the
+customers of each key, so loading does not re-tokenize every customer: a
+key's customers are decoded when a search reaches it, and all of them only
+when the loaded index is changed.
+"""
+
+import bisect
+import heapq
+import json
+import os
+import re
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Set, Iterable, Tuple, Union
+
+from models import Customer
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+INDEXED_FIELDS = ('email', 'first_name', 'last_name', 'phone', 'status', 'type')
+
+_SPLIT_RE = re.compile(r"[^0-9a-z]+")
+_PHONE_RE = re.compile(r"^\+?[0-9 ()\-.]{3,}$")
+_MIN_PHONE_SUFFIX = 4
+_MIN_FUZZY_LENGTH = 4
+
+# Layout of the saved index; older files are re-tokenized on load and, since they
+# only kept lowercased values, marked for a rebuild from the API
+INDEX_VERSION = 2
+
+def _display_value(value: Any) -> str:
+    """A field value as stored and shown (enums by their value)"""
+    if value is None:
+        return ''
+    return str(getattr(value, 'value', value)).strip()
+
+def _normalize_value(value: Any) -> str:
+    """A field value as matched"""
+    return _display_value(value).lower()
+
+def _field_tokens(field: str, value: str) -> Set[str]:
+    """Tokens produced by a single normalized field value"""
+    if not value:
+        return set()
+
+    if field == 'phone':
+        digits = ''.join(ch for ch in value if ch.isdigit())
+        # Suffixes let "4567" or "5554567" find "+1 (212) 555-4567"
+        return {digits[i:] for i in range(len(digits) - _MIN_PHONE_SUFFIX + 1)} | {digits} if digits else set()
+
+    tokens = {value}
+    tokens.update(part for part in _SPLIT_RE.split(value) if part)
+    if field == 'email' and '@' in value:
+        local, _, domain = value.partition('@')
+        tokens.update((local, domain))
+    return tokens
+
+def _osa_distance(a: str, b: str, max_distance: int) -> int:
+    """Optimal string alignment distance, short-circuiting above max_distance"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous_previous: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+def _deletes(token: str) -> Set[str]:
+    """Single-character deletions of a token (symmetric delete candidates)"""
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+class CustomerSearchIndex:
+    """In-memory inverted index over customers, persisted to a JSON file"""
+
+    SCORE_EXACT = 3
+    SCORE_PREFIX = 2
+    SCORE_FUZZY = 1
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.synced_at: Optional[str] = None
+        # Loaded from an older file: values may be lowercased until the next sync re-reads every customer
+        self.needs_rebuild = False
+        self._documents: Dict[str, Dict[str, str]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        self._sorted_keys: Optional[List[str]] = None
+        self._delete_index: Optional[Dict[str, Set[str]]] = None
+        # Postings as loaded, until the index changes: sorted keys, the customers of
+        # each key as space-separated positions, and customer IDs by position
+        self._packed: Optional[Tuple[List[str], List[str], List[str]]] = None
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, customer_id: str) -> bool:
+        return customer_id in self._documents
+
+    # Maintenance
+
+    def add(self, customer: Union[Customer, Dict[str, Any]]) -> bool:
+        """
+        Add or replace a customer in the index
+
+        Args:
+            customer: Customer model or raw customer dictionary from the API
+
+        Returns:
+            True if the index changed
+        """
+        record = customer.model_dump(mode='json') if isinstance(customer, Customer) else customer
+        customer_id = record.get('id')
+        if not customer_id:
+            return False
+
+        document = {field: _display_value(record.get(field)) for field in INDEXED_FIELDS}
+        document['updated_at'] = _display_value(record.get('updated_at'))
+
+        existing = self._documents.get(customer_id)
+        if existing == document:
+            return False
+        self._unpack()
+        if existing is not None:
+            self.remove(customer_id)
+
+        self._documents[customer_id] = document
+        for key in self._document_keys(document):
+            postings = self._postings.get(key)
+            if postings is None:
+                self._postings[key] = {customer_id}
+                self._invalidate()
+            else:
+                postings.add(customer_id)
+        return True
+
+    def remove(self, customer_id: str) -> bool:
+        """Remove a customer from the index"""
+        document = self._documents.get(customer_id)
+        if document is None:
+            return False
+        self._unpack()
+        del self._documents[customer_id]
+
+        for key in self._document_keys(document):
+            postings = self._postings.get(key)
+            if postings is None:
+                continue
+            postings.discard(customer_id)
+            if not postings:
+                del self._postings[key]
+                self._invalidate()
+        return True
+
+    def sync(self, customers: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Reconcile the index with a full customer scan
+
+        Only customers whose ``updated_at`` changed are re-indexed, and customers
+        missing from the scan are dropped.
+
+        Args:
+            customers: Iterable of raw customer dictionaries (e.g. ``CustomerService.iter_customers()``)
+
+        Returns:
+            Counts of added, updated, unchanged and removed customers
+        """
+        counts = {'added': 0, 'updated': 0, 'unchanged': 0, 'removed': 0}
+        seen: Set[str] = set()
+
+        for record in customers:
+            customer_id = record.get('id')
+            if not customer_id:
+                continue
+            seen.add(customer_id)
+
+            existing = self._documents.get(customer_id)
+            if existing is not None and not self.needs_rebuild and existing['updated_at'] == _display_value(record.get('updated_at')):
+                counts['unchanged'] += 1
+                continue
+            if self.add(record):
+                counts['updated' if existing is not None else 'added'] += 1
+            else:
+                counts['unchanged'] += 1
+
+        for customer_id in [cid for cid in self._documents if cid not in seen]:
+            self.remove(customer_id)
+            counts['removed'] += 1
+
+        self.synced_at = datetime.now(timezone.utc).isoformat()
+        self.needs_rebuild = False
+        logger.info("Customer index synced: %s", counts)
+        return counts
+
+    # Queries
+
+    def search(self, query: str, fuzzy: bool = False, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Search customers
+
+        Each whitespace-separated term must match (AND). Terms match indexed tokens
+        exactly or by prefix; ``field:value`` restricts a term to one field
+        (e.g. ``status:active``). With ``fuzzy`` enabled, terms also match tokens
+        one edit away.
+
+        Args:
+            query: Search query
+            fuzzy: Also match tokens within one edit (typos, transpositions)
+            limit: Maximum number of results
+
+        Returns:
+            Matching customer documents (original values) with ``id`` and ``score``, best first
+        """
+        scores: Optional[Dict[str, int]] = None
+
+        for term in query.split():
+            term_scores = self._match_term(term, fuzzy)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {cid: score + term_scores[cid] for cid, score in scores.items() if cid in term_scores}
+            if not scores:
+                return []
+
+        if not scores:
+            return []
+
+        documents = self._documents
+        ranked = heapq.nsmallest(
+            limit,
+            scores.items(),
+            key=lambda item: (-item[1], documents[item[0]]['last_name'].lower(), documents[item[0]]['first_name'].lower())
+        )
+        return [dict(self._documents[cid], id=cid, score=score) for cid, score in ranked]
+
+    def _match_term(self, term: str, fuzzy: bool) -> Dict[str, int]:
+        """Score customers matching a single query term"""
+        field, _, value = term.lower().partition(':')
+        if not value or field not in INDEXED_FIELDS:
+            field, value = '', term.lower()
+
+        if (field in ('', 'phone')) and _PHONE_RE.match(value) and any(ch.isdigit() for ch in value):
+            value = ''.join(ch for ch in value if ch.isdigit())
+        prefix = f"{field}:" if field else ''
+        key = prefix + value
+
+        scores: Dict[str, int] = {}
+        self._score_keys(self._prefix_keys(key), key, scores)
+
+        if fuzzy and len(value) >= _MIN_FUZZY_LENGTH:
+            for candidate in self._fuzzy_tokens(value):
+                # Expand corrected tokens by prefix too, so "jonh" finds "johnson"
+                self._score_keys(self._prefix_keys(prefix + candidate), None, scores, self.SCORE_FUZZY)
+        return scores
+
+    def _score_keys(self, keys: Iterable[str], exact: Optional[str], scores: Dict[str, int], score: Optional[int] = None) -> None:
+        for key in keys:
+            key_score = score if score is not None else (self.SCORE_EXACT if key == exact else self.SCORE_PREFIX)
+            for cid in self._customers(key):
+                if scores.get(cid, 0) < key_score:
+                    scores[cid] = key_score
+
+    def _prefix_keys(self, key: str) -> List[str]:
+        keys = self._keys()
+        start = bisect.bisect_left(keys, key)
+        end = bisect.bisect_left(keys, key + '\uffff', start)
+        return keys[start:end]
+
+    def _fuzzy_tokens(self, value: str) -> Set[str]:
+        """Unqualified tokens within one edit of value"""
+        if self._delete_index is None:
+            delete_index: Dict[str, Set[str]] = {}
+            for key in self._keys():
+                # Field-qualified keys resolve through their bare token, and numeric
+                # tokens (phone suffixes) are matched by prefix only
+                if ':' in key or not key.isalpha():
+                    continue
+                for variant in _deletes(key) | {key}:
+                    delete_index.setdefault(variant, set()).add(key)
+            self._delete_index = delete_index
+
+        candidates: Set[str] = set()
+        for variant in _deletes(value) | {value}:
+            candidates.update(self._delete_index.get(variant, ()))
+        return {token for token in candidates if _osa_distance(value, token, 1) <= 1}
+
+    def _customers(self, key: str) -> Iterable[str]:
+        """IDs of the customers with an index key"""
+        if self._packed is None:
+            return self._postings[key]
+        keys, positions, ids = self._packed
+        return [ids[int(position)] for position in positions[bisect.bisect_left(keys, key)].split()]
+
+    def _unpack(self) -> None:
+        """Decode every loaded posting, before the index is changed"""
+        if self._packed is None:
+            return
+        keys, positions, ids = self._packed
+        self._postings = {key: {ids[int(position)] for position in entry.split()} for key, entry in zip(keys, positions)}
+        self._sorted_keys = keys
+        self._packed = None
+
+    def _keys(self) -> List[str]:
+        if self._packed is not None:
+            return self._packed[0]
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(self._postings)
+        return self._sorted_keys
+
+    def _invalidate(self) -> None:
+        self._sorted_keys = None
+        self._delete_index = None
+
+    @staticmethod
+    def _document_keys(document: Dict[str, str]) -> Set[str]:
+        keys: Set[str] = set()
+        for field in INDEXED_FIELDS:
+            for token in _field_tokens(field, _normalize_value(document[field])):
+                keys.add(token)
+                keys.add(f"{field}:{token}")
+        return keys
+
+    # Persistence
+
+    @classmethod
+    def load(cls, path: str) -> 'CustomerSearchIndex':
+        """Load an index from disk, or return an empty one if the file does not exist"""
+        index = cls(path)
+        if not os.path.exists(path):
+            return index
+
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+        index.synced_at = payload.get('synced_at')
+        if payload.get('version') == INDEX_VERSION:
+            index._documents = payload['customers']
+            index._packed = (payload['keys'], payload['postings'].split('\n'), list(index._documents))
+            index.needs_rebuild = payload.get('needs_rebuild', False)
+        else:
+            for customer_id, document in payload.get('customers', {}).items():
+                index.add(dict(document, id=customer_id))
+            index.needs_rebuild = True
+            logger.warning("Customer index %s is from an older version and shows lowercased values until it is synced", path)
+        logger.info("Loaded customer index with %s customers from %s", len(index), path)
+        return index
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Write the index to disk atomically"""
+        path = path or self.path
+        if not path:
+            raise ValueError("No path given for customer index")
+
+        if self._packed is not None:
+            keys, positions, _ = self._packed
+        else:
+            position = {customer_id: str(i) for i, customer_id in enumerate(self._documents)}
+            keys = self._keys()
+            positions = [' '.join(position[cid] for cid in self._postings[key]) for key in keys]
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': INDEX_VERSION,
+                'synced_at': self.synced_at,
+                'needs_rebuild': self.needs_rebuild,
+                'customers': self._documents,
+                'keys': keys,
+                'postings': '\n'.join(positions)
+            }, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
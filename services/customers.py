@@ -5,101 +5,118 @@ Handles customer creation, KYC/KYB processes, and customer management
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, TYPE_CHECKING
 
 from bridge_client import BridgeClient, BridgeAPIError
 from models import Customer, CustomerRequest, TOSLinkResponse
+from utils.deadline import Deadline
 from utils.logger import setup_logger
+from utils.pagination import iter_items
+from utils.tracing import build_model
+
+if TYPE_CHECKING:
+    from services.customer_index import CustomerSearchIndex
 
 logger = setup_logger(__name__)
 
 class CustomerService:
     """Service for customer operations"""
     
-    def __init__(self, client: BridgeClient):
+    def __init__(self, client: BridgeClient, index: Optional['CustomerSearchIndex'] = None):
         self.client = client
+        self.index = index
+    
+    def _track(self, customer: Customer) -> Customer:
+        """Keep the attached search index up to date with a fetched customer"""
+        if self.index is not None:
+            self.index.add(customer)
+        return customer
     
-    def create_tos_link(self, redirect_uri: Optional[str] = None) -> TOSLinkResponse:
+    def create_tos_link(self, redirect_uri: Optional[str] = None, deadline: Optional[Deadline] = None) -> TOSLinkResponse:
         """Create a Terms of Service link for customer"""
         try:
             data = {}
             if redirect_uri:
                 data['redirect_uri'] = redirect_uri
             
-            response = self.client.post('/v0/customers/tos_links', data)
+            response = self.client.post('/v0/customers/tos_links', data, deadline=deadline)
             logger.info("TOS link created successfully")
             return TOSLinkResponse(**response)
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to create TOS link: {e}")
+            logger.error("Failed to create TOS link: %s", e)
             raise
     
-    def create_customer(self, customer_data: CustomerRequest) -> Customer:
+    def create_customer(self, customer_data: CustomerRequest, deadline: Optional[Deadline] = None) -> Customer:
         """Create a new customer"""
         try:
-            response = self.client.post('/v0/customers', customer_data.dict())
-            logger.info(f"Customer created successfully with ID: {response.get('id')}")
-            return Customer(**response)
+            response = self.client.post('/v0/customers', customer_data.dict(), deadline=deadline)
+            logger.info("Customer created successfully with ID: %s", response.get('id'))
+            return self._track(build_model(Customer, response))
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to create customer: {e}")
+            logger.error("Failed to create customer: %s", e)
             raise
     
-    def get_customer(self, customer_id: str) -> Customer:
+    def get_customer(self, customer_id: str, deadline: Optional[Deadline] = None) -> Customer:
         """Get customer by ID"""
         try:
-            response = self.client.get(f'/v0/customers/{customer_id}')
-            logger.info(f"Retrieved customer: {customer_id}")
-            return Customer(**response)
+            response = self.client.get(f'/v0/customers/{customer_id}', deadline=deadline)
+            logger.info("Retrieved customer: %s", customer_id)
+            return self._track(build_model(Customer, response))
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to get customer {customer_id}: {e}")
+            logger.error("Failed to get customer %s: %s", customer_id, e)
             raise
     
-    def list_customers(self, limit: int = 100, cursor: Optional[str] = None) -> Dict[str, Any]:
+    def list_customers(self, limit: int = 100, cursor: Optional[str] = None, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """List customers with pagination"""
         try:
             params = {'limit': limit}
             if cursor:
                 params['cursor'] = cursor
             
-            response = self.client.get('/v0/customers', params=params)
-            logger.info(f"Listed {len(response.get('data', []))} customers")
+            response = self.client.get('/v0/customers', params=params, deadline=deadline)
+            logger.info("Listed %s customers", len(response.get('data', [])))
             return response
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to list customers: {e}")
+            logger.error("Failed to list customers: %s", e)
             raise
     
-    def update_customer(self, customer_id: str, update_data: Dict[str, Any]) -> Customer:
+    def iter_customers(self, page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Stream all customers, fetching one page at a time"""
+        return iter_items(self.list_customers, limit=page_size)
+    
+    def update_customer(self, customer_id: str, update_data: Dict[str, Any], deadline: Optional[Deadline] = None) -> Customer:
         """Update customer information"""
         try:
-            response = self.client.patch(f'/v0/customers/{customer_id}', update_data)
-            logger.info(f"Customer {customer_id} updated successfully")
-            return Customer(**response)
+            response = self.client.patch(f'/v0/customers/{customer_id}', update_data, deadline=deadline)
+            logger.info("Customer %s updated successfully", customer_id)
+            return self._track(build_model(Customer, response))
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to update customer {customer_id}: {e}")
+            logger.error("Failed to update customer %s: %s", customer_id, e)
             raise
     
-    def get_customer_kyc_status(self, customer_id: str) -> Dict[str, Any]:
+    def get_customer_kyc_status(self, customer_id: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """Get KYC status for customer"""
         try:
-            response = self.client.get(f'/v0/customers/{customer_id}/kyc_status')
-            logger.info(f"Retrieved KYC status for customer: {customer_id}")
+            response = self.client.get(f'/v0/customers/{customer_id}/kyc_status', deadline=deadline)
+            logger.info("Retrieved KYC status for customer: %s", customer_id)
             return response
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to get KYC status for customer {customer_id}: {e}")
+            logger.error("Failed to get KYC status for customer %s: %s", customer_id, e)
             raise
     
-    def resubmit_customer_kyc(self, customer_id: str, kyc_data: Dict[str, Any]) -> Dict[str, Any]:
+    def resubmit_customer_kyc(self, customer_id: str, kyc_data: Dict[str, Any], deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """Resubmit KYC information for customer"""
         try:
-            response = self.client.post(f'/v0/customers/{customer_id}/kyc_resubmit', kyc_data)
-            logger.info(f"KYC resubmitted for customer: {customer_id}")
+            response = self.client.post(f'/v0/customers/{customer_id}/kyc_resubmit', kyc_data, deadline=deadline)
+            logger.info("KYC resubmitted for customer: %s", customer_id)
             return response
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to resubmit KYC for customer {customer_id}: {e}")
+            logger.error("Failed to resubmit KYC for customer %s: %s", customer_id, e)
             raise
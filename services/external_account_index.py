@@ -0,0 +1,219 @@
+"""
+External account index for Bridge API
+
+Global, cross-customer index of external accounts used for duplicate detection
+and for resolving account IDs locally. Built by concurrent fan-out across
+customers and refreshed incrementally per customer.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union, TYPE_CHECKING
+
+from models import ExternalAccount, ExternalAccountRequest
+from utils.logger import setup_logger
+
+if TYPE_CHECKING:
+    from services.external_accounts import ExternalAccountService
+
+logger = setup_logger(__name__)
+
+Fingerprint = Tuple[str, str, str]
+
+def _normalize(value: Any) -> str:
+    return ' '.join(str(value or '').lower().split())
+
+def account_fingerprint(bank_name: str, last_4: str, owner_name: str) -> Fingerprint:
+    """Identity of a bank account: bank name, last 4 digits and owner name"""
+    return (_normalize(bank_name), str(last_4 or '')[-4:], _normalize(owner_name))
+
+def request_fingerprint(account_data: ExternalAccountRequest) -> Fingerprint:
+    """Fingerprint of an account that is about to be created"""
+    account_number = str(account_data.account.get('account_number', ''))
+    return account_fingerprint(account_data.bank_name, account_number[-4:], account_data.account_owner_name)
+
+class ExternalAccountIndex:
+    """In-memory index of external accounts across customers, persisted to a JSON file"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._accounts: Dict[str, Dict[str, Any]] = {}
+        self._by_fingerprint: Dict[Fingerprint, str] = {}
+        self._by_customer: Dict[str, Dict[str, None]] = {}
+        self._customer_synced_at: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._accounts)
+
+    # Maintenance
+
+    def add(self, account: Union[ExternalAccount, Dict[str, Any]]) -> None:
+        """Add or replace an external account"""
+        record = account.model_dump(mode='json') if isinstance(account, ExternalAccount) else dict(account)
+        account_id = record.get('id')
+        if not account_id:
+            return
+
+        self.remove(account_id)
+        self._accounts[account_id] = record
+        self._by_customer.setdefault(record.get('customer_id', ''), {})[account_id] = None
+        if record.get('active', True):
+            self._by_fingerprint[self._fingerprint(record)] = account_id
+
+    def remove(self, account_id: str) -> bool:
+        """Remove an external account"""
+        record = self._accounts.pop(account_id, None)
+        if record is None:
+            return False
+
+        fingerprint = self._fingerprint(record)
+        if self._by_fingerprint.get(fingerprint) == account_id:
+            del self._by_fingerprint[fingerprint]
+        self._by_customer.get(record.get('customer_id', ''), {}).pop(account_id, None)
+        return True
+
+    def replace_customer(self, customer_id: str, accounts: Iterable[Dict[str, Any]]) -> None:
+        """Replace all indexed accounts of one customer with a fresh listing"""
+        for account_id in list(self._by_customer.get(customer_id, {})):
+            self.remove(account_id)
+        for account in accounts:
+            self.add(dict(account, customer_id=account.get('customer_id') or customer_id))
+        self._customer_synced_at[customer_id] = time.time()
+
+    def sync(
+        self,
+        account_service: 'ExternalAccountService',
+        customer_ids: Iterable[str],
+        max_workers: int = 8,
+        max_age: Optional[float] = None,
+        page_size: int = 100
+    ) -> Dict[str, int]:
+        """
+        Refresh the index by listing accounts of many customers concurrently
+
+        Args:
+            account_service: Service used to list each customer's accounts
+            customer_ids: Customers to cover (e.g. streamed from ``CustomerService.iter_customers()``)
+            max_workers: Number of concurrent listings
+            max_age: Skip customers refreshed less than this many seconds ago
+            page_size: Page size used for each customer's listing
+
+        Returns:
+            Counts of refreshed, skipped and failed customers
+        """
+        counts = {'refreshed': 0, 'skipped': 0, 'failed': 0}
+        now = time.time()
+
+        def fetch(customer_id: str) -> List[Dict[str, Any]]:
+            return list(account_service.iter_external_accounts(customer_id, page_size=page_size))
+
+        account_service.client.warmup(max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for customer_id in customer_ids:
+                synced_at = self._customer_synced_at.get(customer_id)
+                if max_age is not None and synced_at is not None and now - synced_at < max_age:
+                    counts['skipped'] += 1
+                    continue
+                futures[executor.submit(fetch, customer_id)] = customer_id
+
+            # Results are applied on this thread only, so the index needs no locking
+            for future in as_completed(futures):
+                customer_id = futures[future]
+                try:
+                    self.replace_customer(customer_id, future.result())
+                    counts['refreshed'] += 1
+                except Exception as e:
+                    logger.warning("Failed to index external accounts for customer %s: %s", customer_id, e)
+                    counts['failed'] += 1
+
+        logger.info("External account index synced: %s, %s accounts", counts, len(self))
+        return counts
+
+    # Queries
+
+    def find_duplicate(self, account_data: ExternalAccountRequest) -> Optional[Dict[str, Any]]:
+        """Find an active account with the same bank name, last 4 digits and owner"""
+        account_id = self._by_fingerprint.get(request_fingerprint(account_data))
+        return self._accounts.get(account_id) if account_id else None
+
+    def get(self, account_id: str) -> Optional[Dict[str, Any]]:
+        """Get an indexed account by ID"""
+        return self._accounts.get(account_id)
+
+    def find(self, customer_id: str, last_4: Optional[str] = None, bank_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Find active accounts of a customer
+
+        Args:
+            customer_id: Customer ID
+            last_4: Optional last 4 digits of the account number
+            bank_name: Optional bank name (case-insensitive)
+
+        Returns:
+            Matching account records
+        """
+        matches = []
+        for account_id in self._by_customer.get(customer_id, {}):
+            record = self._accounts[account_id]
+            if not record.get('active', True):
+                continue
+            if last_4 and str(record.get('last_4', '')) != last_4:
+                continue
+            if bank_name and _normalize(record.get('bank_name')) != _normalize(bank_name):
+                continue
+            matches.append(record)
+        return matches
+
+    def resolve(self, customer_id: str, last_4: str, bank_name: Optional[str] = None) -> str:
+        """
+        Resolve an external account ID without calling the API
+
+        Raises:
+            LookupError: If no account or more than one account matches
+        """
+        matches = self.find(customer_id, last_4=last_4, bank_name=bank_name)
+        if not matches:
+            raise LookupError(f"No indexed external account ending in {last_4} for customer {customer_id}")
+        if len(matches) > 1:
+            banks = ', '.join(sorted({m.get('bank_name', '') for m in matches}))
+            raise LookupError(f"Multiple external accounts ending in {last_4} for customer {customer_id} ({banks})")
+        return matches[0]['id']
+
+    @staticmethod
+    def _fingerprint(record: Dict[str, Any]) -> Fingerprint:
+        return account_fingerprint(record.get('bank_name', ''), record.get('last_4', ''), record.get('account_owner_name', ''))
+
+    # Persistence
+
+    @classmethod
+    def load(cls, path: str) -> 'ExternalAccountIndex':
+        """Load an index from disk, or return an empty one if the file does not exist"""
+        index = cls(path)
+        if not os.path.exists(path):
+            return index
+
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+        for record in payload.get('accounts', []):
+            index.add(record)
+        index._customer_synced_at = payload.get('customer_synced_at', {})
+        logger.info("Loaded external account index with %s accounts from %s", len(index), path)
+        return index
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Write the index to disk atomically"""
+        path = path or self.path
+        if not path:
+            raise ValueError("No path given for external account index")
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(
+                {'accounts': list(self._accounts.values()), 'customer_synced_at': self._customer_synced_at},
+                f,
+                separators=(',', ':')
+            )
+        os.replace(tmp_path, path)
@@ -5,108 +5,162 @@ Handles external account management including bank accounts and crypto wallets
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, TYPE_CHECKING
 
 from bridge_client import BridgeClient, BridgeAPIError
 from models import ExternalAccount, ExternalAccountRequest
+from utils.deadline import Deadline
 from utils.logger import setup_logger
+from utils.pagination import iter_items
+from utils.tracing import build_model
+
+if TYPE_CHECKING:
+    from services.external_account_index import ExternalAccountIndex
 
 logger = setup_logger(__name__)
 
 class ExternalAccountService:
     """Service for external account operations"""
     
-    def __init__(self, client: BridgeClient):
+    def __init__(self, client: BridgeClient, index: Optional['ExternalAccountIndex'] = None):
         self.client = client
+        self.index = index
+    
+    def _track(self, account: ExternalAccount) -> ExternalAccount:
+        """Keep the attached account index up to date with a fetched account"""
+        if self.index is not None:
+            self.index.add(account)
+        return account
     
-    def create_external_account(self, customer_id: str, account_data: ExternalAccountRequest) -> ExternalAccount:
-        """Create a new external account for customer"""
+    def create_external_account(
+        self,
+        customer_id: str,
+        account_data: ExternalAccountRequest,
+        check_duplicates: bool = False,
+        idempotency_key: Optional[str] = None,
+        deadline: Optional[Deadline] = None
+    ) -> ExternalAccount:
+        """
+        Create a new external account for customer
+        
+        With ``check_duplicates`` and an attached index, an existing active account with
+        the same bank name, last 4 digits and owner is returned instead of creating one.
+        """
+        if check_duplicates and self.index is not None:
+            existing = self.index.find_duplicate(account_data)
+            if existing is not None:
+                logger.warning("External account %s already exists for %s, skipping creation", existing['id'], account_data.account_owner_name)
+                return ExternalAccount(**existing)
+        
         try:
-            response = self.client.post(f'/v0/customers/{customer_id}/external_accounts', account_data.dict())
-            logger.info(f"External account created successfully for customer {customer_id}")
-            return ExternalAccount(**response)
+            response = self.client.post(
+                f'/v0/customers/{customer_id}/external_accounts',
+                account_data.dict(),
+                idempotency_key=idempotency_key,
+                deadline=deadline
+            )
+            logger.info("External account created successfully for customer %s", customer_id)
+            return self._track(build_model(ExternalAccount, response))
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to create external account for customer {customer_id}: {e}")
+            logger.error("Failed to create external account for customer %s: %s", customer_id, e)
             raise
     
-    def get_external_account(self, customer_id: str, account_id: str) -> ExternalAccount:
+    def get_external_account(self, customer_id: str, account_id: str, deadline: Optional[Deadline] = None) -> ExternalAccount:
         """Get external account by ID"""
         try:
-            response = self.client.get(f'/v0/customers/{customer_id}/external_accounts/{account_id}')
-            logger.info(f"Retrieved external account: {account_id}")
-            return ExternalAccount(**response)
+            response = self.client.get(f'/v0/customers/{customer_id}/external_accounts/{account_id}', deadline=deadline)
+            logger.info("Retrieved external account: %s", account_id)
+            return self._track(build_model(ExternalAccount, response))
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to get external account {account_id}: {e}")
+            logger.error("Failed to get external account %s: %s", account_id, e)
             raise
     
-    def list_external_accounts(self, customer_id: str, limit: int = 100, cursor: Optional[str] = None) -> Dict[str, Any]:
+    def list_external_accounts(
+        self, customer_id: str, limit: int = 100, cursor: Optional[str] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
         """List external accounts for customer"""
         try:
             params = {'limit': limit}
             if cursor:
                 params['cursor'] = cursor
             
-            response = self.client.get(f'/v0/customers/{customer_id}/external_accounts', params=params)
-            logger.info(f"Listed {len(response.get('data', []))} external accounts for customer {customer_id}")
+            response = self.client.get(f'/v0/customers/{customer_id}/external_accounts', params=params, deadline=deadline)
+            logger.info("Listed %s external accounts for customer %s", len(response.get('data', [])), customer_id)
             return response
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to list external accounts for customer {customer_id}: {e}")
+            logger.error("Failed to list external accounts for customer %s: %s", customer_id, e)
             raise
     
-    def update_external_account(self, customer_id: str, account_id: str, update_data: Dict[str, Any]) -> ExternalAccount:
+    def iter_external_accounts(self, customer_id: str, page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Stream all external accounts of a customer, fetching one page at a time"""
+        return iter_items(
+            lambda **kwargs: self.list_external_accounts(customer_id, **kwargs),
+            limit=page_size
+        )
+    
+    def update_external_account(
+        self, customer_id: str, account_id: str, update_data: Dict[str, Any],
+        deadline: Optional[Deadline] = None
+    ) -> ExternalAccount:
         """Update external account information"""
         try:
-            response = self.client.patch(f'/v0/customers/{customer_id}/external_accounts/{account_id}', update_data)
-            logger.info(f"External account {account_id} updated successfully")
-            return ExternalAccount(**response)
+            response = self.client.patch(f'/v0/customers/{customer_id}/external_accounts/{account_id}', update_data, deadline=deadline)
+            logger.info("External account %s updated successfully", account_id)
+            return self._track(build_model(ExternalAccount, response))
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to update external account {account_id}: {e}")
+            logger.error("Failed to update external account %s: %s", account_id, e)
             raise
     
-    def delete_external_account(self, customer_id: str, account_id: str) -> Dict[str, Any]:
+    def delete_external_account(self, customer_id: str, account_id: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """Delete external account"""
         try:
-            response = self.client.delete(f'/v0/customers/{customer_id}/external_accounts/{account_id}')
-            logger.info(f"External account {account_id} deleted successfully")
+            response = self.client.delete(f'/v0/customers/{customer_id}/external_accounts/{account_id}', deadline=deadline)
+            logger.info("External account %s deleted successfully", account_id)
+            if self.index is not None:
+                self.index.remove(account_id)
             return response
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to delete external account {account_id}: {e}")
+            logger.error("Failed to delete external account %s: %s", account_id, e)
             raise
     
-    def verify_external_account(self, customer_id: str, account_id: str, verification_data: Dict[str, Any]) -> Dict[str, Any]:
+    def verify_external_account(
+        self, customer_id: str, account_id: str, verification_data: Dict[str, Any],
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
         """Verify external account with micro-deposits"""
         try:
-            response = self.client.post(f'/v0/customers/{customer_id}/external_accounts/{account_id}/verify', verification_data)
-            logger.info(f"External account {account_id} verification initiated")
+            response = self.client.post(f'/v0/customers/{customer_id}/external_accounts/{account_id}/verify', verification_data, deadline=deadline)
+            logger.info("External account %s verification initiated", account_id)
             return response
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to verify external account {account_id}: {e}")
+            logger.error("Failed to verify external account %s: %s", account_id, e)
             raise
     
-    def get_plaid_link_token(self, customer_id: str) -> Dict[str, Any]:
+    def get_plaid_link_token(self, customer_id: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """Get Plaid link token for account connection"""
         try:
-            response = self.client.post(f'/v0/customers/{customer_id}/plaid_link_token', {})
-            logger.info(f"Plaid link token created for customer {customer_id}")
+            response = self.client.post(f'/v0/customers/{customer_id}/plaid_link_token', {}, deadline=deadline)
+            logger.info("Plaid link token created for customer %s", customer_id)
             return response
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to create Plaid link token for customer {customer_id}: {e}")
+            logger.error("Failed to create Plaid link token for customer %s: %s", customer_id, e)
             raise
     
-    def connect_plaid_account(self, customer_id: str, plaid_data: Dict[str, Any]) -> Dict[str, Any]:
+    def connect_plaid_account(self, customer_id: str, plaid_data: Dict[str, Any], deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """Connect external account via Plaid"""
         try:
-            response = self.client.post(f'/v0/customers/{customer_id}/plaid_accounts', plaid_data)
-            logger.info(f"Plaid account connected for customer {customer_id}")
+            response = self.client.post(f'/v0/customers/{customer_id}/plaid_accounts', plaid_data, deadline=deadline)
+            logger.info("Plaid account connected for customer %s", customer_id)
             return response
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to connect Plaid account for customer {customer_id}: {e}")
+            logger.error("Failed to connect Plaid account for customer %s: %s", customer_id, e)
             raise
@@ -0,0 +1,127 @@
+"""
+Portfolio service for Bridge API
+
+Aggregates wallet balances per customer and currency, fetching balances
+concurrently with a short-lived cache
+"""
+
+from concurrent.futures import ThreadPoolExecutor, ALL_COMPLETED, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from services.wallets import WalletService
+from utils.cache import TTLCache
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+@dataclass
+class PortfolioSummary:
+    """Exact balance totals grouped by customer and currency"""
+
+    by_customer: Dict[str, Dict[str, Decimal]] = field(default_factory=dict)
+    by_currency: Dict[str, Decimal] = field(default_factory=dict)
+    wallets: int = 0
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    def add(self, customer_id: str, currency: str, amount: Decimal) -> None:
+        customer_totals = self.by_customer.setdefault(customer_id, {})
+        customer_totals[currency] = customer_totals.get(currency, Decimal('0')) + amount
+        self.by_currency[currency] = self.by_currency.get(currency, Decimal('0')) + amount
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly representation; amounts are rendered as exact decimal strings"""
+        return {
+            'wallets': self.wallets,
+            'by_currency': {currency: str(amount) for currency, amount in sorted(self.by_currency.items())},
+            'by_customer': {
+                customer_id: {currency: str(amount) for currency, amount in sorted(totals.items())}
+                for customer_id, totals in sorted(self.by_customer.items())
+            },
+            'errors': self.errors
+        }
+
+def _to_decimal(value: Any) -> Decimal:
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"Invalid balance amount: {value!r}")
+
+def balance_entries(wallet: Dict[str, Any], response: Dict[str, Any]) -> List[Tuple[str, Decimal]]:
+    """
+    Extract (currency, amount) pairs from a wallet balance response
+
+    Handles both a single balance (``{"balance": "1.5", "currency": "usdc"}``) and a
+    list of balances (``{"balances": [{"currency": ..., "balance": ...}]}``), falling
+    back to the wallet's own currency.
+    """
+    default_currency = str(response.get('currency') or wallet.get('currency') or 'unknown')
+
+    balances = response.get('balances')
+    if isinstance(balances, list):
+        return [
+            (str(entry.get('currency') or default_currency), _to_decimal(entry.get('balance', entry.get('amount', '0'))))
+            for entry in balances
+        ]
+
+    amount = response.get('balance', response.get('available_balance', response.get('amount')))
+    if amount is None:
+        amount = wallet.get('balance', '0')
+    return [(default_currency, _to_decimal(amount))]
+
+class PortfolioService:
+    """Service for aggregating wallet balances"""
+
+    def __init__(self, wallet_service: WalletService, max_workers: int = 32, cache_ttl: float = 30.0):
+        self.wallet_service = wallet_service
+        self.max_workers = max_workers
+        self.balance_cache = TTLCache(ttl=cache_ttl)
+
+    def get_balance(self, wallet_id: str) -> Dict[str, Any]:
+        """Get a wallet balance, served from the short-lived cache when fresh"""
+        return self.balance_cache.get_or_load(wallet_id, lambda: self.wallet_service.get_wallet_balance(wallet_id))
+
+    def summarize(self, wallets: Optional[Iterable[Dict[str, Any]]] = None, customer_id: Optional[str] = None) -> PortfolioSummary:
+        """
+        Sum wallet balances by customer and currency
+
+        Args:
+            wallets: Wallets to include (default: all wallets, streamed from the API)
+            customer_id: Only include wallets of this customer when listing from the API
+
+        Returns:
+            Portfolio summary with exact decimal totals
+        """
+        if wallets is None:
+            wallets = self.wallet_service.iter_wallets(customer_id=customer_id)
+
+        summary = PortfolioSummary()
+
+        # Open the workers' connections up front rather than one handshake per worker
+        self.wallet_service.client.warmup(self.max_workers)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending: Dict[Any, Dict[str, Any]] = {}
+
+            def drain(return_when) -> None:
+                done, _ = wait(pending, return_when=return_when)
+                for future in done:
+                    wallet = pending.pop(future)
+                    try:
+                        for currency, amount in balance_entries(wallet, future.result()):
+                            summary.add(wallet.get('customer_id', 'unknown'), currency, amount)
+                    except Exception as e:
+                        summary.errors[wallet['id']] = str(e)
+
+            for wallet in wallets:
+                summary.wallets += 1
+                # Keep a bounded window of in-flight balance reads while wallets stream in
+                if len(pending) >= self.max_workers * 2:
+                    drain(FIRST_COMPLETED)
+                pending[executor.submit(self.get_balance, wallet['id'])] = wallet
+
+            if pending:
+                drain(ALL_COMPLETED)
+
+        logger.info("Summarized %s wallets across %s customers (%s errors)", summary.wallets, len(summary.by_customer), len(summary.errors))
+        return summary
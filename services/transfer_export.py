@@ -0,0 +1,428 @@
+"""
+Transfer export for Bridge API
+
+Streams the paginated transfer feed into day-partitioned files for a warehouse:
+
+    <output_dir>/date=YYYY-MM-DD/transfers-<run>.parquet|csv|ndjson
+
+Nested source/destination fields are flattened into columns (fields the models
+do not know go to a JSON ``extra`` column), Parquet output is written in row
+groups with typed columns (decimal amounts, UTC timestamps), and a state file in the output directory records the newest exported
+transfer so each run only downloads what is new.
+
+Transfers that were not final when exported (pending, processing) are exported
+again, as a new row in their day's partition, once their updated_at changes;
+readers keep the row with the latest updated_at per id. A full export replaces
+every file of the previous ones.
+"""
+
+import csv
+import json
+import os
+from collections import OrderedDict
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from models import Transfer, TransferDestination, TransferSource, TransferStatus
+from services.transfers import TransferService
+from utils.logger import setup_logger
+from utils.pagination import iter_pages
+
+logger = setup_logger(__name__)
+
+EXPORT_FORMATS = ('parquet', 'csv', 'ndjson')
+STATE_FILE = '_export_state.json'
+
+# Statuses after which a transfer no longer changes; others are re-exported on change
+FINAL_STATUSES = frozenset(status.value for status in (TransferStatus.COMPLETED, TransferStatus.FAILED, TransferStatus.CANCELLED))
+
+# Flat columns of the model fields, in model order
+MODEL_COLUMNS: List[str] = (
+    [name for name in Transfer.model_fields if name not in ('source', 'destination')]
+    + [f"source_{name}" for name in TransferSource.model_fields]
+    + [f"destination_{name}" for name in TransferDestination.model_fields]
+)
+_MODEL_COLUMNS = frozenset(MODEL_COLUMNS)
+
+# Every file has the same columns; API fields without a model column are kept in 'extra'
+TRANSFER_COLUMNS: List[str] = MODEL_COLUMNS + ['extra']
+
+# Columns Parquet stores with a type other than string
+TIMESTAMP_COLUMNS = frozenset(name for name, field in Transfer.model_fields.items() if field.annotation is datetime)
+DECIMAL_COLUMNS = frozenset({'amount'})
+DECIMAL_PRECISION, DECIMAL_SCALE = 38, 18  # room for 18-decimal token amounts
+
+def flatten(record: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+    """Flatten nested dicts into prefix_key columns; lists are kept as JSON strings"""
+    flat: Dict[str, Any] = {}
+    for key, value in record.items():
+        column = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{column}_"))
+        elif isinstance(value, list):
+            flat[column] = json.dumps(value, separators=(',', ':'))
+        else:
+            flat[column] = value
+    return flat
+
+def to_row(transfer: Dict[str, Any]) -> Dict[str, Any]:
+    """Flattened transfer, with the columns outside MODEL_COLUMNS as a JSON object in 'extra'"""
+    row = flatten(transfer)
+    extra = {column: row.pop(column) for column in [column for column in row if column not in _MODEL_COLUMNS]}
+    row['extra'] = json.dumps(extra, separators=(',', ':'), sort_keys=True, default=str) if extra else None
+    return row
+
+def _day(transfer: Dict[str, Any]) -> str:
+    """Day (YYYY-MM-DD) partition a transfer belongs to"""
+    return str(transfer.get('created_at') or '')[:10] or 'unknown'
+
+def _cell(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+def _timestamp(value: Any) -> Optional[datetime]:
+    """ISO 8601 timestamp as an aware UTC datetime (naive ones are taken as UTC)"""
+    if value is None or value == '':
+        return None
+    parsed = value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+    return parsed.replace(tzinfo=timezone.utc) if parsed.tzinfo is None else parsed.astimezone(timezone.utc)
+
+def _decimal(value: Any) -> Optional[Decimal]:
+    if value is None or value == '':
+        return None
+    return Decimal(str(value))
+
+class PartitionWriter:
+    """Writes the rows of one partition file to a temporary path until committed"""
+
+    extension = ''
+
+    def __init__(self, path: str, columns: List[str]):
+        self.path = path
+        self.tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+        self.columns = columns
+        self.rows = 0
+
+    def write(self, row: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        raise NotImplementedError
+
+class NDJSONPartitionWriter(PartitionWriter):
+    extension = 'ndjson'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._file = open(self.tmp_path, 'w', encoding='utf-8', buffering=1024 * 1024)
+
+    def write(self, row: Dict[str, Any]) -> None:
+        self._file.write(json.dumps({column: row.get(column) for column in self.columns}, separators=(',', ':'), default=str) + '\n')
+        self.rows += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+class CSVPartitionWriter(PartitionWriter):
+    extension = 'csv'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._file = open(self.tmp_path, 'w', encoding='utf-8', newline='', buffering=1024 * 1024)
+        self._csv = csv.writer(self._file)
+        self._csv.writerow(self.columns)
+
+    def write(self, row: Dict[str, Any]) -> None:
+        self._csv.writerow(['' if row.get(column) is None else row.get(column) for column in self.columns])
+        self.rows += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+class ParquetPartitionWriter(PartitionWriter):
+    """
+    Buffers rows column-wise and writes them as Parquet row groups (requires pyarrow)
+
+    TIMESTAMP_COLUMNS are stored as UTC timestamps, DECIMAL_COLUMNS as decimals and
+    everything else as strings.
+    """
+
+    extension = 'parquet'
+
+    @staticmethod
+    def require_pyarrow():
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export requires pyarrow (pip install '.[parquet]'), or use --format csv/ndjson")
+        return pa, pq
+
+    def __init__(self, *args, row_group_size: int = 50000, **kwargs):
+        super().__init__(*args, **kwargs)
+        pa, pq = self.require_pyarrow()
+        self._pa = pa
+        self._schema = pa.schema([(column, self._type(column)) for column in self.columns])
+        self._writer = pq.ParquetWriter(self.tmp_path, self._schema, compression='snappy')
+        self.row_group_size = row_group_size
+        self._converters = {column: self._converter(column) for column in self.columns}
+        self._buffer: Dict[str, List[Any]] = {column: [] for column in self.columns}
+        self._buffered = 0
+
+    def _type(self, column: str):
+        if column in TIMESTAMP_COLUMNS:
+            return self._pa.timestamp('us', tz='UTC')
+        if column in DECIMAL_COLUMNS:
+            return self._pa.decimal128(DECIMAL_PRECISION, DECIMAL_SCALE)
+        return self._pa.string()
+
+    @staticmethod
+    def _converter(column: str):
+        if column in TIMESTAMP_COLUMNS:
+            return _timestamp
+        if column in DECIMAL_COLUMNS:
+            return _decimal
+        return _cell
+
+    def write(self, row: Dict[str, Any]) -> None:
+        for column in self.columns:
+            self._buffer[column].append(self._converters[column](row.get(column)))
+        self._buffered += 1
+        self.rows += 1
+        if self._buffered >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._buffered:
+            self._writer.write_table(self._pa.Table.from_pydict(self._buffer, schema=self._schema))
+            self._buffer = {column: [] for column in self.columns}
+            self._buffered = 0
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+WRITERS = {
+    'parquet': ParquetPartitionWriter,
+    'csv': CSVPartitionWriter,
+    'ndjson': NDJSONPartitionWriter
+}
+
+class TransferExporter:
+    """Incremental, day-partitioned export of the transfer feed"""
+
+    def __init__(
+        self,
+        transfer_service: TransferService,
+        output_dir: str,
+        export_format: str = 'csv',
+        row_group_size: int = 50000,
+        max_open_partitions: int = 8
+    ):
+        """
+        Args:
+            transfer_service: Service used to page through transfers
+            output_dir: Root directory of the partitioned export
+            export_format: One of EXPORT_FORMATS
+            row_group_size: Rows buffered per Parquet row group
+            max_open_partitions: Partition files kept open at once; the feed is
+                ordered by time, so older partitions are closed as it moves on
+        """
+        if export_format not in WRITERS:
+            raise ValueError(f"Unsupported export format: {export_format}")
+        if export_format == 'parquet':
+            ParquetPartitionWriter.require_pyarrow()
+        self.transfer_service = transfer_service
+        self.output_dir = output_dir
+        self.export_format = export_format
+        self.row_group_size = row_group_size
+        self.max_open_partitions = max_open_partitions
+        self.state_path = os.path.join(output_dir, STATE_FILE)
+        os.makedirs(output_dir, exist_ok=True)
+
+    def load_state(self) -> Dict[str, Any]:
+        """High-water mark of the last successful export ({} if none)"""
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def _open(self, day: str, run_id: str, part: int) -> PartitionWriter:
+        directory = os.path.join(self.output_dir, f"date={day}")
+        os.makedirs(directory, exist_ok=True)
+        writer_class = WRITERS[self.export_format]
+        while True:
+            suffix = f"-{part}" if part else ''
+            path = os.path.join(directory, f"transfers-{run_id}{suffix}.{writer_class.extension}")
+            if not os.path.exists(path):
+                break
+            part += 1
+        if writer_class is ParquetPartitionWriter:
+            return writer_class(path, TRANSFER_COLUMNS, row_group_size=self.row_group_size)
+        return writer_class(path, TRANSFER_COLUMNS)
+
+    def _changed_transfers(
+        self, state: Dict[str, Any], page_size: int, customer_id: Optional[str], seen_open: set
+    ) -> Iterable[Dict[str, Any]]:
+        """
+        Transfers newer than the high-water mark, and open ones updated since exported
+
+        The feed is read newest first, stopping at the first transfer at or below
+        the mark once every open transfer (see FINAL_STATUSES) has been passed, so
+        only new pages and those back to the oldest open transfer are downloaded.
+        IDs of the open transfers met are added to seen_open.
+        """
+        mark = state.get('high_water_mark')
+        mark_ids = set(state.get('high_water_ids', []))
+        open_transfers: Dict[str, Dict[str, str]] = state.get('open_transfers', {})
+        unseen = set(open_transfers)
+        oldest_open = lambda: min(open_transfers[open_id]['created_at'] for open_id in unseen)
+        stop_at = oldest_open() if unseen else None
+        fetch_page = lambda **kwargs: self.transfer_service.list_transfers(customer_id=customer_id, **kwargs)
+
+        for page in iter_pages(fetch_page, limit=page_size):
+            for transfer in page.get('data', []):
+                created_at = str(transfer.get('created_at') or '')
+                transfer_id = transfer.get('id')
+                if not mark or created_at > mark or (created_at == mark and transfer_id not in mark_ids):
+                    yield transfer
+                    continue
+                if transfer_id in unseen:
+                    unseen.discard(transfer_id)
+                    seen_open.add(transfer_id)
+                    if str(transfer.get('updated_at') or '') != open_transfers[transfer_id]['updated_at']:
+                        yield transfer
+                    if not unseen:
+                        return
+                    stop_at = oldest_open()
+                if stop_at is None or created_at < stop_at:
+                    return  # past the mark and every open transfer (the missing ones left the feed)
+
+    def run(self, page_size: int = 100, full: bool = False, customer_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Export transfers created since the last run
+
+        Files are written under temporary names and only renamed into place,
+        together with the new state, once the whole run succeeds; a failed run
+        leaves the previous export untouched and is simply retried.
+
+        Args:
+            page_size: Transfers fetched per API request
+            full: Ignore the saved state and export the whole feed
+            customer_id: Only export transfers of this customer
+
+        Returns:
+            Summary with exported row count, per-day counts and written files
+        """
+        state = {} if full else self.load_state()
+        if state and state.get('customer_id') != customer_id:
+            raise ValueError(f"{self.output_dir} holds an export for customer {state.get('customer_id') or '(all)'}; use another directory or --full")
+        if state and state.get('format', self.export_format) != self.export_format:
+            raise ValueError(f"{self.output_dir} holds a {state['format']} export; use --format {state['format']}, another directory or --full")
+        run_id = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+        open_transfers: Dict[str, Dict[str, str]] = dict(state.get('open_transfers', {}))
+        seen_open: set = set()
+        open_writers: 'OrderedDict[str, PartitionWriter]' = OrderedDict()
+        finished: List[PartitionWriter] = []
+        parts: Dict[str, int] = {}
+        days: Dict[str, int] = {}
+        newest: Tuple[str, List[str]] = (state.get('high_water_mark') or '', [])
+        exported = 0
+
+        try:
+            for transfer in self._changed_transfers(state, page_size, customer_id, seen_open):
+                day = _day(transfer)
+                writer = open_writers.get(day)
+                if writer is None:
+                    if len(open_writers) >= self.max_open_partitions:
+                        _, evicted = open_writers.popitem(last=False)
+                        evicted.close()
+                        finished.append(evicted)
+                    writer = self._open(day, run_id, parts.get(day, 0))
+                    parts[day] = parts.get(day, 0) + 1
+                    open_writers[day] = writer
+                else:
+                    open_writers.move_to_end(day)
+
+                writer.write(to_row(transfer))
+                days[day] = days.get(day, 0) + 1
+                exported += 1
+
+                transfer_id = transfer.get('id')
+                seen_open.add(transfer_id)
+                if transfer.get('status') in FINAL_STATUSES:
+                    open_transfers.pop(transfer_id, None)
+                else:
+                    open_transfers[transfer_id] = {
+                        'created_at': str(transfer.get('created_at') or ''),
+                        'updated_at': str(transfer.get('updated_at') or '')
+                    }
+
+                created_at = str(transfer.get('created_at') or '')
+                if created_at > newest[0]:
+                    newest = (created_at, [transfer_id])
+                elif created_at == newest[0] and transfer_id not in newest[1]:
+                    newest[1].append(transfer_id)
+
+            for writer in open_writers.values():
+                writer.close()
+                finished.append(writer)
+            open_writers.clear()
+        except BaseException:
+            for writer in open_writers.values():
+                writer.close()
+            for writer in list(open_writers.values()) + finished:
+                if os.path.exists(writer.tmp_path):
+                    os.remove(writer.tmp_path)
+            raise
+
+        for writer in finished:
+            os.replace(writer.tmp_path, writer.path)
+        if full:
+            self._remove_previous(finished)
+
+        # Open transfers no longer in the feed are not looked for again
+        open_transfers = {transfer_id: seen for transfer_id, seen in open_transfers.items() if transfer_id in seen_open}
+        if exported or full or open_transfers != state.get('open_transfers', {}):
+            mark_ids = newest[1]
+            if newest[0] == state.get('high_water_mark'):
+                mark_ids = sorted(set(mark_ids) | set(state.get('high_water_ids', [])))
+            state = {
+                'high_water_mark': newest[0] or None,
+                'high_water_ids': mark_ids,
+                'open_transfers': open_transfers,
+                'customer_id': customer_id,
+                'format': self.export_format,
+                'last_run': run_id
+            }
+            self._save_state(state)
+
+        logger.info("Exported %s transfers into %s files under %s", exported, len(finished), self.output_dir)
+        return {
+            'exported': exported,
+            'days': dict(sorted(days.items())),
+            'files': [writer.path for writer in finished],
+            'high_water_mark': state.get('high_water_mark'),
+            'open': len(state.get('open_transfers', {}))
+        }
+
+    def _remove_previous(self, keep: List[PartitionWriter]) -> None:
+        """Delete the files of earlier exports after a full one has replaced them"""
+        kept = {writer.path for writer in keep}
+        extensions = tuple(f".{writer_class.extension}" for writer_class in WRITERS.values())
+        for entry in os.scandir(self.output_dir):
+            if not (entry.is_dir() and entry.name.startswith('date=')):
+                continue
+            for name in os.listdir(entry.path):
+                path = os.path.join(entry.path, name)
+                if name.startswith('transfers-') and name.endswith(extensions) and path not in kept:
+                    os.remove(path)
+            if not os.listdir(entry.path):
+                os.rmdir(entry.path)
@@ -5,11 +5,15 @@ Handles transfer operations including fiat-to-crypto, crypto-to-fiat, and crypto
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 
 from bridge_client import BridgeClient, BridgeAPIError
 from models import Transfer, TransferRequest
+from utils.deadline import Deadline
+from utils.jsonstream import StreamedPage
 from utils.logger import setup_logger
+from utils.pagination import iter_items
+from utils.tracing import build_model
 
 logger = setup_logger(__name__)
 
@@ -19,29 +23,32 @@ class TransferService:
     def __init__(self, client: BridgeClient):
         self.client = client
     
-    def create_transfer(self, transfer_data: TransferRequest) -> Transfer:
+    def create_transfer(self, transfer_data: TransferRequest, deadline: Optional[Deadline] = None) -> Transfer:
         """Create a new transfer"""
         try:
-            response = self.client.post('/v0/transfers', transfer_data.dict())
-            logger.info(f"Transfer created successfully with ID: {response.get('id')}")
-            return Transfer(**response)
+            response = self.client.post('/v0/transfers', transfer_data.dict(), deadline=deadline)
+            logger.info("Transfer created successfully with ID: %s", response.get('id'))
+            return build_model(Transfer, response)
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to create transfer: {e}")
+            logger.error("Failed to create transfer: %s", e)
             raise
     
-    def get_transfer(self, transfer_id: str) -> Transfer:
+    def get_transfer(self, transfer_id: str, deadline: Optional[Deadline] = None) -> Transfer:
         """Get transfer by ID"""
         try:
-            response = self.client.get(f'/v0/transfers/{transfer_id}')
-            logger.info(f"Retrieved transfer: {transfer_id}")
-            return Transfer(**response)
+            response = self.client.get(f'/v0/transfers/{transfer_id}', deadline=deadline)
+            logger.info("Retrieved transfer: %s", transfer_id)
+            return build_model(Transfer, response)
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to get transfer {transfer_id}: {e}")
+            logger.error("Failed to get transfer %s: %s", transfer_id, e)
             raise
     
-    def list_transfers(self, limit: int = 100, cursor: Optional[str] = None, customer_id: Optional[str] = None) -> Dict[str, Any]:
+    def list_transfers(
+        self, limit: int = 100, cursor: Optional[str] = None, customer_id: Optional[str] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
         """List transfers with pagination"""
         try:
             params = {'limit': limit}
@@ -50,48 +57,77 @@ class TransferService:
             if customer_id:
                 params['customer_id'] = customer_id
             
-            response = self.client.get('/v0/transfers', params=params)
-            logger.info(f"Listed {len(response.get('data', []))} transfers")
+            response = self.client.get('/v0/transfers', params=params, deadline=deadline)
+            logger.info("Listed %s transfers", len(response.get('data', [])))
             return response
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to list transfers: {e}")
+            logger.error("Failed to list transfers: %s", e)
             raise
     
-    def cancel_transfer(self, transfer_id: str) -> Dict[str, Any]:
+    def stream_transfers(
+        self, limit: int = 100, cursor: Optional[str] = None, customer_id: Optional[str] = None,
+        deadline: Optional[Deadline] = None
+    ) -> StreamedPage:
+        """List transfers with pagination, decoding them one by one as the page arrives"""
+        try:
+            params = {'limit': limit}
+            if cursor:
+                params['cursor'] = cursor
+            if customer_id:
+                params['customer_id'] = customer_id
+            
+            return self.client.get_stream('/v0/transfers', params=params, deadline=deadline)
+            
+        except BridgeAPIError as e:
+            logger.error("Failed to list transfers: %s", e)
+            raise
+    
+    def iter_transfers(self, customer_id: Optional[str] = None, page_size: int = 100, stream: bool = False) -> Iterator[Dict[str, Any]]:
+        """Stream all transfers, fetching one page at a time (stream: decoding each page incrementally)"""
+        fetch_page = self.stream_transfers if stream else self.list_transfers
+        return iter_items(
+            lambda **kwargs: fetch_page(customer_id=customer_id, **kwargs),
+            limit=page_size
+        )
+    
+    def cancel_transfer(self, transfer_id: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """Cancel a pending transfer"""
         try:
-            response = self.client.post(f'/v0/transfers/{transfer_id}/cancel', {})
-            logger.info(f"Transfer {transfer_id} cancelled successfully")
+            response = self.client.post(f'/v0/transfers/{transfer_id}/cancel', {}, deadline=deadline)
+            logger.info("Transfer %s cancelled successfully", transfer_id)
             return response
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to cancel transfer {transfer_id}: {e}")
+            logger.error("Failed to cancel transfer %s: %s", transfer_id, e)
             raise
     
-    def get_transfer_receipt(self, transfer_id: str) -> Dict[str, Any]:
+    def get_transfer_receipt(self, transfer_id: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """Get transfer receipt"""
         try:
-            response = self.client.get(f'/v0/transfers/{transfer_id}/receipt')
-            logger.info(f"Retrieved receipt for transfer: {transfer_id}")
+            response = self.client.get(f'/v0/transfers/{transfer_id}/receipt', deadline=deadline)
+            logger.info("Retrieved receipt for transfer: %s", transfer_id)
             return response
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to get receipt for transfer {transfer_id}: {e}")
+            logger.error("Failed to get receipt for transfer %s: %s", transfer_id, e)
             raise
     
-    def estimate_transfer_fee(self, transfer_data: Dict[str, Any]) -> Dict[str, Any]:
+    def estimate_transfer_fee(self, transfer_data: Dict[str, Any], deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """Estimate transfer fee"""
         try:
-            response = self.client.post('/v0/transfers/estimate_fee', transfer_data)
+            response = self.client.post('/v0/transfers/estimate_fee', transfer_data, deadline=deadline)
             logger.info("Transfer fee estimated successfully")
             return response
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to estimate transfer fee: {e}")
+            logger.error("Failed to estimate transfer fee: %s", e)
             raise
     
-    def get_quote(self, source_currency: str, destination_currency: str, amount: str) -> Dict[str, Any]:
+    def get_quote(
+        self, source_currency: str, destination_currency: str, amount: str,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
         """Get exchange rate quote"""
         try:
             params = {
@@ -99,10 +135,10 @@ class TransferService:
                 'destination_currency': destination_currency,
                 'amount': amount
             }
-            response = self.client.get('/v0/quotes', params=params)
-            logger.info(f"Quote retrieved for {source_currency} to {destination_currency}")
+            response = self.client.get('/v0/quotes', params=params, deadline=deadline)
+            logger.info("Quote retrieved for %s to %s", source_currency, destination_currency)
             return response
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to get quote: {e}")
+            logger.error("Failed to get quote: %s", e)
             raise
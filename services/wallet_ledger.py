@@ -0,0 +1,278 @@
+"""
+Wallet transaction ledger for Bridge API
+
+Incrementally syncs a wallet's transaction history into a compact append-only
+log on disk, with a side index (transaction ID -> offset, day -> offset range).
+Reads go through mmap so long histories can be queried without loading them.
+
+A sync appends each page as it arrives. The API returns newest first, so the
+log is not in time order; the index keeps the runs of records (one per page,
+oldest first within it) in time order for replay.
+"""
+
+import json
+import mmap
+import os
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from services.wallets import WalletService
+from utils.logger import setup_logger
+from utils.pagination import iter_pages
+
+logger = setup_logger(__name__)
+
+def _day(transaction: Dict[str, Any]) -> str:
+    """Day (YYYY-MM-DD) a transaction belongs to"""
+    return str(transaction.get('created_at') or '')[:10] or 'unknown'
+
+class WalletLedger:
+    """Append-only transaction log for one wallet"""
+
+    def __init__(self, directory: str, wallet_id: str):
+        self.wallet_id = wallet_id
+        self.log_path = os.path.join(directory, f"{wallet_id}.log")
+        self.index_path = os.path.join(directory, f"{wallet_id}.idx")
+        self.sync_path = os.path.join(directory, f"{wallet_id}.sync")
+        os.makedirs(directory, exist_ok=True)
+
+        self._ids: Dict[str, int] = {}
+        self._days: Dict[str, List[int]] = {}
+        self._runs: List[List[int]] = []  # [start, end) byte ranges, in time order
+        self._size = 0
+        self._load_index()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, transaction_id: str) -> bool:
+        return transaction_id in self._ids
+
+    # Index maintenance
+
+    def _load_index(self) -> None:
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            self._ids = index.get('ids', {})
+            self._days = index.get('days', {})
+            self._size = index.get('size', 0)
+            # Indexes from before runs were kept cover a log in time order
+            self._runs = index.get('runs', [[0, self._size]] if self._size else [])
+        self._recover()
+
+    def _load_sync(self) -> Optional[Dict[str, Any]]:
+        """Progress of an interrupted sync: resume cursor, floor, insert_at and its page runs"""
+        if not os.path.exists(self.sync_path):
+            return None
+        with open(self.sync_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_sync(self, state: Dict[str, Any]) -> None:
+        tmp_path = f"{self.sync_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.sync_path)
+
+    def _recover(self) -> None:
+        """Index complete records appended after the last index write and drop a torn tail"""
+        if not os.path.exists(self.log_path):
+            self._size = 0
+            self._runs = []
+            return
+
+        log_size = os.path.getsize(self.log_path)
+        if log_size < self._size:
+            raise ValueError(f"Ledger log {self.log_path} is shorter than its index; remove {self.index_path} to rebuild it")
+        if log_size == self._size:
+            return
+
+        recovered = 0
+        indexed = self._size
+        for offset, end, transaction in self._scan(self._size, log_size):
+            self._index_record(transaction, offset, end)
+            recovered += 1
+
+        # Records after the last page an interrupted sync recorded (or of a plain
+        # append) form one run; being older than the recorded pages, it goes first,
+        # followed by those pages in the time order the sync recorded them. Runs are
+        # not merged here: the previous run ending where a page starts says nothing
+        # about their time order.
+        state = self._load_sync()
+        position = state['insert_at'] if state is not None else len(self._runs)
+        runs = [[start, end] for start, end in (state['runs'] if state is not None else [])
+                if start >= indexed and end <= self._size]
+        run_end = max([indexed] + [end for _, end in runs])
+        if self._size > run_end:
+            runs.insert(0, [run_end, self._size])
+        for run in runs:
+            self._runs.insert(position, run)
+            position += 1
+
+        if self._size < log_size:
+            with open(self.log_path, 'r+b') as f:
+                f.truncate(self._size)
+        self._write_index()
+        logger.warning("Recovered %s ledger records for wallet %s", recovered, self.wallet_id)
+
+    def _index_record(self, transaction: Dict[str, Any], offset: int, end: int) -> None:
+        transaction_id = transaction.get('id')
+        if transaction_id:
+            self._ids[transaction_id] = offset
+        day_range = self._days.get(_day(transaction))
+        if day_range is None:
+            self._days[_day(transaction)] = [offset, end]
+        else:
+            day_range[0] = min(day_range[0], offset)
+            day_range[1] = max(day_range[1], end)
+        self._size = end
+
+    def _write_index(self) -> None:
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'ids': self._ids, 'days': self._days, 'size': self._size, 'runs': self._runs}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.index_path)
+
+    def _add_run(self, position: int, start: int, end: int) -> None:
+        """Record [start, end) as the run at position in time order"""
+        previous = self._runs[position - 1] if position else None
+        if position == len(self._runs) and previous is not None and previous[1] == start:
+            previous[1] = end  # continues the last run in both time and log order
+        else:
+            self._runs.insert(position, [start, end])
+
+    # Writes
+
+    def append(self, transactions: List[Dict[str, Any]]) -> int:
+        """
+        Append transactions not already in the ledger
+
+        Args:
+            transactions: Raw transaction dictionaries, oldest first
+
+        Returns:
+            Number of transactions appended
+        """
+        appended, size = self._write_records(transactions)
+        if appended:
+            self._add_run(len(self._runs), self._size - size, self._size)
+            self._write_index()
+        return appended
+
+    def _write_records(self, transactions: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Append transactions not already in the ledger to the log; (count, bytes) written"""
+        appended = 0
+        offset = start = self._size
+        with open(self.log_path, 'ab') as f:
+            for transaction in transactions:
+                if transaction.get('id') in self._ids:
+                    continue
+                line = json.dumps(transaction, separators=(',', ':')).encode('utf-8') + b'\n'
+                f.write(line)
+                self._index_record(transaction, offset, offset + len(line))
+                offset += len(line)
+                appended += 1
+            f.flush()
+            os.fsync(f.fileno())
+        return appended, offset - start
+
+    def sync(self, wallet_service: WalletService, page_size: int = 100) -> int:
+        """
+        Fetch transactions newer than the ledger's contents and append them
+
+        Pages are read newest first until a transaction that was in the ledger
+        before the sync is reached, so each sync only downloads what is new. Each
+        page is appended as it arrives (its own run, placed before the newer pages
+        in time order), so memory use does not grow with the number of new
+        transactions. Progress is kept in a small sync file and the index is
+        written once at the end; an interrupted sync resumes from its last page.
+
+        Returns:
+            Number of transactions appended
+        """
+        state = self._load_sync()
+        if state is not None:
+            logger.info("Resuming interrupted ledger sync for wallet %s", self.wallet_id)
+        else:
+            # floor: records below it predate the sync; insert_at: where its pages go in time
+            # order; runs: the pages appended so far, in time order
+            state = {'cursor': None, 'floor': self._size, 'insert_at': len(self._runs), 'runs': []}
+            self._write_sync(state)
+        fetch_page = lambda **kwargs: wallet_service.get_wallet_transactions(self.wallet_id, **kwargs)
+
+        appended = 0
+        for page in iter_pages(fetch_page, limit=page_size, cursor=state['cursor']):
+            new_transactions: List[Dict[str, Any]] = []
+            reached_known = False
+            for transaction in page.get('data', []):
+                offset = self._ids.get(transaction.get('id'))
+                if offset is not None and offset < state['floor']:
+                    reached_known = True
+                    break
+                new_transactions.append(transaction)
+
+            new_transactions.sort(key=lambda transaction: str(transaction.get('created_at') or ''))
+            count, size = self._write_records(new_transactions)
+            if count:
+                # Each page is older than the ones before it
+                self._runs.insert(state['insert_at'], [self._size - size, self._size])
+                state['runs'].insert(0, [self._size - size, self._size])
+                appended += count
+            if reached_known:
+                break
+            state['cursor'] = page.get('next_cursor')
+            self._write_sync(state)
+
+        self._write_index()
+        os.remove(self.sync_path)
+        logger.info("Ledger for wallet %s: appended %s transactions (%s total)", self.wallet_id, appended, len(self))
+        return appended
+
+    # Reads
+
+    def _scan(self, start: int, end: int) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        """Yield (offset, end offset, transaction) for complete records in [start, end)"""
+        if end <= start:
+            return
+        with open(self.log_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            position = start
+            while position < end:
+                newline = mm.find(b'\n', position, end)
+                if newline == -1:
+                    return  # torn record without its newline
+                yield position, newline + 1, json.loads(mm[position:newline])
+                position = newline + 1
+
+    def iter_transactions(self) -> Iterator[Dict[str, Any]]:
+        """Replay the whole ledger, oldest first"""
+        for start, end in self._runs:
+            for _, _, transaction in self._scan(start, end):
+                yield transaction
+
+    def iter_days(self, since: Optional[str] = None, until: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Replay transactions created between two days (inclusive, YYYY-MM-DD)
+
+        Only the byte ranges of matching days are read from the log.
+        """
+        days = {day for day in self._days if (since is None or day >= since) and (until is None or day <= until)}
+        if not days:
+            return
+        start = min(self._days[day][0] for day in days)
+        end = max(self._days[day][1] for day in days)
+        for run_start, run_end in self._runs:
+            for _, _, transaction in self._scan(max(run_start, start), min(run_end, end)):
+                if _day(transaction) in days:
+                    yield transaction
+
+    def get(self, transaction_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a single transaction by ID"""
+        offset = self._ids.get(transaction_id)
+        if offset is None:
+            return None
+        for _, _, transaction in self._scan(offset, self._size):
+            return transaction
+        return None
+
+    def days(self) -> List[str]:
+        """Days present in the ledger, sorted"""
+        return sorted(self._days)
@@ -5,47 +5,59 @@ Handles custodial wallet operations including balance management and wallet crea
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, Iterator, List, Optional, TYPE_CHECKING
 
 from bridge_client import BridgeClient, BridgeAPIError
 from models import Wallet
+from utils.deadline import Deadline
+from utils.jsonstream import StreamedPage
 from utils.logger import setup_logger
+from utils.pagination import iter_items
+from utils.tracing import build_model
+
+if TYPE_CHECKING:
+    from utils.cache import PersistentCache
 
 logger = setup_logger(__name__)
 
 class WalletService:
     """Service for wallet operations"""
     
-    def __init__(self, client: BridgeClient):
+    def __init__(self, client: BridgeClient, address_cache: Optional['PersistentCache'] = None):
         self.client = client
+        self.address_cache = address_cache
     
-    def create_wallet(self, customer_id: str, currency: str) -> Wallet:
+    def create_wallet(self, customer_id: str, currency: str, deadline: Optional[Deadline] = None) -> Wallet:
         """Create a new custodial wallet for customer"""
         try:
             data = {
                 'customer_id': customer_id,
                 'currency': currency
             }
-            response = self.client.post('/v0/wallets', data)
-            logger.info(f"Wallet created successfully for customer {customer_id}")
-            return Wallet(**response)
+            response = self.client.post('/v0/wallets', data, deadline=deadline)
+            logger.info("Wallet created successfully for customer %s", customer_id)
+            return build_model(Wallet, response)
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to create wallet for customer {customer_id}: {e}")
+            logger.error("Failed to create wallet for customer %s: %s", customer_id, e)
             raise
     
-    def get_wallet(self, wallet_id: str) -> Wallet:
+    def get_wallet(self, wallet_id: str, deadline: Optional[Deadline] = None) -> Wallet:
         """Get wallet by ID"""
         try:
-            response = self.client.get(f'/v0/wallets/{wallet_id}')
-            logger.info(f"Retrieved wallet: {wallet_id}")
-            return Wallet(**response)
+            response = self.client.get(f'/v0/wallets/{wallet_id}', deadline=deadline)
+            logger.info("Retrieved wallet: %s", wallet_id)
+            return build_model(Wallet, response)
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to get wallet {wallet_id}: {e}")
+            logger.error("Failed to get wallet %s: %s", wallet_id, e)
             raise
     
-    def list_wallets(self, customer_id: Optional[str] = None, limit: int = 100, cursor: Optional[str] = None) -> Dict[str, Any]:
+    def list_wallets(
+        self, customer_id: Optional[str] = None, limit: int = 100, cursor: Optional[str] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
         """List wallets with pagination"""
         try:
             params = {'limit': limit}
@@ -54,59 +66,146 @@ class WalletService:
             if customer_id:
                 params['customer_id'] = customer_id
             
-            response = self.client.get('/v0/wallets', params=params)
-            logger.info(f"Listed {len(response.get('data', []))} wallets")
+            response = self.client.get('/v0/wallets', params=params, deadline=deadline)
+            logger.info("Listed %s wallets", len(response.get('data', [])))
             return response
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to list wallets: {e}")
+            logger.error("Failed to list wallets: %s", e)
             raise
     
-    def get_wallet_balance(self, wallet_id: str) -> Dict[str, Any]:
+    def iter_wallets(self, customer_id: Optional[str] = None, page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Stream all wallets, fetching one page at a time"""
+        return iter_items(
+            lambda **kwargs: self.list_wallets(customer_id=customer_id, **kwargs),
+            limit=page_size
+        )
+    
+    def get_wallet_balance(self, wallet_id: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """Get wallet balance"""
         try:
-            response = self.client.get(f'/v0/wallets/{wallet_id}/balance')
-            logger.info(f"Retrieved balance for wallet: {wallet_id}")
+            response = self.client.get(f'/v0/wallets/{wallet_id}/balance', deadline=deadline)
+            logger.info("Retrieved balance for wallet: %s", wallet_id)
             return response
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to get balance for wallet {wallet_id}: {e}")
+            logger.error("Failed to get balance for wallet %s: %s", wallet_id, e)
             raise
     
-    def get_wallet_transactions(self, wallet_id: str, limit: int = 100, cursor: Optional[str] = None) -> Dict[str, Any]:
+    def get_wallet_transactions(
+        self, wallet_id: str, limit: int = 100, cursor: Optional[str] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
         """Get wallet transaction history"""
         try:
             params = {'limit': limit}
             if cursor:
                 params['cursor'] = cursor
             
-            response = self.client.get(f'/v0/wallets/{wallet_id}/transactions', params=params)
-            logger.info(f"Retrieved {len(response.get('data', []))} transactions for wallet: {wallet_id}")
+            response = self.client.get(f'/v0/wallets/{wallet_id}/transactions', params=params, deadline=deadline)
+            logger.info("Retrieved %s transactions for wallet: %s", len(response.get('data', [])), wallet_id)
             return response
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to get transactions for wallet {wallet_id}: {e}")
+            logger.error("Failed to get transactions for wallet %s: %s", wallet_id, e)
+            raise
+    
+    def stream_wallet_transactions(
+        self, wallet_id: str, limit: int = 100, cursor: Optional[str] = None,
+        deadline: Optional[Deadline] = None
+    ) -> StreamedPage:
+        """Get wallet transaction history, decoding transactions one by one as the page arrives"""
+        try:
+            params = {'limit': limit}
+            if cursor:
+                params['cursor'] = cursor
+            
+            return self.client.get_stream(f'/v0/wallets/{wallet_id}/transactions', params=params, deadline=deadline)
+            
+        except BridgeAPIError as e:
+            logger.error("Failed to get transactions for wallet %s: %s", wallet_id, e)
             raise
     
-    def transfer_from_wallet(self, wallet_id: str, transfer_data: Dict[str, Any]) -> Dict[str, Any]:
+    def transfer_from_wallet(self, wallet_id: str, transfer_data: Dict[str, Any], deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """Transfer funds from wallet"""
         try:
-            response = self.client.post(f'/v0/wallets/{wallet_id}/transfer', transfer_data)
-            logger.info(f"Transfer initiated from wallet: {wallet_id}")
+            response = self.client.post(f'/v0/wallets/{wallet_id}/transfer', transfer_data, deadline=deadline)
+            logger.info("Transfer initiated from wallet: %s", wallet_id)
             return response
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to transfer from wallet {wallet_id}: {e}")
+            logger.error("Failed to transfer from wallet %s: %s", wallet_id, e)
             raise
     
-    def get_wallet_address(self, wallet_id: str, currency: str) -> Dict[str, Any]:
-        """Get wallet address for specific currency"""
+    def get_wallet_address(self, wallet_id: str, currency: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """Get wallet address for specific currency
+        
+        Deposit addresses never change once assigned, so with an ``address_cache``
+        attached they are served from it and only fetched on the first lookup.
+        """
+        if self.address_cache is not None:
+            return self.address_cache.get_or_load(
+                self._address_key(wallet_id, currency),
+                lambda: self._fetch_wallet_address(wallet_id, currency, deadline=deadline)
+            )
+        return self._fetch_wallet_address(wallet_id, currency, deadline=deadline)
+    
+    @staticmethod
+    def _address_key(wallet_id: str, currency: str) -> str:
+        return f"{wallet_id}:{currency.lower()}"  # the cache is namespaced already
+    
+    def _fetch_wallet_address(self, wallet_id: str, currency: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """Fetch wallet address from the API"""
         try:
             params = {'currency': currency}
-            response = self.client.get(f'/v0/wallets/{wallet_id}/address', params=params)
-            logger.info(f"Retrieved address for wallet {wallet_id} currency {currency}")
+            response = self.client.get(f'/v0/wallets/{wallet_id}/address', params=params, deadline=deadline)
+            logger.info("Retrieved address for wallet %s currency %s", wallet_id, currency)
             return response
             
         except BridgeAPIError as e:
-            logger.error(f"Failed to get address for wallet {wallet_id}: {e}")
+            logger.error("Failed to get address for wallet %s: %s", wallet_id, e)
             raise
+
+    
+    def warm_address_cache(
+        self,
+        currencies: Optional[Iterable[str]] = None,
+        wallets: Optional[Iterable[Dict[str, Any]]] = None,
+        max_workers: int = 16
+    ) -> int:
+        """
+        Fill the address cache for many wallets at once
+        
+        Args:
+            currencies: Currencies to cache addresses for (default: each wallet's own currency)
+            wallets: Wallets to cover (default: all wallets, streamed from the API)
+            max_workers: Number of concurrent address lookups for uncached entries
+            
+        Returns:
+            Number of addresses fetched from the API
+        """
+        if self.address_cache is None:
+            raise ValueError("No address cache attached to WalletService")
+        
+        currencies = [currency.lower() for currency in currencies] if currencies else None
+        missing = []
+        for wallet in wallets if wallets is not None else self.iter_wallets():
+            for currency in currencies or [str(wallet.get('currency', '')).lower()]:
+                if currency and self._address_key(wallet['id'], currency) not in self.address_cache:
+                    missing.append((wallet['id'], currency))
+        
+        def fetch(item):
+            wallet_id, currency = item
+            try:
+                return self._address_key(wallet_id, currency), self._fetch_wallet_address(wallet_id, currency)
+            except BridgeAPIError:
+                return None
+        
+        if missing:
+            self.client.warmup(min(max_workers, len(missing)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            fetched = [result for result in executor.map(fetch, missing) if result is not None]
+        
+        self.address_cache.set_many(fetched)
+        logger.info("Warmed address cache with %s addresses (%s failed)", len(fetched), len(missing) - len(fetched))
+        return len(fetched)
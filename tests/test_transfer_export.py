@@ -0,0 +1,68 @@
+"""Tests for services.transfer_export"""
+
+import os
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from services.transfer_export import TransferExporter
+
+def _transfer(index: int, status: str = 'completed') -> dict:
+    return {
+        'id': f"tr_{index:04d}",
+        'amount': f"{index}.123456",
+        'status': status,
+        'on_behalf_of': 'cust_0001',
+        'source': {'payment_rail': 'ach', 'currency': 'usd', 'external_account_id': 'ea_1'},
+        'destination': {'payment_rail': 'base', 'currency': 'usdc', 'to_address': '0xabc'},
+        'created_at': f"2024-03-0{1 + index % 2}T12:00:{index:02d}.000Z",
+        'updated_at': f"2024-03-0{1 + index % 2}T12:30:{index:02d}.000Z"
+    }
+
+class FakeTransferService:
+    """Serves transfers newest first, one page per call"""
+
+    def __init__(self, transfers):
+        self.transfers = transfers
+
+    def list_transfers(self, limit=100, cursor=None, customer_id=None):
+        newest_first = sorted(self.transfers, key=lambda transfer: transfer['created_at'], reverse=True)
+        offset = int(cursor or 0)
+        has_next = offset + limit < len(newest_first)
+        return {
+            'data': newest_first[offset:offset + limit],
+            'has_next_page': has_next,
+            'next_cursor': str(offset + limit) if has_next else None
+        }
+
+def test_resume_with_another_format_is_refused(tmp_path):
+    service = FakeTransferService([_transfer(i) for i in range(5)])
+    TransferExporter(service, str(tmp_path), export_format='csv').run()
+
+    service.transfers.append(_transfer(6))
+    with pytest.raises(ValueError, match='csv export'):
+        TransferExporter(service, str(tmp_path), export_format='ndjson').run()
+
+    summary = TransferExporter(service, str(tmp_path), export_format='ndjson').run(full=True)
+    assert summary['exported'] == 6
+    assert all(path.endswith('.ndjson') for path in summary['files'])
+
+def test_parquet_columns_are_typed(tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    pq = pytest.importorskip('pyarrow.parquet')
+
+    service = FakeTransferService([_transfer(i, status='pending' if i == 3 else 'completed') for i in range(4)])
+    summary = TransferExporter(service, str(tmp_path), export_format='parquet').run()
+    assert summary['exported'] == 4
+
+    table = pa.concat_tables([pq.read_table(path) for path in summary['files']])
+    assert table.schema.field('amount').type == pa.decimal128(38, 18)
+    assert table.schema.field('created_at').type == pa.timestamp('us', tz='UTC')
+    assert table.schema.field('status').type == pa.string()
+
+    rows = {row['id']: row for row in table.to_pylist()}
+    assert rows['tr_0003']['amount'] == Decimal('3.123456')
+    assert rows['tr_0003']['created_at'] == datetime(2024, 3, 2, 12, 0, 3, tzinfo=timezone.utc)
+    assert rows['tr_0003']['source_currency'] == 'usd'
+    assert all(os.path.basename(os.path.dirname(path)).startswith('date=2024-03-0') for path in summary['files'])
@@ -0,0 +1,93 @@
+"""Tests for services.wallet_ledger"""
+
+import pytest
+
+from services.wallet_ledger import WalletLedger
+
+class Interrupted(Exception):
+    pass
+
+class FakeWalletService:
+    """Serves a wallet's transactions newest first, optionally failing at a given page"""
+
+    def __init__(self, count: int):
+        self.transactions = []
+        self.extend(count)
+        self.fail_at_page = None
+        self.pages = 0
+
+    def extend(self, count: int) -> None:
+        start = len(self.transactions)
+        self.transactions.extend(
+            {'id': f"tx{i:03d}", 'created_at': f"2024-01-{1 + i // 10:02d}T00:00:{i % 60:02d}Z"}
+            for i in range(start, start + count)
+        )
+
+    def get_wallet_transactions(self, wallet_id, limit=100, cursor=None):
+        self.pages += 1
+        if self.pages == self.fail_at_page:
+            raise Interrupted()
+        newest_first = self.transactions[::-1]
+        offset = int(cursor or 0)
+        data = newest_first[offset:offset + limit]
+        has_next = offset + limit < len(newest_first)
+        return {'data': data, 'has_next_page': has_next, 'next_cursor': str(offset + limit) if has_next else None}
+
+def _ids(ledger):
+    return [transaction['id'] for transaction in ledger.iter_transactions()]
+
+def _expected(count):
+    return [f"tx{i:03d}" for i in range(count)]
+
+def test_sync_replays_in_time_order(tmp_path):
+    service = FakeWalletService(10)
+    ledger = WalletLedger(str(tmp_path), 'wallet')
+    assert ledger.sync(service, page_size=10) == 10
+    service.extend(30)
+    assert ledger.sync(service, page_size=5) == 30
+    assert _ids(ledger) == _expected(40)
+    assert _ids(WalletLedger(str(tmp_path), 'wallet')) == _expected(40)
+
+def test_interrupted_sync_recovers_in_time_order(tmp_path):
+    service = FakeWalletService(10)
+    ledger = WalletLedger(str(tmp_path), 'wallet')
+    ledger.sync(service, page_size=10)
+
+    service.extend(30)
+    service.pages = 0
+    service.fail_at_page = 4
+    with pytest.raises(Interrupted):
+        ledger.sync(service, page_size=5)
+
+    # Reopening recovers the three pages the sync appended
+    reopened = WalletLedger(str(tmp_path), 'wallet')
+    assert _ids(reopened) == _expected(10) + [f"tx{i:03d}" for i in range(25, 40)]
+
+    service.fail_at_page = None
+    assert reopened.sync(service, page_size=5) == 15
+    assert _ids(reopened) == _expected(40)
+    assert _ids(WalletLedger(str(tmp_path), 'wallet')) == _expected(40)
+
+def test_page_appended_but_not_recorded_is_recovered_first(tmp_path, monkeypatch):
+    service = FakeWalletService(10)
+    ledger = WalletLedger(str(tmp_path), 'wallet')
+    ledger.sync(service, page_size=10)
+    service.extend(30)
+
+    # Fail recording the sync's progress after its second page was appended
+    write_sync = WalletLedger._write_sync
+    calls = []
+    def failing_write_sync(self, state):
+        calls.append(state)
+        if len(calls) == 3:
+            raise Interrupted()
+        write_sync(self, state)
+    monkeypatch.setattr(WalletLedger, '_write_sync', failing_write_sync)
+    with pytest.raises(Interrupted):
+        ledger.sync(service, page_size=5)
+    monkeypatch.setattr(WalletLedger, '_write_sync', write_sync)
+
+    reopened = WalletLedger(str(tmp_path), 'wallet')
+    assert _ids(reopened) == _expected(10) + [f"tx{i:03d}" for i in range(30, 40)]
+    reopened.sync(service, page_size=5)
+    assert _ids(reopened) == _expected(40)
@@ -1,11 +1,34 @@
 """
 Utility modules for Bridge API integration
+
+Utilities are imported on first access to keep CLI startup light.
 """
 
-from .idempotency import generate_idempotency_key
-from .logger import setup_logger
+import importlib
+
+_EXPORTS = {
+    'generate_idempotency_key': '.idempotency',
+    'setup_logger': '.logger',
+    'iter_pages': '.pagination',
+    'iter_items': '.pagination',
+    'TTLCache': '.cache',
+    'PersistentCache': '.cache',
+    'ClientMetrics': '.metrics',
+    'get_metrics': '.metrics',
+    'ClientHooks': '.hooks',
+    'RequestContext': '.hooks',
+    'SpanRecorder': '.tracing',
+    'build_model': '.tracing',
+    'StreamedPage': '.jsonstream',
+    'Deadline': '.deadline'
+}
+
+__all__ = list(_EXPORTS)
 
-__all__ = [
-    'generate_idempotency_key',
-    'setup_logger'
-]
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,205 @@
+"""
+Caching utilities for Bridge API integration
+
+Thread-safe in-memory caches for API responses, and a persistent cache for
+immutable lookups shared between processes
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+_MISSING = object()
+
+class TTLCache:
+    """Thread-safe cache whose entries expire after a fixed time-to-live"""
+
+    def __init__(self, ttl: float = 30.0, max_size: int = 100_000):
+        """
+        Args:
+            ttl: Seconds an entry stays valid
+            max_size: Maximum number of entries; expired entries are purged first when full
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value, or default if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache a value for the configured TTL"""
+        with self._lock:
+            if len(self._entries) >= self.max_size and key not in self._entries:
+                self._purge()
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Get a cached value, calling loader on a miss
+
+        The loader runs outside the lock so concurrent misses for different keys
+        do not serialize on each other.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one entry, or everything if no key is given"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def _purge(self) -> None:
+        """Drop expired entries, then the oldest ones if still full (lock held)"""
+        now = time.monotonic()
+        for key in [key for key, (expires, _) in self._entries.items() if expires <= now]:
+            del self._entries[key]
+        while len(self._entries) >= self.max_size:
+            self._entries.pop(next(iter(self._entries)))
+
+class PersistentCache:
+    """
+    Disk-backed cache for immutable data with an in-memory LRU front
+
+    Entries never expire: only cache values that do not change once created
+    (e.g. wallet deposit addresses). The backing store is a SQLite database in
+    WAL mode, so several processes can share it and entries survive restarts.
+    """
+
+    def __init__(self, path: str, namespace: str = 'default', memory_size: int = 10_000):
+        """
+        Args:
+            path: SQLite database file
+            namespace: Key namespace, so several caches can share one file
+            memory_size: Number of entries kept in the in-memory LRU
+        """
+        self.path = path
+        self.namespace = namespace
+        self.memory_size = memory_size
+        self._memory: 'OrderedDict[str, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._connection() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS cache ('
+                'namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, '
+                'PRIMARY KEY (namespace, key)) WITHOUT ROWID'
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        """SQLite connection for the calling thread"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def _remember(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a cached value from memory, then disk"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+        row = self._connection().execute(
+            'SELECT value FROM cache WHERE namespace = ? AND key = ?', (self.namespace, key)
+        ).fetchone()
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return default
+
+        value = json.loads(row[0])
+        with self._lock:
+            self.hits += 1
+        self._remember(key, value)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value in memory and on disk"""
+        self.set_many([(key, value)])
+
+    def set_many(self, items: Iterable[Tuple[str, Any]]) -> int:
+        """Store many values in a single transaction"""
+        items = list(items)
+        with self._connection() as connection:
+            connection.executemany(
+                'INSERT OR REPLACE INTO cache (namespace, key, value) VALUES (?, ?, ?)',
+                [(self.namespace, key, json.dumps(value, separators=(',', ':'))) for key, value in items]
+            )
+        for key, value in items:
+            self._remember(key, value)
+        return len(items)
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        """Get a cached value, calling loader and persisting its result on a miss"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            self.set(key, value)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        """Whether key is cached; unlike get, leaves the LRU order and hit/miss counts alone"""
+        with self._lock:
+            if key in self._memory:
+                return True
+        return self._connection().execute(
+            'SELECT 1 FROM cache WHERE namespace = ? AND key = ?', (self.namespace, key)
+        ).fetchone() is not None
+
+    def load_memory(self, limit: Optional[int] = None) -> int:
+        """Pre-load entries from disk into the in-memory LRU (e.g. at startup)"""
+        limit = self.memory_size if limit is None else limit
+        rows = self._connection().execute(
+            'SELECT key, value FROM cache WHERE namespace = ? LIMIT ?', (self.namespace, limit)
+        ).fetchall()
+        for key, value in rows:
+            self._remember(key, json.loads(value))
+        return len(rows)
+
+    def close(self) -> None:
+        """Close the calling thread's database connection"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
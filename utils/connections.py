@@ -0,0 +1,123 @@
+"""
+Connection pooling and transports for the Bridge API client
+
+PooledAdapter is the HTTP/1.1 requests adapter BridgeClient mounts on its session(s):
+one urllib3 connection pool per host sized for the client's concurrency, with
+TCP keep-alive so idle pooled connections survive NAT and load balancer
+timeouts. A single adapter instance is shared by all sessions of a client, so
+per-thread sessions still reuse the same warm connections.
+
+create_adapter() picks the transport: 'http1' (PooledAdapter) or 'http2'
+(utils.http2.Http2Adapter, which needs httpx[http2] and falls back to http1
+when it is not installed).
+"""
+
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Union
+
+from requests import PreparedRequest
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+def keepalive_socket_options(idle: int) -> List[Tuple[int, int, int]]:
+    """Socket options for new connections: urllib3's defaults plus TCP keep-alive after idle seconds"""
+    options = list(HTTPConnection.default_socket_options)
+    if idle <= 0:
+        return options
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    # Probe timings are platform-specific; macOS names TCP_KEEPIDLE TCP_KEEPALIVE
+    idle_option = getattr(socket, 'TCP_KEEPIDLE', None) or getattr(socket, 'TCP_KEEPALIVE', None)
+    if idle_option is not None:
+        options.append((socket.IPPROTO_TCP, idle_option, idle))
+    if hasattr(socket, 'TCP_KEEPINTVL'):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, max(1, idle // 4)))
+    if hasattr(socket, 'TCP_KEEPCNT'):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 4))
+    return options
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter with a per-host pool of pool_size connections and TCP keep-alive"""
+
+    __attrs__ = HTTPAdapter.__attrs__ + ['keepalive_idle']
+
+    def __init__(self, pool_size: int = 32, pool_block: bool = False, keepalive_idle: int = 60, **kwargs):
+        """
+        Args:
+            pool_size: Connections kept open per host (concurrent requests above it
+                open throwaway connections, or wait with pool_block)
+            pool_block: Wait for a free connection instead of opening extra ones
+            keepalive_idle: Seconds of idleness before TCP keep-alive probes (0: off)
+        """
+        self.keepalive_idle = keepalive_idle
+        kwargs.setdefault('pool_connections', 10)
+        super().__init__(pool_maxsize=pool_size, pool_block=pool_block, **kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        pool_kwargs.setdefault('socket_options', keepalive_socket_options(self.keepalive_idle))
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+
+    @property
+    def pool_size(self) -> int:
+        return self._pool_maxsize
+
+    def _pool_for(self, url: str, verify: Union[bool, str]):
+        """The connection pool requests will use for url"""
+        if hasattr(self, 'get_connection_with_tls_context'):  # requests >= 2.32
+            request = PreparedRequest()
+            request.prepare(method='GET', url=url)
+            return self.get_connection_with_tls_context(request, verify)
+        return self.get_connection(url)
+
+    def warmup(self, url: str, connections: int, verify: Union[bool, str] = True) -> int:
+        """
+        Open up to connections idle connections to url's host in parallel
+
+        Connections already open count towards the total. Returns how many were opened.
+        """
+        pool = self._pool_for(url, verify)
+        connections = min(connections, self.pool_size)
+        checked_out = []
+        try:
+            for _ in range(connections):
+                checked_out.append(pool._get_conn(timeout=0))
+        except Exception:
+            pass  # pool exhausted (pool_block) or closed; warm what we have
+
+        cold = [conn for conn in checked_out if conn.sock is None]
+        opened = 0
+        if cold:
+            with ThreadPoolExecutor(max_workers=len(cold)) as executor:
+                for result in executor.map(self._connect, cold):
+                    opened += result
+        for conn in checked_out:
+            pool._put_conn(conn)
+        return opened
+
+    @staticmethod
+    def _connect(conn) -> int:
+        try:
+            conn.connect()
+            return 1
+        except Exception as e:
+            logger.warning("Connection warmup failed: %s", e)
+            conn.close()
+            return 0
+
+TRANSPORTS = ('http1', 'http2')
+
+def create_adapter(transport: str = 'http1', pool_size: int = 32, keepalive_idle: int = 60) -> BaseAdapter:
+    """Transport adapter for BridgeClient sessions"""
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Unknown transport {transport!r}, expected one of {', '.join(TRANSPORTS)}")
+    if transport == 'http2':
+        try:
+            from utils.http2 import Http2Adapter
+            return Http2Adapter(pool_size=pool_size)
+        except ImportError as e:
+            logger.warning("HTTP/2 transport needs httpx[http2] (pip install '.[http2]'): %s; falling back to HTTP/1.1", e)
+    return PooledAdapter(pool_size=pool_size, keepalive_idle=keepalive_idle)
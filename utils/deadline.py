@@ -0,0 +1,48 @@
+"""
+Deadlines for Bridge API calls
+
+A Deadline is the point in time by which a call, including its retries, must
+have finished. Service methods and BridgeClient accept one as ``deadline=``;
+every attempt's connect and read timeouts are cut to the time remaining, and a
+retry that could not start before the deadline is not attempted.
+
+    deadline = Deadline.after(2.0)
+    transfer = transfer_service.get_transfer(transfer_id, deadline=deadline)
+    balance = wallet_service.get_wallet_balance(wallet_id, deadline=deadline)  # shares the 2 s
+"""
+
+import time
+from typing import Tuple
+
+class Deadline:
+    """A monotonic-clock point in time by which a call must finish"""
+
+    __slots__ = ('expires_at',)
+
+    def __init__(self, expires_at: float):
+        """
+        Args:
+            expires_at: time.monotonic() value at which the deadline passes
+        """
+        self.expires_at = expires_at
+
+    @classmethod
+    def after(cls, seconds: float) -> 'Deadline':
+        """Deadline seconds from now"""
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        """Seconds left, 0 once passed"""
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def clip(self, timeout: Tuple[float, float]) -> Tuple[float, float]:
+        """(connect, read) timeouts cut to the time remaining"""
+        remaining = self.remaining()
+        return min(timeout[0], remaining), min(timeout[1], remaining)
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.3f}s)"
@@ -0,0 +1,198 @@
+"""
+Hedged requests for the Bridge API client
+
+When a GET has not been answered within the recent p95 (configurable) latency
+of its route, a second identical request is sent and whichever answers first
+is used; the other is discarded when it completes. Hedges are paid for from a
+token bucket that every request tops up by a fraction of a token, so they
+never add more than that fraction (plus a small burst) to the traffic.
+
+Until a route has min_samples latencies, its requests are sent without hedging
+and without the extra thread hop. Attempts never wait for a worker thread (the
+wait would count towards the hedge delay): when every worker is busy, requests
+are sent unhedged on the caller's thread and hedges are skipped.
+"""
+
+import contextvars
+import math
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, Optional
+
+import requests
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class LatencyTracker:
+    """Recent latencies per key and their percentile"""
+
+    def __init__(self, percentile: float = 95.0, window: int = 200, min_samples: int = 20):
+        """
+        Args:
+            percentile: Percentile of recent latencies used as the hedge delay
+            window: Latencies remembered per key
+            min_samples: Latencies needed before a delay is given
+        """
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        self.percentile = percentile
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, key: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def delay(self, key: str) -> Optional[float]:
+        """The key's latency percentile, or None until min_samples have been seen"""
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        return ordered[max(math.ceil(self.percentile / 100 * len(ordered)) - 1, 0)]
+
+class HedgeBudget:
+    """Token bucket: each request earns ratio tokens, each hedge spends one"""
+
+    def __init__(self, ratio: float = 0.05, burst: float = 10.0):
+        """
+        Args:
+            ratio: Hedges allowed per request in the long run (0.05: 5% extra requests)
+            burst: Most tokens saved up for hedging a run of slow requests
+        """
+        self.ratio = ratio
+        self.burst = burst
+        self.tokens = 0.0
+        self._lock = threading.Lock()
+
+    def earn(self) -> None:
+        with self._lock:
+            self.tokens = min(self.tokens + self.ratio, self.burst)
+
+    def spend(self) -> bool:
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+def _usable(future: Future) -> bool:
+    """Whether a finished attempt's outcome can be returned without waiting for the other"""
+    if future.exception() is not None:
+        return False
+    status = future.result().status_code
+    return status < 500 and status != 429
+
+def _discard(future: Future) -> None:
+    """Release the connection of an attempt whose response is not used"""
+    if future.exception() is None:
+        future.result().close()
+
+class Hedger:
+    """Sends a request, and a hedge for it when it is slower than usual"""
+
+    def __init__(self, percentile: float = 95.0, budget: float = 0.05, max_workers: int = 64):
+        """
+        Args:
+            percentile: Latency percentile (per key) after which a hedge is sent
+            budget: Hedges allowed per request in the long run
+            max_workers: Threads sending hedged requests and their hedges; each
+                hedged request takes one, two while its hedge is in flight
+        """
+        self.latency = LatencyTracker(percentile)
+        self.budget = HedgeBudget(budget)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='bridge-hedge')
+        self._slots = threading.BoundedSemaphore(max_workers)  # workers not running an attempt
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedged = 0      # hedges sent
+        self.hedge_wins = 0  # hedges whose response was used
+        self.denied = 0      # hedges not sent for lack of budget
+        self.saturated = 0   # requests sent unhedged, or hedges skipped, with every worker busy
+
+    def request(self, key: str, send: Callable[[], requests.Response]) -> requests.Response:
+        """
+        Call send (an idempotent request), hedging it if it outlasts key's latency percentile
+
+        Returns the first usable response (not a 5xx or 429, when the other attempt
+        may still succeed); if neither is usable, the first request's outcome.
+        """
+        self.budget.earn()
+        with self._lock:
+            self.requests += 1
+        delay = self.latency.delay(key)
+        if delay is None:
+            return self._timed(key, send)
+
+        primary = self._submit(key, send)
+        if primary is None:
+            return self._timed(key, send)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+        if not self.budget.spend():
+            with self._lock:
+                self.denied += 1
+            return primary.result()
+
+        hedge = self._submit(key, send)
+        if hedge is None:
+            return primary.result()
+        logger.debug("Hedging %s after %.0f ms", key, delay * 1000)
+        with self._lock:
+            self.hedged += 1
+
+        winner = None
+        pending = {primary, hedge}
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in (primary, hedge):
+                if future in done and _usable(future):
+                    winner = future
+                    break
+        if winner is None:
+            winner = primary
+        elif winner is hedge:
+            with self._lock:
+                self.hedge_wins += 1
+        for future in (primary, hedge):
+            if future is not winner:
+                future.add_done_callback(_discard)
+        return winner.result()
+
+    def _submit(self, key: str, send: Callable[[], requests.Response]) -> Optional[Future]:
+        """Start an attempt on a free worker; None (counted as saturated) if there is none"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.saturated += 1
+            return None
+        # Each attempt runs in a copy of the caller's context, keeping its request ID
+        # in logs and its tracing span
+        future = self._executor.submit(contextvars.copy_context().run, self._timed, key, send)
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _timed(self, key: str, send: Callable[[], requests.Response]) -> requests.Response:
+        response = send()
+        if response.status_code < 500:
+            self.latency.observe(key, response.elapsed.total_seconds())
+        return response
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'requests': self.requests, 'hedged': self.hedged, 'hedge_wins': self.hedge_wins,
+                'denied': self.denied, 'saturated': self.saturated
+            }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
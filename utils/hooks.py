@@ -0,0 +1,90 @@
+"""
+Request lifecycle hooks for the Bridge API client
+
+Hooks observe (and may adjust) every HTTP attempt BridgeClient makes:
+
+    before_request(context)           headers may still be changed
+    after_response(context)           context.response is set
+    on_retry(context, reason, delay)  before sleeping for a retry
+    on_error(context, error)          before the BridgeAPIError is raised
+
+A middleware is any object with some of these methods, registered with
+client.use(middleware); single functions with client.add_hook(event, func).
+before_request runs in registration order, the others in reverse (like nested
+middleware). Exceptions raised by hooks propagate to the caller.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+HOOK_EVENTS = ('before_request', 'after_response', 'on_retry', 'on_error')
+
+@dataclass
+class RequestContext:
+    """One HTTP attempt, with its timing"""
+    method: str
+    endpoint: str
+    url: str
+    headers: Dict[str, str]
+    params: Optional[Dict[str, Any]] = None
+    data: Optional[Dict[str, Any]] = None
+    attempt: int = 0  # 0 for the first try, then 1, 2, ... for retries
+    started: float = field(default_factory=time.perf_counter)
+    elapsed: Optional[float] = None  # seconds until the response (or error) arrived
+    response: Any = None  # requests.Response
+    error: Optional[BaseException] = None
+    timings: Dict[str, float] = field(default_factory=dict)  # phase -> seconds, e.g. json_decode
+    state: Dict[str, Any] = field(default_factory=dict)  # scratch space for hooks
+
+    def finish(self) -> None:
+        self.elapsed = time.perf_counter() - self.started
+
+class ClientHooks:
+    """Registered hooks of one client"""
+
+    def __init__(self):
+        self._hooks: Dict[str, List[Callable]] = {event: [] for event in HOOK_EVENTS}
+        self._active = False
+
+    def __bool__(self) -> bool:
+        return self._active
+
+    def add(self, event: str, func: Callable) -> Callable:
+        if event not in self._hooks:
+            raise ValueError(f"Unknown hook event: {event} (expected one of {', '.join(HOOK_EVENTS)})")
+        self._hooks[event].append(func)
+        self._active = True
+        return func
+
+    def remove(self, event: str, func: Callable) -> None:
+        self._hooks[event].remove(func)
+        self._active = any(self._hooks.values())
+
+    def use(self, middleware: Any) -> Any:
+        """Register every hook method middleware defines"""
+        found = False
+        for event in HOOK_EVENTS:
+            method = getattr(middleware, event, None)
+            if callable(method):
+                self.add(event, method)
+                found = True
+        if not found:
+            raise ValueError(f"{middleware!r} defines none of {', '.join(HOOK_EVENTS)}")
+        return middleware
+
+    def before_request(self, context: RequestContext) -> None:
+        for func in self._hooks['before_request']:
+            func(context)
+
+    def after_response(self, context: RequestContext) -> None:
+        for func in reversed(self._hooks['after_response']):
+            func(context)
+
+    def on_retry(self, context: RequestContext, reason: str, delay: float) -> None:
+        for func in reversed(self._hooks['on_retry']):
+            func(context, reason, delay)
+
+    def on_error(self, context: RequestContext, error: BaseException) -> None:
+        for func in reversed(self._hooks['on_error']):
+            func(context, error)
@@ -0,0 +1,158 @@
+"""
+HTTP/2 transport for the Bridge API client (requires httpx[http2])
+
+Http2Adapter is a requests transport adapter backed by an httpx client, so
+BridgeClient, its hooks and metrics keep working with requests.Response
+objects while concurrent requests are multiplexed as streams over a few
+connections. Servers that do not negotiate HTTP/2 (via ALPN) are spoken to
+over HTTP/1.1 by the same adapter.
+
+The per-request TLS and proxy settings requests passes (verify, cert and
+proxies, including those from the environment) are honored with one httpx
+client per distinct combination, and stream=True bodies are read as they
+are consumed.
+"""
+
+import os
+import ssl
+import threading
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+import httpx
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers, select_proxy
+
+# Connection-specific headers HTTP/2 forbids; requests adds some by default
+_HOP_BY_HOP = frozenset({'connection', 'keep-alive', 'proxy-connection', 'transfer-encoding', 'upgrade', 'host'})
+
+CertType = Union[None, str, Tuple[str, str]]
+
+def _ssl_context(verify: Union[bool, str], cert: CertType) -> Union[bool, ssl.SSLContext]:
+    """TLS settings of requests (verify: bool or CA bundle path, cert: client certificate) for httpx"""
+    if verify is True and not cert:
+        return True  # httpx's default context, trusting certifi's CA bundle like requests does
+    if verify is False:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    elif verify is True:
+        context = httpx.create_ssl_context()
+    elif os.path.isdir(verify):
+        context = ssl.create_default_context(capath=verify)
+    else:
+        context = ssl.create_default_context(cafile=verify)
+    if cert:
+        context.load_cert_chain(*((cert,) if isinstance(cert, str) else cert))
+    return context
+
+def _translate(error: httpx.HTTPError, request: requests.PreparedRequest) -> requests.exceptions.RequestException:
+    """The requests exception matching an httpx one"""
+    if isinstance(error, httpx.ConnectTimeout):
+        return requests.exceptions.ConnectTimeout(error, request=request)
+    if isinstance(error, httpx.TimeoutException):
+        return requests.exceptions.ReadTimeout(error, request=request)
+    if isinstance(error, httpx.DecodingError):
+        return requests.exceptions.ContentDecodingError(error, request=request)
+    return requests.exceptions.ConnectionError(error, request=request)
+
+class _StreamedBody:
+    """Body of a streamed httpx response, as requests.Response.raw"""
+
+    def __init__(self, upstream: httpx.Response, request: requests.PreparedRequest):
+        self._upstream = upstream
+        self._request = request
+
+    def stream(self, chunk_size: int, decode_content: bool = True) -> Iterator[bytes]:
+        # httpx always decodes the Content-Encoding; the header is not passed on
+        try:
+            yield from self._upstream.iter_bytes(chunk_size)
+        except httpx.HTTPError as e:
+            raise _translate(e, self._request)
+
+    def close(self) -> None:
+        self._upstream.close()
+
+class Http2Adapter(BaseAdapter):
+    """requests adapter sending requests through HTTP/2-capable httpx clients"""
+
+    def __init__(self, pool_size: int = 32):
+        """
+        Args:
+            pool_size: Maximum connections per host (and per TLS/proxy setting);
+                HTTP/2 only opens more than one when the server's concurrent
+                stream limit is reached
+        """
+        super().__init__()
+        self.pool_size = pool_size
+        self._clients: Dict[Tuple[Union[bool, str], CertType, Optional[str]], httpx.Client] = {}
+        self._lock = threading.Lock()
+
+    def _client(self, verify: Union[bool, str], cert: CertType, proxy: Optional[str]) -> httpx.Client:
+        key = (verify, tuple(cert) if isinstance(cert, list) else cert, proxy)
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self._clients[key] = httpx.Client(
+                        http2=True,
+                        verify=_ssl_context(verify, key[1]),
+                        proxy=proxy,
+                        trust_env=False,  # requests has already applied the environment
+                        limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+                        follow_redirects=False  # requests.Session handles redirects
+                    )
+        return client
+
+    @staticmethod
+    def _timeout(timeout: Union[None, float, Tuple[Optional[float], Optional[float]]]) -> httpx.Timeout:
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return httpx.Timeout(read, connect=connect)
+        return httpx.Timeout(timeout)
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, timeout=None, verify=True, cert=None, proxies=None) -> requests.Response:
+        client = self._client(verify, cert, select_proxy(request.url, proxies or {}))
+        headers = [(name, value) for name, value in request.headers.items() if name.lower() not in _HOP_BY_HOP]
+        upstream_request = client.build_request(
+            request.method, request.url, headers=headers, content=request.body, timeout=self._timeout(timeout)
+        )
+        try:
+            upstream = client.send(upstream_request, stream=True)
+        except httpx.HTTPError as e:
+            raise _translate(e, request)
+
+        response = requests.Response()
+        response.status_code = upstream.status_code
+        # The body is decompressed by httpx, so its Content-Encoding no longer applies
+        response.headers = CaseInsensitiveDict(
+            (name, value) for name, value in upstream.headers.items() if name.lower() != 'content-encoding'
+        )
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = upstream.reason_phrase
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.http_version = upstream.http_version  # e.g. HTTP/2, for diagnostics
+        response.raw = _StreamedBody(upstream, request)
+        if not stream:
+            try:
+                response._content = upstream.read()
+            except httpx.HTTPError as e:
+                raise _translate(e, request)
+            finally:
+                upstream.close()
+            response._content_consumed = True
+        return response
+
+    def warmup(self, url: str, connections: int, verify: Union[bool, str] = True) -> int:
+        # One multiplexed connection is opened by the first request; nothing to pre-open
+        return 0
+
+    def close(self) -> None:
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            client.close()
@@ -4,6 +4,7 @@ Idempotency key generation utilities
 Generates unique idempotency keys for safe API retries
 """
 
+import hashlib
 import uuid
 import time
 from typing import Optional
@@ -26,6 +27,23 @@ def generate_idempotency_key(prefix: Optional[str] = None) -> str:
     else:
         return f"{timestamp}_{unique_id}"
 
+def generate_deterministic_key(prefix: str, *parts: str) -> str:
+    """
+    Generate an idempotency key derived only from the given parts
+    
+    The same parts always produce the same key, so a re-submitted operation
+    (e.g. after a crash) is deduplicated by the API instead of repeated.
+    
+    Args:
+        prefix: Prefix for the key
+        parts: Values identifying the operation
+        
+    Returns:
+        Deterministic idempotency key string
+    """
+    digest = hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+    return f"{prefix}_{digest[:40]}"
+
 def generate_customer_key(customer_id: str) -> str:
     """Generate idempotency key for customer operations"""
     return generate_idempotency_key(f"customer_{customer_id}")
@@ -0,0 +1,48 @@
+"""
+JSON codec for the Bridge API client
+
+Uses orjson when it is installed (several times faster on large list pages)
+and the standard library otherwise. Both produce compact UTF-8 bytes and
+accept bytes or str, so callers do not depend on which backend is active.
+"""
+
+import json
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Union
+
+def _default(value: Any) -> Any:
+    """Types both backends encode the same way that stdlib json does not know"""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    BACKEND = 'orjson'
+
+    def dumps(value: Any) -> bytes:
+        """Encode to compact UTF-8 JSON bytes"""
+        return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(data: Union[bytes, str]) -> Any:
+        """Decode JSON; raises ValueError on invalid input"""
+        return orjson.loads(data)
+else:
+    BACKEND = 'json'
+
+    def dumps(value: Any) -> bytes:
+        """Encode to compact UTF-8 JSON bytes"""
+        return json.dumps(value, default=_default, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def loads(data: Union[bytes, str]) -> Any:
+        """Decode JSON; raises ValueError on invalid input"""
+        return json.loads(data)
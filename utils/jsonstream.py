@@ -0,0 +1,215 @@
+"""
+Incremental decoding of list responses
+
+StreamedPage reads a list response (``{"data": [...], "has_next_page": ...,
+"next_cursor": ...}``) chunk by chunk as it arrives and yields the items of
+its ``data`` array one at a time, so the first item is available before the
+page has finished downloading and only one item is decoded in memory at a
+time. Each item is located by a regular expression that jumps between its
+brackets, skipping strings, and then decoded by utils.jsoncodec.
+
+The other top-level fields (next_cursor, has_next_page, count) are available
+through get() and [] once they have been read; the Bridge API sends them
+after the data array, so read them after iterating the items. Reading them
+earlier decodes and keeps the remaining items in memory.
+
+    with client.get_stream('/v0/transfers', params={'limit': 1000}) as page:
+        for transfer in page:
+            ...
+        cursor = page.get('next_cursor')
+"""
+
+import re
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Optional
+
+from utils import jsoncodec
+
+_WHITESPACE = b' \t\r\n'
+_STRING = re.compile(rb'"[^"\\]*+(?:\\.[^"\\]*+)*+"', re.DOTALL)
+# Everything up to and including the next bracket outside a string (possessive, so never backtracks)
+_NEXT_BRACKET = re.compile(rb'(?:[^"\[\]{}]++|"[^"\\]*+(?:\\.[^"\\]*+)*+")*+[\[\]{}]', re.DOTALL)
+_SCALAR_END = re.compile(rb'[,\]}\s]')
+_MISSING = object()
+
+class StreamedPage:
+    """Items of a list response, decoded as they arrive"""
+
+    def __init__(self, chunks: Iterable[bytes], array_key: str = 'data', on_close: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            chunks: Body of a JSON object, in chunks of any size
+            array_key: Top-level field whose array items are streamed
+            on_close: Called once when the page is closed or fully read
+                (e.g. to release the HTTP connection)
+        """
+        self.array_key = array_key
+        self.meta: Dict[str, Any] = {}
+        self.items_read = 0
+        self._chunks = iter(chunks)
+        self._on_close = on_close
+        self._buffer = bytearray()
+        self._pos = 0
+        self._pending: Deque[Any] = deque()  # items decoded ahead of iteration by get()
+        self._parser = self._parse()
+        self._done = False
+
+    # Mapping-like access, so a StreamedPage works with utils.pagination
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == self.array_key:
+            return self
+        if key not in self.meta and not self._done:
+            self._drain()
+        return self.meta.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[Any]:
+        return self
+
+    def __next__(self) -> Any:
+        if self._pending:
+            self.items_read += 1
+            return self._pending.popleft()
+        if self._done:
+            raise StopIteration
+        try:
+            item = next(self._parser)
+        except BaseException:  # end of the array, or a decoding/connection error
+            self.close()
+            raise
+        self.items_read += 1
+        return item
+
+    @property
+    def done(self) -> bool:
+        """Whether the whole body has been read"""
+        return self._done
+
+    def _drain(self) -> None:
+        """Read the rest of the body, keeping unread items for iteration"""
+        try:
+            self._pending.extend(self._parser)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stop reading; unread items are discarded"""
+        if self._done:
+            return
+        self._done = True
+        self._parser.close()
+        self._buffer = bytearray()
+        if self._on_close is not None:
+            self._on_close()
+
+    def __enter__(self) -> 'StreamedPage':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # Parsing
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping what has been consumed; False at the end"""
+        for chunk in self._chunks:
+            if not chunk:
+                continue
+            if self._pos:
+                del self._buffer[:self._pos]
+                self._pos = 0
+            self._buffer += chunk
+            return True
+        return False
+
+    def _peek(self) -> int:
+        """Next non-whitespace byte, without consuming it"""
+        while True:
+            buffer = self._buffer
+            while self._pos < len(buffer) and buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(buffer):
+                return buffer[self._pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON stream")
+
+    def _expect(self, char: bytes) -> None:
+        if self._peek() != char[0]:
+            raise ValueError(f"Expected {char.decode()!r} at offset {self._pos} of JSON stream")
+        self._pos += 1
+
+    def _more(self, start: int) -> int:
+        """Read another chunk, keeping the buffer from start on; returns start's new offset"""
+        self._pos = start
+        if not self._fill():
+            raise ValueError("Unexpected end of JSON stream")
+        return self._pos
+
+    def _read_value(self) -> bytearray:
+        """Raw bytes of the JSON value at the current position, consuming them"""
+        first = self._peek()
+        start = self._pos
+        if first == 0x22:  # "
+            while True:
+                match = _STRING.match(self._buffer, start)
+                if match is not None:
+                    self._pos = match.end()
+                    return self._buffer[start:self._pos]
+                start = self._more(start)
+        if first not in b'{[':
+            while True:
+                match = _SCALAR_END.search(self._buffer, start)
+                if match is not None:
+                    self._pos = match.start()
+                    return self._buffer[start:self._pos]
+                start = self._more(start)
+
+        # Jump from bracket to bracket; the offset of the last one survives buffer refills
+        offset, depth = 0, 0
+        while True:
+            match = _NEXT_BRACKET.match(self._buffer, start + offset)
+            if match is None:  # no complete string or bracket in what has arrived
+                start = self._more(start)
+                continue
+            offset = match.end() - start
+            if self._buffer[match.end() - 1] in b'{[':
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    self._pos = match.end()
+                    return self._buffer[start:self._pos]
+
+    def _parse(self) -> Iterator[Any]:
+        self._expect(b'{')
+        if self._peek() == ord('}'):
+            self._pos += 1
+            return
+        while True:
+            key = jsoncodec.loads(self._read_value())
+            self._expect(b':')
+            if key == self.array_key and self._peek() == ord('['):
+                self._pos += 1
+                if self._peek() == ord(']'):
+                    self._pos += 1
+                else:
+                    while True:
+                        yield jsoncodec.loads(self._read_value())
+                        if self._peek() == ord(','):
+                            self._pos += 1
+                            continue
+                        self._expect(b']')
+                        break
+            else:
+                self.meta[key] = jsoncodec.loads(self._read_value())
+            if self._peek() == ord(','):
+                self._pos += 1
+                continue
+            self._expect(b'}')
+            return
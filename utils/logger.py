@@ -1,12 +1,212 @@
 """
 Logging utilities for Bridge API integration
 
-Provides structured logging with proper formatting and levels
+Provides structured logging with proper formatting and levels.
+
+All module loggers share one handler, configured with configure_logging() or
+the environment:
+
+    BRIDGE_LOG_FORMAT   text (default) or json (one object per line, with request_id)
+    BRIDGE_LOG_ASYNC    true to write from a background thread via a queue
+    BRIDGE_LOG_SAMPLE   per-message sampling, e.g. "Retrieved wallet=0.01,Retrieved customer=0.1"
+
+Sampling keys on the message template (the unformatted "Retrieved wallet: %s"),
+so log calls should pass arguments lazily rather than as f-strings.
 """
 
+import atexit
+import itertools
+import json
 import logging
+import logging.handlers
+import os
+import queue
 import sys
-from typing import Optional
+import threading
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Iterator, Optional, TextIO
+
+LOG_FORMATS = ('text', 'json')
+
+# ID of the API request (or caller-defined unit of work) being logged for, and
+# of the last one finished, so a service's "Retrieved ..." line after the call
+# is attributed to the request it logs about
+_request_id: ContextVar[Optional[str]] = ContextVar('bridge_request_id', default=None)
+_last_request_id: ContextVar[Optional[str]] = ContextVar('bridge_last_request_id', default=None)
+
+def get_request_id() -> Optional[str]:
+    return _request_id.get()
+
+@contextmanager
+def request_id_context(request_id: Optional[str] = None) -> Iterator[str]:
+    """Tag log records emitted inside the block with request_id (default: a new one)"""
+    request_id = request_id or f"req_{uuid.uuid4().hex[:12]}"
+    token = _request_id.set(request_id)
+    try:
+        yield request_id
+    finally:
+        _request_id.reset(token)
+        _last_request_id.set(request_id)
+
+class RequestIdFilter(logging.Filter):
+    """Adds record.request_id: the current request's, else the last one finished in this context"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _request_id.get() or _last_request_id.get()
+        return True
+
+class SamplingFilter(logging.Filter):
+    """Keeps 1 in N records per message template whose text starts with a configured prefix"""
+
+    def __init__(self, rates: Dict[str, float]):
+        """
+        Args:
+            rates: Message prefix -> fraction of records to keep (e.g. 0.01)
+        """
+        super().__init__()
+        self.rates = rates
+        self._every: Dict[str, int] = {}
+        self._counters: Dict[str, Iterator[int]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        template = record.msg if isinstance(record.msg, str) else str(record.msg)
+        every = self._every.get(template)
+        if every is None:
+            # Only sampled templates are remembered, so other messages cannot grow the tables
+            rate = next((rate for prefix, rate in self.rates.items() if template.startswith(prefix)), None)
+            if rate is None:
+                return True
+            every = max(1, round(1 / rate)) if rate > 0 else 0
+            self._counters.setdefault(template, itertools.count())
+            self._every[template] = every
+        if every == 1:
+            return True
+        if every == 0:
+            return False
+        record.sample_every = every
+        return next(self._counters[template]) % every == 0
+
+def parse_sample_rates(spec: Optional[str]) -> Dict[str, float]:
+    """Parse "prefix=rate,prefix=rate" (as in BRIDGE_LOG_SAMPLE)"""
+    rates = {}
+    for item in (spec or '').split(','):
+        if not item.strip():
+            continue
+        prefix, separator, rate = item.rpartition('=')
+        if not separator or not prefix.strip():
+            raise ValueError(f"Invalid log sample rate {item!r}, expected prefix=rate")
+        rates[prefix.strip()] = float(rate)
+    return rates
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', None)
+        }
+        if getattr(record, 'sample_every', None):
+            entry['sample_every'] = record.sample_every
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class _SharedHandler(logging.Handler):
+    """The handler every module logger holds; forwards to the configured output"""
+
+    def __init__(self):
+        super().__init__()
+        self.target: Optional[logging.Handler] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # Filters run on the calling thread: sampling drops records before any
+        # formatting, and the request ID is read from the caller's context
+        if not self.filter(record):
+            return False
+        if self.target is None:
+            with _configure_lock:
+                if self.target is None:
+                    configure_logging()
+        self.target.handle(record)
+        return True
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.target.emit(record)
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only merge the arguments here (they may change after the call); the
+        # record is ours alone, so no copy, and the writer thread does the rest
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+_shared = _SharedHandler()
+_configure_lock = threading.Lock()
+
+def configure_logging(
+    log_format: Optional[str] = None,
+    asynchronous: Optional[bool] = None,
+    sample_rates: Optional[Dict[str, float]] = None,
+    stream: Optional[TextIO] = None
+) -> None:
+    """
+    (Re)configure the output of all loggers from setup_logger
+
+    Args:
+        log_format: text or json (default: BRIDGE_LOG_FORMAT, else text)
+        asynchronous: Write from a background thread (default: BRIDGE_LOG_ASYNC)
+        sample_rates: Message prefix -> fraction to keep (default: BRIDGE_LOG_SAMPLE)
+        stream: Output stream (default: stderr, so stdout stays clean for piped output)
+    """
+    log_format = log_format or os.getenv('BRIDGE_LOG_FORMAT', 'text').lower()
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"Unknown log format {log_format!r}, expected one of {', '.join(LOG_FORMATS)}")
+    if asynchronous is None:
+        asynchronous = os.getenv('BRIDGE_LOG_ASYNC', 'false').lower() in ('true', '1', 'yes')
+    if sample_rates is None:
+        sample_rates = parse_sample_rates(os.getenv('BRIDGE_LOG_SAMPLE'))
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    if log_format == 'json':
+        output.setFormatter(JSONFormatter())
+    else:
+        output.setFormatter(logging.Formatter(
+            fmt='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        ))
+
+    _stop_listener()
+    for existing in list(_shared.filters):
+        _shared.removeFilter(existing)
+    if sample_rates:
+        _shared.addFilter(SamplingFilter(sample_rates))
+    if log_format == 'json':
+        _shared.addFilter(RequestIdFilter())
+
+    if asynchronous:
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        _shared.listener = logging.handlers.QueueListener(records, output)
+        _shared.listener.start()
+        _shared.target = _QueueHandler(records)
+    else:
+        _shared.target = output
+
+def _stop_listener() -> None:
+    """Stop the background writer (if any), flushing queued records"""
+    if _shared.listener is not None:
+        _shared.listener.stop()
+        _shared.listener = None
+
+atexit.register(_stop_listener)
 
 def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     """
@@ -27,19 +227,8 @@ def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     
     logger.setLevel(level)
     
-    # Create console handler
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setLevel(level)
-    
-    # Create formatter
-    formatter = logging.Formatter(
-        fmt='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    handler.setFormatter(formatter)
-    
-    # Add handler to logger
-    logger.addHandler(handler)
+    # Every module logger shares one handler, so configure_logging() applies to all
+    logger.addHandler(_shared)
     
     return logger
 
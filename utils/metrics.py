@@ -0,0 +1,198 @@
+"""
+Request metrics for the Bridge API client
+
+Latency histograms per method and route template, status code, retry and byte
+counters and in-flight gauges, rendered in the Prometheus text format. The
+client only touches this module when metrics are enabled.
+"""
+
+import os
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+# Prometheus' default latency buckets (seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Path segments that are part of a route rather than an ID
+_ROUTE_WORDS = {
+    'v0', 'customers', 'transfers', 'wallets', 'external_accounts', 'tos_links', 'kyc_status',
+    'kyc_resubmit', 'verify', 'plaid_link_token', 'plaid_accounts', 'cancel', 'receipt',
+    'estimate_fee', 'quotes', 'balance', 'transactions', 'transfer', 'address'
+}
+
+@lru_cache(maxsize=4096)
+def route_template(endpoint: str) -> str:
+    """Collapse IDs in an endpoint path, e.g. /v0/customers/cust_1/kyc_status -> /v0/customers/{id}/kyc_status"""
+    path = endpoint.split('?', 1)[0]
+    return '/'.join(segment if not segment or segment in _ROUTE_WORDS else '{id}' for segment in path.split('/'))
+
+class _Histogram:
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, fraction: float) -> float:
+        """Estimate a quantile by linear interpolation within its bucket"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = LATENCY_BUCKETS[index - 1] if index else 0.0
+                upper = LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else LATENCY_BUCKETS[-1] * 2
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return LATENCY_BUCKETS[-1]
+
+def _labels(**labels: Any) -> str:
+    return '{' + ','.join(f'{key}="{str(value)}"' for key, value in labels.items()) + '}'
+
+class ClientMetrics:
+    """Thread-safe request metrics, keyed by (method, route template)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency: Dict[Tuple[str, str], _Histogram] = defaultdict(_Histogram)
+        self.statuses: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        self.retries: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        self.bytes_out: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.bytes_in: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.in_flight: Dict[Tuple[str, str], int] = defaultdict(int)
+
+    def request_started(self, method: str, route: str) -> None:
+        with self._lock:
+            self.in_flight[(method, route)] += 1
+
+    def request_finished(self, method: str, route: str, status: str, seconds: float, bytes_out: int = 0, bytes_in: int = 0) -> None:
+        """Record one HTTP exchange; status is the code, or 'error' when no response arrived"""
+        key = (method, route)
+        with self._lock:
+            self.in_flight[key] -= 1
+            self.latency[key].observe(seconds)
+            self.statuses[(method, route, status)] += 1
+            self.bytes_out[key] += bytes_out
+            self.bytes_in[key] += bytes_in
+
+    def retry(self, method: str, route: str, reason: str) -> None:
+        with self._lock:
+            self.retries[(method, route, reason)] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            for table in (self.latency, self.statuses, self.retries, self.bytes_out, self.bytes_in):
+                table.clear()
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per-route rows: method, route, calls, errors, rate_limited, retries, mean/p50/p95/p99 ms, bytes"""
+        with self._lock:
+            rows = []
+            for (method, route), histogram in sorted(self.latency.items(), key=lambda item: (item[0][1], item[0][0])):
+                statuses = {status: count for (m, r, status), count in self.statuses.items() if (m, r) == (method, route)}
+                rows.append({
+                    'method': method,
+                    'route': route,
+                    'calls': histogram.count,
+                    'errors': sum(count for status, count in statuses.items() if status == 'error' or int(status) >= 400),
+                    'rate_limited': statuses.get('429', 0),
+                    'retries': sum(count for (m, r, _), count in self.retries.items() if (m, r) == (method, route)),
+                    'mean_ms': histogram.total / histogram.count * 1000 if histogram.count else 0.0,
+                    'p50_ms': histogram.quantile(0.50) * 1000,
+                    'p95_ms': histogram.quantile(0.95) * 1000,
+                    'p99_ms': histogram.quantile(0.99) * 1000,
+                    'bytes_out': self.bytes_out[(method, route)],
+                    'bytes_in': self.bytes_in[(method, route)]
+                })
+            return rows
+
+    def render_prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        with self._lock:
+            lines += [
+                '# HELP bridge_client_request_duration_seconds Bridge API request latency',
+                '# TYPE bridge_client_request_duration_seconds histogram'
+            ]
+            for (method, route), histogram in sorted(self.latency.items()):
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + (float('inf'),), histogram.counts):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else f"{bound:g}"
+                    lines.append(f"bridge_client_request_duration_seconds_bucket{_labels(method=method, route=route, le=le)} {cumulative}")
+                lines.append(f"bridge_client_request_duration_seconds_sum{_labels(method=method, route=route)} {histogram.total:.6f}")
+                lines.append(f"bridge_client_request_duration_seconds_count{_labels(method=method, route=route)} {histogram.count}")
+
+            lines += ['# HELP bridge_client_requests_total Bridge API responses by status code', '# TYPE bridge_client_requests_total counter']
+            for (method, route, status), count in sorted(self.statuses.items()):
+                lines.append(f"bridge_client_requests_total{_labels(method=method, route=route, status=status)} {count}")
+
+            lines += ['# HELP bridge_client_retries_total Bridge API request retries by reason', '# TYPE bridge_client_retries_total counter']
+            for (method, route, reason), count in sorted(self.retries.items()):
+                lines.append(f"bridge_client_retries_total{_labels(method=method, route=route, reason=reason)} {count}")
+
+            for name, table, help_text in (
+                ('bridge_client_request_bytes_total', self.bytes_out, 'Request body bytes sent'),
+                ('bridge_client_response_bytes_total', self.bytes_in, 'Response body bytes received')
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                for (method, route), count in sorted(table.items()):
+                    lines.append(f"{name}{_labels(method=method, route=route)} {count}")
+
+            lines += ['# HELP bridge_client_in_flight_requests Bridge API requests in progress', '# TYPE bridge_client_in_flight_requests gauge']
+            for (method, route), count in sorted(self.in_flight.items()):
+                lines.append(f"bridge_client_in_flight_requests{_labels(method=method, route=route)} {count}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str) -> None:
+        """Dump the metrics to a file (e.g. for the node exporter textfile collector)"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+
+_metrics: Optional[ClientMetrics] = None
+_metrics_lock = threading.Lock()
+
+def get_metrics() -> ClientMetrics:
+    """Process-wide metrics shared by all clients with metrics enabled"""
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = ClientMetrics()
+    return _metrics
+
+def serve_metrics(metrics: ClientMetrics, port: int, host: str = '127.0.0.1'):
+    """Serve GET /metrics in a background thread; returns the server (call shutdown() to stop)"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = metrics.render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='bridge-metrics', daemon=True).start()
+    return server
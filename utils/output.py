@@ -0,0 +1,213 @@
+"""
+Streaming output utilities for Bridge API list commands
+
+Writes records as JSON, NDJSON, CSV or text as they arrive, with field projection
+and buffered writes, so arbitrarily long listings run in constant memory
+"""
+
+import csv
+import functools
+import io
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, TextIO, Tuple
+
+import click
+
+from utils.pagination import MAX_PAGE_SIZE, iter_items
+
+OUTPUT_FORMATS = ('text', 'json', 'ndjson', 'csv')
+
+_MISSING = object()
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated --fields value into a list of dotted paths"""
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(',') if field.strip()]
+
+def extract(record: Dict[str, Any], path: str) -> Any:
+    """Get a possibly nested value by dotted path (e.g. 'source.payment_rail'), or None"""
+    value: Any = record
+    for key in path.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key, _MISSING)
+        if value is _MISSING:
+            return None
+    return value
+
+def project(record: Dict[str, Any], fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+    """Keep only the given dotted paths of a record (all fields if None)"""
+    if not fields:
+        return record
+    return {field: extract(record, field) for field in fields}
+
+class RecordWriter:
+    """Base class for streaming record writers with a write buffer"""
+
+    def __init__(self, stream: TextIO, fields: Optional[Sequence[str]] = None, buffer_size: int = 64 * 1024):
+        self.stream = stream
+        self.fields = list(fields) if fields else None
+        self.buffer_size = buffer_size
+        self.count = 0
+        self._buffer: List[str] = []
+        self._buffered = 0
+
+    def _emit(self, text: str) -> None:
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self.stream.write(''.join(self._buffer))
+            self.stream.flush()
+            self._buffer.clear()
+            self._buffered = 0
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._write(project(record, self.fields))
+        self.count += 1
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        self.flush()
+
+class NDJSONWriter(RecordWriter):
+    """One compact JSON object per line"""
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._emit(json.dumps(record, separators=(',', ':'), default=str) + '\n')
+
+class JSONWriter(RecordWriter):
+    """A single JSON array, written element by element"""
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._emit(('[\n' if self.count == 0 else ',\n') + json.dumps(record, default=str))
+
+    def close(self) -> None:
+        self._emit('[]\n' if self.count == 0 else '\n]\n')
+        super().close()
+
+class CSVWriter(RecordWriter):
+    """CSV with a header row; nested values are written as JSON"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._line = io.StringIO()
+        self._csv = csv.writer(self._line)
+        self._columns: Optional[List[str]] = self.fields
+
+    def _row(self, values: Iterable[Any]) -> None:
+        self._csv.writerow(values)
+        self._emit(self._line.getvalue())
+        self._line.seek(0)
+        self._line.truncate()
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        if self._columns is None:
+            # Without --fields, columns come from the first record
+            self._columns = list(record)
+        if self.count == 0:
+            self._row(self._columns)
+        self._row(
+            json.dumps(value, separators=(',', ':'), default=str) if isinstance(value, (dict, list)) else ('' if value is None else value)
+            for value in (record.get(column) for column in self._columns)
+        )
+
+class TextWriter(RecordWriter):
+    """Human-readable "Label: value" blocks separated by ---"""
+
+    def __init__(self, *args, labels: Optional[Sequence[Tuple[str, str]]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.labels = [(field, field) for field in self.fields] if self.fields else list(labels or [])
+
+    def write(self, record: Dict[str, Any]) -> None:
+        # Labels carry their own paths, so the record is not projected first
+        self._write(record)
+        self.count += 1
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        lines = [f"{label}: {extract(record, path)}" for label, path in self.labels]
+        self._emit('\n'.join(lines) + '\n---\n')
+
+WRITERS = {
+    'json': JSONWriter,
+    'ndjson': NDJSONWriter,
+    'csv': CSVWriter,
+    'text': TextWriter
+}
+
+def write_records(
+    records: Iterable[Dict[str, Any]],
+    output_format: str,
+    fields: Optional[Sequence[str]] = None,
+    labels: Optional[Sequence[Tuple[str, str]]] = None,
+    stream: Optional[TextIO] = None
+) -> int:
+    """
+    Stream records to stdout (or stream) in the given format
+
+    Args:
+        records: Records to write, consumed lazily
+        output_format: One of OUTPUT_FORMATS
+        fields: Optional dotted paths to project each record onto
+        labels: (label, path) pairs used by the text format when no fields are given
+        stream: Output stream (default: stdout)
+
+    Returns:
+        Number of records written
+    """
+    writer_class = WRITERS[output_format]
+    kwargs = {'labels': labels} if output_format == 'text' else {}
+    writer = writer_class(stream or click.get_text_stream('stdout'), fields=fields, **kwargs)
+    try:
+        for record in records:
+            writer.write(record)
+    finally:
+        writer.close()
+    return writer.count
+
+def list_output_options(command: Callable) -> Callable:
+    """Add --format, --all and --fields options to a list command"""
+    @click.option('--format', 'output_format', type=click.Choice(OUTPUT_FORMATS), default='text', help='Output format')
+    @click.option('--all', 'all_pages', is_flag=True, help='Fetch all pages, streaming records as they arrive')
+    @click.option('--fields', help='Comma-separated fields to output, dotted for nested values (e.g. id,source.currency)')
+    @functools.wraps(command)
+    def wrapper(*args, fields=None, **kwargs):
+        return command(*args, fields=parse_fields(fields), **kwargs)
+    return wrapper
+
+def stream_list(
+    fetch_page: Callable[..., Dict[str, Any]],
+    limit: int,
+    cursor: Optional[str],
+    all_pages: bool,
+    output_format: str,
+    fields: Optional[Sequence[str]] = None,
+    labels: Optional[Sequence[Tuple[str, str]]] = None
+) -> int:
+    """
+    Write one page, or every page with all_pages, of a list endpoint to stdout
+
+    Only the current page is held in memory (only the current item, when
+    fetch_page returns a utils.jsonstream.StreamedPage). With all_pages, limit
+    is ignored and the largest pages the API allows are requested.
+    """
+    if all_pages:
+        records: Iterable[Dict[str, Any]] = iter_items(fetch_page, limit=MAX_PAGE_SIZE, cursor=cursor)
+    else:
+        page = fetch_page(limit=limit, cursor=cursor)
+        records = page.get('data', [])
+
+    count = write_records(records, output_format, fields=fields, labels=labels)
+    if not all_pages and page.get('has_next_page') and output_format != 'text':
+        click.echo(f"Next cursor: {page.get('next_cursor')}", err=True)
+    if output_format == 'text':
+        click.echo(f"Total: {count}")
+        if not all_pages and page.get('has_next_page'):
+            click.echo(f"Next cursor: {page.get('next_cursor')}")
+    return count
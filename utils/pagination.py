@@ -0,0 +1,62 @@
+"""
+Pagination utilities for Bridge API list endpoints
+
+Walks cursor-paginated list responses page by page. Pages may be dicts or
+utils.jsonstream.StreamedPage objects, whose items are decoded as they are read.
+"""
+
+from typing import Any, Callable, Dict, Iterator, Optional
+
+MAX_PAGE_SIZE = 100  # largest limit the list endpoints accept
+
+def iter_pages(
+    fetch_page: Callable[..., Dict[str, Any]],
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over pages of a cursor-paginated list endpoint
+
+    Args:
+        fetch_page: Callable accepting ``limit`` and ``cursor`` keyword arguments
+            and returning a list response (e.g. ``CustomerService.list_customers``
+            or ``TransferService.stream_transfers``)
+        limit: Page size
+        cursor: Optional cursor to start from
+
+    Returns:
+        Iterator over raw page responses
+    """
+    while True:
+        page = fetch_page(limit=limit, cursor=cursor)
+        try:
+            yield page
+        except BaseException:
+            # Iteration stopped early; a streamed page holds its connection until closed
+            close = getattr(page, 'close', None)
+            if close is not None:
+                close()
+            raise
+
+        cursor = page.get('next_cursor')
+        if not page.get('has_next_page') or not cursor:
+            return
+
+def iter_items(
+    fetch_page: Callable[..., Dict[str, Any]],
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over items of a cursor-paginated list endpoint, one page in memory at a time
+
+    Args:
+        fetch_page: Callable accepting ``limit`` and ``cursor`` keyword arguments
+        limit: Page size
+        cursor: Optional cursor to start from
+
+    Returns:
+        Iterator over raw item dictionaries
+    """
+    for page in iter_pages(fetch_page, limit=limit, cursor=cursor):
+        yield from page.get('data', [])
@@ -0,0 +1,104 @@
+"""
+Payload summaries for debug logging
+
+summarize_payload() describes a request or response body without serializing
+it: structure, sizes, short previews of strings and redacted sensitive fields.
+Its cost depends on the number of fields, not on how large their values are,
+so base64 documents and ID images are never copied into the log.
+
+    >>> summarize_payload({'first_name': 'Ada', 'documents': [{'file': 'iVBORw0KGgo' * 110000}]})
+    "{first_name: 'Ada', documents: [1 item: {file: <str 1.2 MB 'iVBORw0KGgoiVBORw0KGgoiV'…>}]} (~1.2 MB)"
+"""
+
+from typing import Any, List
+
+# Field names (lower case, '-' read as '_') whose values are never logged
+SENSITIVE_FIELDS = frozenset({
+    'number', 'account_number', 'routing_number', 'iban', 'bic', 'swift_code',
+    'api_key', 'authorization', 'password', 'secret', 'token', 'ssn', 'tax_identification_number'
+})
+
+PREVIEW_CHARS = 24   # characters shown of a long string
+MAX_ITEMS = 8        # fields shown per object
+MAX_LIST_ITEMS = 3   # list items shown
+MAX_DEPTH = 5        # nesting levels shown
+MAX_PARTS = 400      # overall bound on the summary's length
+
+def _size(nbytes: float) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if nbytes < 1024 or unit == 'MB':
+            return f"{nbytes:.0f} {unit}" if unit == 'B' else f"{nbytes:.1f} {unit}"
+        nbytes /= 1024
+
+def is_sensitive(key: Any) -> bool:
+    return isinstance(key, str) and key.lower().replace('-', '_') in SENSITIVE_FIELDS
+
+def estimate_size(value: Any) -> int:
+    """Approximate JSON size in bytes, without encoding anything"""
+    if isinstance(value, str):
+        return len(value) + 2  # characters, which is bytes for base64 and most IDs
+    if isinstance(value, dict):
+        return 2 + sum(len(str(key)) + 4 + estimate_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return 2 + sum(estimate_size(item) + 1 for item in value)
+    if value is None or isinstance(value, bool):
+        return 5
+    return 8
+
+def _summarize(value: Any, depth: int, parts: List[str]) -> None:
+    if len(parts) >= MAX_PARTS:
+        if parts[-1] != '…':
+            parts.append('…')
+        return
+    if isinstance(value, str):
+        if len(value) <= PREVIEW_CHARS:
+            parts.append(repr(value))
+        else:
+            parts.append(f"<str {_size(len(value))} {value[:PREVIEW_CHARS]!r}…>")
+    elif isinstance(value, dict):
+        if depth >= MAX_DEPTH:
+            parts.append(f"{{…{len(value)} fields}}")
+            return
+        parts.append('{')
+        for index, (key, item) in enumerate(value.items()):
+            if index == MAX_ITEMS:
+                parts.append(f", …+{len(value) - MAX_ITEMS} fields")
+                break
+            if index:
+                parts.append(', ')
+            parts.append(f"{key}: ")
+            if is_sensitive(key) and item is not None:
+                parts.append('<redacted>')
+            else:
+                _summarize(item, depth + 1, parts)
+        parts.append('}')
+    elif isinstance(value, (list, tuple)):
+        if depth >= MAX_DEPTH:
+            parts.append(f"[…{len(value)} items]")
+            return
+        parts.append(f"[{len(value)} item{'' if len(value) == 1 else 's'}")
+        for index, item in enumerate(value[:MAX_LIST_ITEMS]):
+            parts.append(': ' if index == 0 else ', ')
+            _summarize(item, depth + 1, parts)
+        if len(value) > MAX_LIST_ITEMS:
+            parts.append(', …')
+        parts.append(']')
+    elif value is None or isinstance(value, (bool, int, float)):
+        parts.append(repr(value))
+    else:
+        parts.append(f"<{type(value).__name__}>")
+
+def summarize_payload(value: Any) -> str:
+    """Short, redacted description of a JSON-like payload with its approximate size"""
+    parts: List[str] = []
+    _summarize(value, 0, parts)
+    parts.append(f" (~{_size(estimate_size(value))})")
+    return ''.join(parts)
+
+def redact(value: Any) -> Any:
+    """Copy of a JSON-like payload with sensitive fields replaced (for 'full' payload logging)"""
+    if isinstance(value, dict):
+        return {key: '<redacted>' if is_sensitive(key) and item is not None else redact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(item) for item in value]
+    return value
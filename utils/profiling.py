@@ -0,0 +1,127 @@
+"""
+Command profiling for the Bridge API CLI
+
+CommandProfiler runs a command under cProfile (and optionally tracemalloc) and
+summarises where its wall-clock time went. The .pstats file it writes can be
+opened with pstats, snakeviz, or turned into a flame graph with flameprof.
+"""
+
+import cProfile
+import pstats
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# (filename, line, function) as used by pstats
+FunctionKey = Tuple[str, int, str]
+
+def _in(path_suffix: str, *functions: str) -> Callable[[FunctionKey], bool]:
+    def matches(key: FunctionKey) -> bool:
+        return key[0].replace('\\', '/').endswith(path_suffix) and key[2] in functions
+    return matches
+
+# Wall-clock categories, each recognised by the functions that enter it. A
+# category's time is its functions' cumulative time when called from outside it.
+CATEGORIES: Dict[str, List[Callable[[FunctionKey], bool]]] = {
+    'imports': [_in('<frozen importlib._bootstrap>', '_find_and_load')],
+    # Whole HTTP exchanges, including waits on hedged attempts run by other threads
+    # (which the profiler does not see)
+    'network': [_in('bridge_client.py', '_request')],
+    'parse': [
+        _in('requests/models.py', 'json'),
+        _in('pydantic/main.py', '__init__', 'model_validate', 'model_validate_json'),
+        _in('json/__init__.py', 'loads'),
+        _in('utils/jsoncodec.py', 'loads', 'dumps')  # the client's codec (orjson or json)
+    ],
+    'logging': [_in('logging/__init__.py', '_log')],
+    'output': [_in('click/utils.py', 'echo'), _in('utils/output.py', 'write', 'flush', 'close')],
+}
+
+def _short(key: FunctionKey) -> str:
+    filename, line, function = key
+    if filename == '~':
+        return function  # built-in
+    parts = filename.replace('\\', '/').split('/')
+    return f"{'/'.join(parts[-2:])}:{line}({function})"
+
+class CommandProfiler:
+    """Profiles everything between start() and stop() on the calling thread"""
+
+    def __init__(self, output_path: Optional[str] = None, memory: bool = False):
+        """
+        Args:
+            output_path: Where to write the .pstats file (None: summary only)
+            memory: Also trace allocations with tracemalloc (slows the command down)
+        """
+        self.output_path = output_path
+        self.memory = memory
+        self.profile = cProfile.Profile()
+        self.started: Optional[float] = None
+        self.elapsed = 0.0
+        self.memory_peak = 0
+        self.memory_top: List[Tuple[str, int, int]] = []  # (location, bytes, allocations)
+
+    def start(self) -> None:
+        if self.memory:
+            import tracemalloc
+            tracemalloc.start()
+        self.started = time.perf_counter()
+        self.profile.enable()
+
+    def stop(self) -> None:
+        self.profile.disable()
+        self.elapsed = time.perf_counter() - self.started
+        if self.memory:
+            import tracemalloc
+            _, self.memory_peak = tracemalloc.get_traced_memory()
+            statistics = tracemalloc.take_snapshot().statistics('lineno')
+            tracemalloc.stop()
+            self.memory_top = [
+                (f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size, stat.count)
+                for stat in statistics[:10]
+            ]
+        if self.output_path:
+            self.profile.dump_stats(self.output_path)
+
+    def breakdown(self) -> Dict[str, float]:
+        """Seconds per category, plus 'other' for the rest of the command"""
+        stats = pstats.Stats(self.profile).stats
+        totals = {}
+        for category, matchers in CATEGORIES.items():
+            members = {key for key in stats if any(match(key) for match in matchers)}
+            total = 0.0
+            for key in members:
+                callers = stats[key][4]
+                if not callers:
+                    total += stats[key][3]
+                for caller, edge in callers.items():
+                    if caller not in members:
+                        total += edge[3]
+            totals[category] = total
+        totals['other'] = max(self.elapsed - sum(totals.values()), 0.0)
+        return totals
+
+    def top_functions(self, limit: int = 15) -> List[Tuple[str, int, float, float]]:
+        """(function, calls, own seconds, cumulative seconds) by own time"""
+        stats = pstats.Stats(self.profile).stats
+        rows = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+        return [(_short(key), value[1], value[2], value[3]) for key, value in rows]
+
+    def report(self, startup: float) -> List[str]:
+        """Summary lines; startup is the seconds spent before profiling began"""
+        lines = [f"Wall clock: {startup + self.elapsed:.3f}s (startup {startup:.3f}s, command {self.elapsed:.3f}s)"]
+        for category, seconds in self.breakdown().items():
+            share = seconds / self.elapsed if self.elapsed else 0.0
+            lines.append(f"  {category:<9}{seconds * 1000:>10.1f} ms {share:>7.1%}")
+        lines.append("  (measured under the profiler; nested categories, e.g. logging inside a request, overlap)")
+
+        lines.append(f"\n{'Function':<60}{'calls':>9}{'own ms':>10}{'cum ms':>10}")
+        for name, calls, own, cumulative in self.top_functions():
+            lines.append(f"{name[-59:]:<60}{calls:>9,}{own * 1000:>10.1f}{cumulative * 1000:>10.1f}")
+
+        if self.memory:
+            lines.append(f"\nPeak traced memory: {self.memory_peak / 1024 / 1024:.1f} MB; largest allocation sites still live:")
+            for location, size, count in self.memory_top:
+                lines.append(f"  {size / 1024:>9.1f} KB {count:>8,} blocks  {location}")
+        if self.output_path:
+            lines.append(f"\nProfile written to {self.output_path} (python -m pstats {self.output_path}, snakeviz or flameprof)")
+        return lines
@@ -0,0 +1,249 @@
+"""
+Per-call tracing spans for the Bridge API client
+
+SpanRecorder is a client middleware (see utils.hooks) that records one span per
+HTTP attempt, broken down into phases:
+
+    dns          name resolution (new connections only)
+    connect      TCP connect (new connections only)
+    tls          TLS handshake (new HTTPS connections only)
+    ttfb         request sent until response headers, minus the above
+    body         reading the response body
+    json_decode  parsing the JSON body
+    model        building pydantic models from it (via build_model)
+
+Connection phases come from urllib3 connection classes behind the client's
+adapter; reused keep-alive connections have none, which is the point. The
+current span is a context variable, so attempts the Hedger runs on its worker
+threads (in a copy of the caller's context) add their phases to it too.
+
+    recorder = SpanRecorder().install(client)
+    ...
+    recorder.export('spans.ndjson')
+"""
+
+import contextvars
+import json
+import os
+import socket
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional, Type, TypeVar
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.connection import allowed_gai_family
+
+from utils.connections import PooledAdapter
+from utils.hooks import RequestContext
+from utils.metrics import route_template
+
+PHASES = ('dns', 'connect', 'tls', 'ttfb', 'body', 'json_decode', 'model')
+
+# The span of the request in progress (or last finished) in this context
+_current_span: 'contextvars.ContextVar[Optional[Span]]' = contextvars.ContextVar('bridge_span', default=None)
+# Hedged attempts may add phases to one span from two threads
+_phases_lock = threading.Lock()
+
+M = TypeVar('M')
+
+def build_model(model_cls: Type[M], data: Dict[str, Any]) -> M:
+    """model_cls(**data), timed as the 'model' phase of the current span"""
+    if _current_span.get() is None:
+        return model_cls(**data)
+    started = time.perf_counter()
+    try:
+        return model_cls(**data)
+    finally:
+        _add_phase('model', time.perf_counter() - started)
+
+def _add_phase(name: str, seconds: float) -> None:
+    span = _current_span.get()
+    if span is not None:
+        with _phases_lock:
+            span.phases[name] = span.phases.get(name, 0.0) + seconds
+
+class Span:
+    """One HTTP attempt"""
+
+    __slots__ = ('span_id', 'method', 'route', 'url', 'attempt', 'start_time', 'duration', 'status', 'error', 'phases')
+
+    def __init__(self, context: RequestContext):
+        self.span_id = os.urandom(8).hex()
+        self.method = context.method
+        self.route = route_template(context.endpoint)
+        self.url = context.url
+        self.attempt = context.attempt
+        self.start_time = time.time()
+        self.duration: Optional[float] = None
+        self.status: Optional[str] = None  # status code, 'error' or 'retry:<reason>'
+        self.error: Optional[str] = None
+        self.phases: Dict[str, float] = context.timings  # shared, so json_decode lands here too
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.route}"
+
+    @property
+    def total(self) -> float:
+        """Seconds including model construction after the response"""
+        return (self.duration or 0.0) + self.phases.get('model', 0.0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """OpenTelemetry-style span record"""
+        start_ns = int(self.start_time * 1e9)
+        return {
+            'name': self.name,
+            'span_id': self.span_id,
+            'start_time_unix_nano': start_ns,
+            'end_time_unix_nano': start_ns + int(self.total * 1e9),
+            'status': 'ERROR' if self.error else 'OK',
+            'attributes': {
+                'http.request.method': self.method,
+                'http.route': self.route,
+                'url.full': self.url,
+                'http.response.status_code': self.status,
+                'http.request.resend_count': self.attempt,
+                **({'error.message': self.error} if self.error else {})
+            },
+            'phases_ms': {name: round(self.phases[name] * 1000, 3) for name in PHASES if name in self.phases}
+        }
+
+class SpanRecorder:
+    """Client middleware keeping the most recent max_spans spans"""
+
+    def __init__(self, max_spans: int = 10000):
+        self.spans: Deque[Span] = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def install(self, client) -> 'SpanRecorder':
+        """Register on a BridgeClient and switch it to a connection-timing adapter"""
+        client.use(self)
+        # Other transports (HTTP/2) keep their adapter and report no connection phases
+        if isinstance(client.adapter, PooledAdapter):
+            client.set_adapter(TracingAdapter.replacing(client.adapter))
+        return self
+
+    def before_request(self, context: RequestContext) -> None:
+        span = Span(context)
+        context.state['span'] = span
+        _current_span.set(span)
+
+    def after_response(self, context: RequestContext) -> None:
+        span = context.state['span']
+        response = context.response
+        connection = sum(span.phases.get(name, 0.0) for name in ('dns', 'connect', 'tls'))
+        headers = response.elapsed.total_seconds()
+        span.phases['ttfb'] = max(headers - connection, 0.0)
+        span.phases['body'] = max(context.elapsed - headers, 0.0)
+        span.status = str(response.status_code)
+        self._finish(span, context)
+
+    def on_retry(self, context: RequestContext, reason: str, delay: float) -> None:
+        span = context.state['span']
+        if span.duration is None:  # the attempt failed without a response
+            span.error = str(context.error)
+            self._finish(span, context)
+        span.status = f"retry:{reason}"
+
+    def on_error(self, context: RequestContext, error: BaseException) -> None:
+        span = context.state['span']
+        span.error = str(error)
+        if span.status is None:
+            span.status = 'error'
+        if span.duration is None:
+            self._finish(span, context)
+
+    def _finish(self, span: Span, context: RequestContext) -> None:
+        span.duration = context.elapsed if context.elapsed is not None else time.perf_counter() - context.started
+        with self._lock:
+            self.spans.append(span)
+
+    def snapshot(self) -> List[Span]:
+        with self._lock:
+            return list(self.spans)
+
+    def export(self, path: str) -> int:
+        """Write the spans as NDJSON; returns how many were written"""
+        spans = self.snapshot()
+        with open(path, 'w', encoding='utf-8') as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict()) + '\n')
+        return len(spans)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per-route rows: name, calls, new_connections, mean total ms and mean ms per phase"""
+        groups: Dict[str, List[Span]] = defaultdict(list)
+        for span in self.snapshot():
+            groups[span.name].append(span)
+        rows = []
+        for name, spans in sorted(groups.items()):
+            row = {
+                'name': name,
+                'calls': len(spans),
+                'new_connections': sum(1 for span in spans if 'connect' in span.phases),
+                'total_ms': sum(span.total for span in spans) / len(spans) * 1000
+            }
+            for phase in PHASES:
+                row[f"{phase}_ms"] = sum(span.phases.get(phase, 0.0) for span in spans) / len(spans) * 1000
+            rows.append(row)
+        return rows
+
+class _TracingHTTPConnection(HTTPConnection):
+    def _new_conn(self) -> socket.socket:
+        # Resolve separately so DNS and TCP connect are timed apart
+        started = time.perf_counter()
+        try:
+            family = allowed_gai_family()
+            address = socket.getaddrinfo(self._dns_host, self.port, family, socket.SOCK_STREAM)[0][4][0]
+        except (socket.gaierror, IndexError):
+            return super()._new_conn()  # let urllib3 raise its usual error
+        resolved = time.perf_counter()
+        _add_phase('dns', resolved - started)
+
+        dns_host = self._dns_host
+        self._dns_host = address
+        try:
+            return super()._new_conn()
+        finally:
+            self._dns_host = dns_host
+            _add_phase('connect', time.perf_counter() - resolved)
+            self._socket_setup = time.perf_counter() - started
+
+class _TracingHTTPSConnection(HTTPSConnection, _TracingHTTPConnection):
+    def connect(self) -> None:
+        started = time.perf_counter()
+        self._socket_setup = 0.0
+        super().connect()
+        _add_phase('tls', max(time.perf_counter() - started - self._socket_setup, 0.0))
+
+class _TracingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TracingHTTPConnection
+
+class _TracingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TracingHTTPSConnection
+
+class TracingAdapter(PooledAdapter):
+    """PooledAdapter whose connections report dns/connect/tls phases to the current span"""
+
+    @classmethod
+    def replacing(cls, adapter: HTTPAdapter) -> 'TracingAdapter':
+        """A tracing adapter with the same pool, keep-alive and retry settings as adapter"""
+        if isinstance(adapter, cls):
+            return adapter
+        return cls(
+            pool_size=getattr(adapter, '_pool_maxsize', 10),
+            pool_block=getattr(adapter, '_pool_block', False),
+            keepalive_idle=getattr(adapter, 'keepalive_idle', 0),
+            pool_connections=getattr(adapter, '_pool_connections', 10),
+            max_retries=getattr(adapter, 'max_retries', 0)
+        )
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TracingHTTPConnectionPool,
+            'https': _TracingHTTPSConnectionPool
+        }